@@ -26,12 +26,17 @@ export const onRequest = defineMiddleware(async (context, next) => {
     // Forward the request to the API server
     const response = await fetch(serverRequest);
     const data = await response.arrayBuffer();
+
+    // fetch has already decoded the body, so the encoding and length no longer apply
+    const headers = new Headers(response.headers);
+    headers.delete('content-encoding');
+    headers.delete('content-length');
     
     // Return the response from the API server
     return new Response(data, {
       status: response.status,
       statusText: response.statusText,
-      headers: response.headers,
+      headers,
     });
   } catch (error) {
     console.error('Error forwarding request to API:', error);
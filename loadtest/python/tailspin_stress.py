@@ -0,0 +1,557 @@
+"""Ramp virtual users through the shopping journey until the server breaks.
+
+A dependency-free Python counterpart of k6/tailspin-stress.test.js. Each
+virtual user (VU) repeatedly browses the games list, opens one game and its
+reviews, adds it to a cart and checks out, pausing THINK_TIME seconds between
+requests. The number of VUs ramps through the stages, like k6's ramping-vus
+executor, and the run stops early once the error rate passes the limit.
+
+Run from the repository root against a server that is already up:
+
+    python loadtest/python/tailspin_stress.py --base-url http://127.0.0.1:5100
+
+or let the script generate a dataset and start the production server itself:
+
+    python loadtest/python/tailspin_stress.py --start-server --stages 30s:50,1m:200,1m:400
+
+The summary is written in the same format as k6's handleSummary output.
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+REPO_ROOT: str = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SERVER_DIR: str = os.path.join(REPO_ROOT, 'server')
+
+DEFAULT_BASE_URL: str = 'http://127.0.0.1:5100'
+# The k6 stages scaled down to what a single dev box can drive and serve
+DEFAULT_STAGES: str = '30s:50,30s:100,30s:200,1m:400,1m:600'
+SUMMARY_TREND_STATS: list[str] = ['avg', 'min', 'med', 'max', 'p(90)', 'p(95)']
+CHECK_NAME: str = 'status is 2xx'
+JOURNEY_STEPS: tuple[str, ...] = ('browse', 'game', 'reviews', 'add_to_cart', 'checkout')
+# A one-second window needs this many requests before it can mark the breaking point
+MIN_WINDOW_REQUESTS: int = 10
+
+
+def parse_duration(value: str) -> float:
+    """Parse a k6-style duration such as '90s', '2m' or '1m30s' into seconds."""
+    seconds, number = 0.0, ''
+    for char in value.strip():
+        if char.isdigit() or char == '.':
+            number += char
+            continue
+        if not number or char not in 'hms':
+            raise ValueError(f'invalid duration {value!r}')
+        seconds += float(number) * {'h': 3600, 'm': 60, 's': 1}[char]
+        number = ''
+    if number:
+        seconds += float(number)
+    return seconds
+
+
+def parse_stages(value: str) -> list[tuple[float, int]]:
+    """Parse 'duration:target' pairs separated by commas, e.g. '1m:200,2m:500'."""
+    stages = []
+    for stage in value.split(','):
+        duration, _, target = stage.strip().partition(':')
+        stages.append((parse_duration(duration), int(target)))
+    return stages
+
+
+def target_vus(stages: list[tuple[float, int]], start_vus: int, elapsed: float) -> int:
+    """Number of VUs the ramp asks for at a point in time, interpolating linearly within each stage."""
+    previous = start_vus
+    for duration, target in stages:
+        if elapsed < duration:
+            return round(previous + (target - previous) * elapsed / duration)
+        elapsed -= duration
+        previous = target
+    return previous
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Percentile with linear interpolation between closest ranks, as k6 computes it."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * p / 100
+    lower = math.floor(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def trend_values(values: list[float]) -> dict[str, float]:
+    """Summarize a trend with k6's default statistics."""
+    ordered = sorted(values)
+    if not ordered:
+        return {stat: 0 for stat in SUMMARY_TREND_STATS}
+    return {
+        'avg': sum(ordered) / len(ordered),
+        'min': ordered[0],
+        'med': percentile(ordered, 50),
+        'max': ordered[-1],
+        'p(90)': percentile(ordered, 90),
+        'p(95)': percentile(ordered, 95),
+    }
+
+
+@dataclass
+class Timings:
+    """Phases of one HTTP request in milliseconds, named after k6's http_req_* metrics."""
+
+    blocked: float = 0.0
+    connecting: float = 0.0
+    sending: float = 0.0
+    waiting: float = 0.0
+    receiving: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        return self.sending + self.waiting + self.receiving
+
+
+@dataclass
+class Response:
+    status: int
+    body: bytes
+    timings: Timings
+
+
+@dataclass
+class Metrics:
+    """Samples of every metric in the summary, plus per-second windows for finding the breaking point."""
+
+    started: float = field(default_factory=time.monotonic)
+    trends: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    requests: int = 0
+    failed_requests: int = 0
+    status_4xx: int = 0
+    status_5xx: int = 0
+    iterations: int = 0
+    data_sent: int = 0
+    data_received: int = 0
+    vus: int = 0
+    vus_min: int = 0
+    vus_max: int = 0
+    # Second since start -> [requests, failures, durations]
+    windows: dict[int, list] = field(default_factory=lambda: defaultdict(lambda: [0, 0, []]))
+
+    def add_request(self, step: str, response: Response) -> None:
+        timings = response.timings
+        ok = 200 <= response.status < 300
+        for name in ('blocked', 'connecting', 'sending', 'waiting', 'receiving'):
+            self.trends[f'http_req_{name}'].append(getattr(timings, name))
+        self.trends['http_req_tls_handshaking'].append(0.0)
+        self.trends['http_req_duration'].append(timings.duration)
+        self.trends[f'http_req_duration{{step:{step}}}'].append(timings.duration)
+        self.trends['time_to_first_byte_ms'].append(timings.waiting)
+        if ok:
+            self.trends['http_req_duration{expected_response:true}'].append(timings.duration)
+        self.requests += 1
+        self.failed_requests += not ok
+        self.status_4xx += 400 <= response.status < 500
+        self.status_5xx += response.status >= 500
+        window = self.windows[int(time.monotonic() - self.started)]
+        window[0] += 1
+        window[1] += not ok
+        window[2].append(timings.duration)
+
+    def set_vus(self, vus: int) -> None:
+        self.vus = vus
+        self.vus_min = min(self.vus_min, vus) if self.vus_max else vus
+        self.vus_max = max(self.vus_max, vus)
+
+    @property
+    def error_rate(self) -> float:
+        return self.failed_requests / self.requests if self.requests else 0.0
+
+
+class Connection:
+    """A keep-alive HTTP/1.1 connection owned by one VU."""
+
+    def __init__(self, host: str, port: int, timeout: float, metrics: Metrics) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.metrics = metrics
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+
+    async def request(self, method: str, path: str, body: dict | None = None) -> Response:
+        """Send a request, reconnecting once if a reused connection was closed by the server."""
+        for attempt in range(2):
+            reused = self.writer is not None
+            try:
+                return await self._request(method, path, body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self.close()
+                # Only a connection the server closed while it sat idle is worth a retry
+                if not reused or attempt:
+                    break
+            except (OSError, TimeoutError, ValueError, asyncio.LimitOverrunError):
+                self.close()
+                break
+        return Response(0, b'', Timings())
+
+    async def _request(self, method: str, path: str, body: dict | None) -> Response:
+        timings = Timings()
+        async with asyncio.timeout(self.timeout):
+            if self.writer is None:
+                start = time.perf_counter()
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+                timings.connecting = (time.perf_counter() - start) * 1000
+
+            payload = json.dumps(body).encode() if body is not None else b''
+            headers = [
+                f'{method} {path} HTTP/1.1',
+                f'Host: {self.host}:{self.port}',
+                'User-Agent: tailspin-stress/1.0',
+                'Accept: application/json',
+                'Accept-Encoding: gzip',
+            ]
+            if body is not None:
+                headers += ['Content-Type: application/json', f'Content-Length: {len(payload)}']
+            data = ('\r\n'.join(headers) + '\r\n\r\n').encode() + payload
+
+            start = time.perf_counter()
+            self.writer.write(data)
+            await self.writer.drain()
+            sent = time.perf_counter()
+            status_line = await self.reader.readuntil(b'\r\n')
+            first_byte = time.perf_counter()
+
+            response_headers = {}
+            received = len(status_line)
+            while (line := await self.reader.readuntil(b'\r\n')) != b'\r\n':
+                received += len(line)
+                name, _, value = line.decode('latin-1').partition(':')
+                response_headers[name.strip().lower()] = value.strip()
+            if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+                content = b''
+                while size := int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16):
+                    content += (await self.reader.readexactly(size + 2))[:-2]
+                await self.reader.readuntil(b'\r\n')
+            else:
+                content = await self.reader.readexactly(int(response_headers.get('content-length', 0)))
+            done = time.perf_counter()
+
+        timings.sending = (sent - start) * 1000
+        timings.waiting = (first_byte - sent) * 1000
+        timings.receiving = (done - first_byte) * 1000
+        self.metrics.data_sent += len(data)
+        self.metrics.data_received += received + len(content)
+        if response_headers.get('connection', '').lower() == 'close':
+            self.close()
+        if response_headers.get('content-encoding') == 'gzip':
+            content = gzip.decompress(content)
+        return Response(int(status_line.split()[1]), content, timings)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class LoadTest:
+    """Runs the ramp and collects the summary."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        url = urlsplit(args.base_url)
+        if url.scheme != 'http':
+            raise SystemExit('Only http:// targets are supported')
+        self.host = url.hostname or '127.0.0.1'
+        self.port = url.port or 80
+        self.prefix = url.path.rstrip('/')
+        self.args = args
+        self.stages = parse_stages(args.stages)
+        self.metrics = Metrics()
+        self.checks = [0, 0]
+        self.iteration_errors = [0, 0]
+        self.active: dict[int, asyncio.Task] = {}
+        self.target = 0
+        self.aborted = False
+        self.breaking_point: dict | None = None
+
+    async def journey(self, connection: Connection) -> bool:
+        """Browse, open a game and its reviews, add it to a cart and check out.
+
+        Returns:
+            True if every request succeeded.
+        """
+        think = self.args.think_time
+        session_id = f'loadtest-{uuid.uuid4().hex}'
+
+        async def step(name: str, method: str, path: str, body: dict | None = None) -> Response:
+            response = await connection.request(method, f'{self.prefix}{path}', body)
+            self.metrics.add_request(name, response)
+            self.checks[0 if 200 <= response.status < 300 else 1] += 1
+            if think:
+                await asyncio.sleep(think)
+            return response
+
+        games = await step('browse', 'GET', '/api/games')
+        if games.status != 200:
+            return False
+        try:
+            game_ids = [game['id'] for game in json.loads(games.body)]
+        except (ValueError, KeyError, TypeError):
+            return False
+        if not game_ids:
+            return False
+        game_id = random.choice(game_ids)
+
+        results = [
+            await step('game', 'GET', f'/api/games/{game_id}'),
+            await step('reviews', 'GET', f'/api/games/{game_id}/reviews'),
+            await step('add_to_cart', 'POST', '/api/cart/items', {'sessionId': session_id, 'gameId': game_id}),
+        ]
+        if results[-1].status != 201:
+            return False
+        results.append(await step('checkout', 'POST', '/api/checkout', {
+            'sessionId': session_id, 'paymentMethod': 'credit_card', 'cardLastFour': '4242',
+        }))
+        return all(200 <= response.status < 300 for response in results)
+
+    async def virtual_user(self, number: int) -> None:
+        connection = Connection(self.host, self.port, self.args.timeout, self.metrics)
+        try:
+            while number < self.target and not self.aborted:
+                start = time.perf_counter()
+                ok = await self.journey(connection)
+                self.metrics.trends['iteration_duration'].append((time.perf_counter() - start) * 1000)
+                self.metrics.iterations += 1
+                self.iteration_errors[0 if ok else 1] += 1
+        finally:
+            connection.close()
+            self.active.pop(number, None)
+
+    def check_window(self, second: int) -> None:
+        """Record the first full second whose error rate or p95 passed the limits."""
+        if self.breaking_point is not None or second not in self.metrics.windows:
+            return
+        requests, failures, durations = self.metrics.windows[second]
+        if requests < MIN_WINDOW_REQUESTS:
+            return
+        p95 = percentile(sorted(durations), 95)
+        if failures / requests > self.args.max_error_rate or p95 > self.args.p95_threshold:
+            self.breaking_point = {
+                'second': second, 'vus': self.metrics.vus, 'requests': requests,
+                'errorRate': failures / requests, 'p95': p95,
+            }
+            print(f'Breaking point at {second}s with {self.metrics.vus} VUs: '
+                  f'{failures / requests:.1%} errors, p95 {p95:.0f} ms', flush=True)
+
+    async def run(self) -> None:
+        ramp_seconds = sum(duration for duration, _ in self.stages)
+        started = time.monotonic()
+        last_report = last_second = 0
+        while (elapsed := time.monotonic() - started) < ramp_seconds and not self.aborted:
+            self.target = target_vus(self.stages, self.args.start_vus, elapsed)
+            for number in range(self.target):
+                if number not in self.active:
+                    self.active[number] = asyncio.create_task(self.virtual_user(number))
+            self.metrics.set_vus(len(self.active))
+
+            second = int(time.monotonic() - self.metrics.started)
+            if second > last_second:
+                self.check_window(second - 1)
+                last_second = second
+            if (elapsed > self.args.abort_delay and self.metrics.requests
+                    and self.metrics.error_rate > self.args.max_error_rate):
+                print(f'Error rate {self.metrics.error_rate:.1%} is over the limit, aborting', flush=True)
+                self.aborted = True
+            if elapsed - last_report >= self.args.report_interval:
+                last_report = elapsed
+                print(f'{elapsed:6.0f}s vus={len(self.active):<5} reqs={self.metrics.requests:<8} '
+                      f'errors={self.metrics.error_rate:.2%}', flush=True)
+            await asyncio.sleep(0.1)
+
+        # Like k6's gracefulRampDown: let running iterations finish, then interrupt them
+        self.target = 0
+        if self.active:
+            _, pending = await asyncio.wait(list(self.active.values()), timeout=self.args.graceful_ramp_down)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def summary(self) -> dict:
+        """Build the end-of-test summary in the layout of k6's handleSummary data."""
+        metrics = self.metrics
+        duration_ms = (time.monotonic() - metrics.started) * 1000
+        seconds = duration_ms / 1000
+        error_threshold = f'rate<{self.args.max_error_rate:g}'
+        duration_threshold = f'p(95)<{self.args.p95_threshold:g}'
+
+        def rate(passes: int, fails: int) -> dict:
+            total = passes + fails
+            return {'rate': passes / total if total else 0, 'passes': passes, 'fails': fails}
+
+        def counter(count: int) -> dict:
+            return {'type': 'counter', 'contains': 'default', 'values': {'count': count, 'rate': count / seconds}}
+
+        result = {}
+        for name, values in sorted(metrics.trends.items()):
+            contains = 'default' if name == 'time_to_first_byte_ms' else 'time'
+            result[name] = {'type': 'trend', 'contains': contains, 'values': trend_values(values)}
+        p95 = result.get('http_req_duration', {}).get('values', {}).get('p(95)', 0)
+        if 'http_req_duration' in result:
+            result['http_req_duration']['thresholds'] = {duration_threshold: {'ok': p95 < self.args.p95_threshold}}
+
+        errors_ok = self.iteration_errors[1] / max(sum(self.iteration_errors), 1) < self.args.max_error_rate
+        result['errors'] = {
+            'type': 'rate', 'contains': 'default',
+            'values': rate(self.iteration_errors[1], self.iteration_errors[0]),
+            'thresholds': {error_threshold: {'ok': errors_ok}},
+        }
+        result['http_req_failed'] = {
+            'type': 'rate', 'contains': 'default',
+            'values': rate(metrics.failed_requests, metrics.requests - metrics.failed_requests),
+            'thresholds': {error_threshold: {'ok': metrics.error_rate < self.args.max_error_rate}},
+        }
+        result['checks'] = {'type': 'rate', 'contains': 'default', 'values': rate(*self.checks)}
+        result['http_reqs'] = counter(metrics.requests)
+        result['iterations'] = counter(metrics.iterations)
+        if metrics.status_4xx:
+            result['http_4xx'] = counter(metrics.status_4xx)
+        if metrics.status_5xx:
+            result['http_5xx'] = counter(metrics.status_5xx)
+        for name, count in (('data_sent', metrics.data_sent), ('data_received', metrics.data_received)):
+            result[name] = {'type': 'counter', 'contains': 'data', 'values': {'count': count, 'rate': count / seconds}}
+        result['vus'] = {'type': 'gauge', 'contains': 'default',
+                         'values': {'value': metrics.vus, 'min': metrics.vus_min, 'max': metrics.vus_max}}
+        vus_max = max(target for _, target in self.stages + [(0, self.args.start_vus)])
+        result['vus_max'] = {'type': 'gauge', 'contains': 'default',
+                             'values': {'value': vus_max, 'min': vus_max, 'max': vus_max}}
+        if self.breaking_point is not None:
+            vus = self.breaking_point['vus']
+            result['breaking_point_vus'] = {'type': 'gauge', 'contains': 'default',
+                                            'values': {'value': vus, 'min': vus, 'max': vus}}
+
+        check_path = f'::{CHECK_NAME}'
+        return {
+            'root_group': {
+                'name': '', 'path': '', 'id': hashlib.md5(b'').hexdigest(), 'groups': [],
+                'checks': [{
+                    'passes': self.checks[0], 'fails': self.checks[1], 'name': CHECK_NAME,
+                    'path': check_path, 'id': hashlib.md5(check_path.encode()).hexdigest(),
+                }],
+            },
+            'options': {'summaryTimeUnit': '', 'noColor': False, 'summaryTrendStats': SUMMARY_TREND_STATS},
+            'state': {
+                'isStdErrTTY': sys.stderr.isatty(),
+                'testRunDurationMs': duration_ms,
+                'isStdOutTTY': sys.stdout.isatty(),
+            },
+            'metrics': result,
+        }
+
+
+def start_server(args: argparse.Namespace) -> subprocess.Popen:
+    """Generate a synthetic dataset into a temporary database, start serve.py on it and wait until it is ready."""
+    directory = tempfile.mkdtemp(prefix='tailspin-stress-')
+    database = os.path.join(directory, 'stress.db')
+    database_url = f'sqlite:///{database}'
+    print(f'Generating {args.server_games} games into {database}', flush=True)
+    subprocess.run(
+        [sys.executable, '-m', 'utils.generate_data', '--database-url', database_url, '--games', str(args.server_games)],
+        cwd=SERVER_DIR, check=True, stdout=subprocess.DEVNULL,
+    )
+    port = urlsplit(args.base_url).port or 80
+    env = {**os.environ, 'DATABASE_URL': database_url, 'PORT': str(port)}
+    log_path = os.path.join(directory, 'server.log')
+    print(f'Starting serve.py on port {port}, logging to {log_path}', flush=True)
+    with open(log_path, 'w') as log:
+        server = subprocess.Popen([sys.executable, 'serve.py'], cwd=SERVER_DIR, env=env,
+                                  stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'{args.base_url}/readyz', timeout=2) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.5)
+        if server.poll() is not None:
+            raise SystemExit('Server exited during startup')
+    server.terminate()
+    raise SystemExit('Server did not become ready within 60 seconds')
+
+
+def print_summary(summary: dict) -> None:
+    metrics = summary['metrics']
+    print()
+    for name in ['http_req_duration', *(f'http_req_duration{{step:{step}}}' for step in JOURNEY_STEPS)]:
+        if name in metrics:
+            values = metrics[name]['values']
+            print(f"{name:<42} avg={values['avg']:.1f}ms med={values['med']:.1f}ms "
+                  f"p(90)={values['p(90)']:.1f}ms p(95)={values['p(95)']:.1f}ms max={values['max']:.1f}ms")
+    print(f"{'http_reqs':<42} {metrics['http_reqs']['values']['count']} "
+          f"({metrics['http_reqs']['values']['rate']:.1f}/s)")
+    print(f"{'http_req_failed':<42} {metrics['http_req_failed']['values']['rate']:.2%}")
+    print(f"{'iterations':<42} {metrics['iterations']['values']['count']}")
+    print(f"{'vus_max reached':<42} {metrics['vus']['values']['max']}")
+    if 'breaking_point_vus' in metrics:
+        print(f"{'breaking point':<42} {metrics['breaking_point_vus']['values']['value']} VUs")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default=os.environ.get('BASE_URL', DEFAULT_BASE_URL))
+    parser.add_argument('--stages', default=DEFAULT_STAGES, help='comma-separated duration:target pairs')
+    parser.add_argument('--start-vus', type=int, default=10)
+    parser.add_argument('--think-time', type=float, default=float(os.environ.get('THINK_TIME', '0.2')),
+                        help='seconds to pause after each request')
+    parser.add_argument('--timeout', type=float, default=60.0, help='request timeout in seconds')
+    parser.add_argument('--graceful-ramp-down', type=parse_duration, default='30s')
+    parser.add_argument('--max-error-rate', type=float, default=0.02,
+                        help='abort once this share of requests has failed')
+    parser.add_argument('--abort-delay', type=parse_duration, default='1m',
+                        help='do not abort on errors before this much time has passed')
+    parser.add_argument('--p95-threshold', type=float, default=2000.0, help='p95 request duration limit in ms')
+    parser.add_argument('--report-interval', type=float, default=10.0, help='seconds between progress lines')
+    # Untracked by default, so a local run never overwrites the committed k6 results
+    parser.add_argument('--summary', default=os.path.join(REPO_ROOT, 'loadtest', 'results.local.json'))
+    parser.add_argument('--start-server', action='store_true',
+                        help='generate a dataset and start serve.py on the --base-url port')
+    parser.add_argument('--server-games', type=int, default=1000)
+    args = parser.parse_args()
+
+    server = start_server(args) if args.start_server else None
+    load_test = LoadTest(args)
+    try:
+        asyncio.run(load_test.run())
+    except KeyboardInterrupt:
+        print('Interrupted, writing the summary so far')
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    summary = load_test.summary()
+    with open(args.summary, 'w') as output:
+        json.dump(summary, output, indent=2)
+    print_summary(summary)
+    print(f'\nSummary written to {args.summary}')
+
+    thresholds_ok = all(
+        result['ok'] for metric in summary['metrics'].values() for result in metric.get('thresholds', {}).values()
+    )
+    # k6 exits with 99 when a threshold fails
+    return 0 if thresholds_ok and not load_test.aborted else 99
+
+
+if __name__ == '__main__':
+    sys.exit(main())
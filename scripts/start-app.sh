@@ -31,8 +31,10 @@ export ENABLE_DEBUG_ENDPOINTS=true
 
 # Use appropriate Python command based on OS
 if [[ "$OSTYPE" == "msys" ]] || [[ "$OSTYPE" == "win32" ]]; then
+    py -m flask --app app migrate
     py app.py &
 else
+    python3 -m flask --app app migrate
     python3 app.py &
 fi
 
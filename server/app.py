@@ -1,29 +1,78 @@
 import os
+from typing import Any, Mapping
 from flask import Flask
 from routes.games import games_bp
 from routes.reviews import reviews_bp
 from routes.cart import cart_bp
 from routes.payments import payments_bp
-from routes.debug import debug_bp
+from routes.batch import batch_bp
 from utils.database import init_db
+from utils.json_provider import FastJSONProvider
+from utils.admission import init_admission_control
+from utils.compression import init_compression
+from utils.health import init_health
+from utils.metrics import init_metrics
+from utils.read_routing import init_read_routing
+from utils.server_timing import init_server_timing
+from utils.slow_query_log import init_slow_query_log
+from utils.migrations import migrate_command
+from utils.snapshots import snapshot_command, restore_command
+from utils.warmup import init_warmup
 
 # Get the server directory path
 base_dir: str = os.path.abspath(os.path.dirname(__file__))
 
-app: Flask = Flask(__name__)
+def create_app(config: Mapping[str, Any] | None = None) -> Flask:
+    """Create and configure the Flask application.
 
-# Initialize the database with the app
-init_db(app)
+    Nothing here touches the database: engines connect lazily on the first
+    query, and the schema is managed by the ``migrate`` command.
 
-# Register API blueprints
-app.register_blueprint(games_bp)
-app.register_blueprint(reviews_bp)
-app.register_blueprint(cart_bp)
-app.register_blueprint(payments_bp)
+    Args:
+        config: Optional settings applied before initialization, e.g.
+            SQLALCHEMY_DATABASE_URI or ENABLE_DEBUG_ENDPOINTS.
 
-# Enable debug endpoints only if explicitly allowed
-if os.getenv('ENABLE_DEBUG_ENDPOINTS', 'false').lower() in ('1', 'true', 'yes'):
-    app.register_blueprint(debug_bp)
+    Returns:
+        The configured Flask application.
+    """
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.config['ENABLE_DEBUG_ENDPOINTS'] = os.getenv('ENABLE_DEBUG_ENDPOINTS', 'false').lower() in ('1', 'true', 'yes')
+    app.config['ENABLE_METRICS'] = os.getenv('ENABLE_METRICS', 'true').lower() in ('1', 'true', 'yes')
+    if config:
+        app.config.from_mapping(config)
+
+    # Initialize the database with the app
+    init_db(app, app.config.get('SQLALCHEMY_DATABASE_URI'))
+    # Registered first so its after-request hook runs last and times the others
+    init_server_timing(app)
+    init_slow_query_log(app)
+    init_read_routing(app)
+    init_compression(app)
+    if app.config['ENABLE_METRICS']:
+        init_metrics(app)
+    # After metrics so shed requests are still counted
+    init_admission_control(app)
+    init_warmup(app)
+    init_health(app)
+    app.cli.add_command(migrate_command)
+    app.cli.add_command(snapshot_command)
+    app.cli.add_command(restore_command)
+
+    # Register API blueprints
+    app.register_blueprint(games_bp)
+    app.register_blueprint(reviews_bp)
+    app.register_blueprint(cart_bp)
+    app.register_blueprint(payments_bp)
+    app.register_blueprint(batch_bp)
+
+    # Enable debug endpoints only if explicitly allowed; imported lazily so
+    # production workers never load them
+    if app.config['ENABLE_DEBUG_ENDPOINTS']:
+        from routes.debug import debug_bp
+        app.register_blueprint(debug_bp)
+
+    return app
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', debug=True, port=5100)  # Bind to all interfaces for containers
\ No newline at end of file
+    create_app().run(host='0.0.0.0', debug=True, port=5100)  # Bind to all interfaces for containers
@@ -0,0 +1,80 @@
+"""Shared helpers for the server benchmarks."""
+import os
+import tempfile
+import time
+from typing import Any
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import func, select
+from app import create_app
+from models import db, Cart, Payment, Review
+from utils.generate_data import GeneratorConfig, generate_database
+
+
+def create_dataset_app(config: GeneratorConfig, directory: str | None = None, **app_config: Any) -> Flask:
+    """Generate a synthetic dataset into a temporary SQLite file and create an app for it.
+
+    Args:
+        config: The synthetic dataset configuration.
+        directory: Directory for the database file; a new temporary directory by default.
+        app_config: Extra settings passed to create_app.
+
+    Returns:
+        The Flask app bound to the generated database.
+    """
+    directory = directory or tempfile.mkdtemp(prefix='tailspin-bench-')
+    path = os.path.join(directory, f'bench-{config.games}-{config.seed}.db')
+    if not os.path.exists(path):
+        generate_database(config, f'sqlite:///{path}')
+    return create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', **app_config})
+
+
+def sample_paths(app: Flask) -> dict[str, str]:
+    """Pick representative request paths from the app's dataset.
+
+    Args:
+        app: App bound to a generated dataset.
+
+    Returns:
+        Dictionary of scenario name to request path.
+    """
+    with app.app_context():
+        session_id = db.session.execute(
+            select(Cart.session_id).where(Cart.status == 'active').order_by(Cart.id).limit(1)
+        ).scalar()
+        reviewed_game = db.session.execute(
+            select(Review.game_id).group_by(Review.game_id).order_by(func.count().desc()).limit(1)
+        ).scalar()
+        transaction_id = db.session.execute(select(Payment.transaction_id).order_by(Payment.id).limit(1)).scalar()
+        db.session.remove()
+    return {
+        'games': '/api/games',
+        'games_sorted': '/api/games?sort=popularity',
+        'games_search': '/api/games?search=Pipeline',
+        'game': f'/api/games/{reviewed_game}',
+        'reviews': f'/api/games/{reviewed_game}/reviews',
+        'cart': f'/api/cart?session_id={session_id}',
+        'cart_count': f'/api/cart/count?session_id={session_id}',
+        'payment': f'/api/payments/{transaction_id}',
+    }
+
+
+def time_requests(client: FlaskClient, path: str, iterations: int) -> list[float]:
+    """Issue the same GET repeatedly and return each request's latency in seconds.
+
+    Args:
+        client: Flask test client.
+        path: Request path with query string.
+        iterations: Number of requests.
+
+    Returns:
+        Per-request latencies.
+    """
+    latencies: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = client.get(path)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            raise RuntimeError(f'{path} returned {response.status_code}')
+    return latencies
@@ -0,0 +1,407 @@
+"""Benchmark every API route against synthetic datasets and check for regressions.
+
+Each route is driven through the Flask test client with the response cache
+turned off, so every request runs its view and SQL. For each dataset size and
+route the suite reports throughput, latency percentiles, SQL statements per
+request and the peak memory allocated while handling one request.
+
+Run from the server directory:
+
+    python -m benchmarks.endpoints --sizes small,medium --output endpoint-results.json
+
+The results are compared with benchmarks/baseline.json and the command exits
+with status 1 when a route regresses beyond the thresholds. Refresh the
+baseline on the machine that runs the comparison with --update-baseline.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import Engine, event
+from benchmarks.common import create_dataset_app, sample_paths
+from models import db
+from utils.generate_data import GeneratorConfig
+
+BASELINE_PATH: str = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+SIZES: dict[str, GeneratorConfig] = {
+    'small': GeneratorConfig(games=200, publishers=20, reviews_per_game=5.0, carts=100),
+    'medium': GeneratorConfig(games=1000, reviews_per_game=10.0, carts=500),
+    'large': GeneratorConfig(games=5000, reviews_per_game=20.0, carts=2000),
+}
+DEFAULT_SIZES: str = 'small,medium'
+
+# Latency may be this much worse than the baseline; timings vary between runs
+# far more than statement counts or allocations do
+DEFAULT_THRESHOLD: float = 0.5
+DEFAULT_MEMORY_THRESHOLD: float = 0.25
+# Differences below these are noise, whatever the ratio
+MIN_LATENCY_DELTA_MS: float = 0.5
+MIN_MEMORY_DELTA_KIB: float = 16.0
+DEFAULT_ROUNDS: int = 3
+# Requests measured under tracemalloc, which slows every allocation down
+MEMORY_SAMPLES: int = 20
+
+REVIEW_DATA: dict[str, Any] = {
+    'rating': 4,
+    'reviewText': 'Benchmarked twice, enjoyed it both times.',
+    'reviewerName': 'Bench',
+}
+
+# A wishlist-sized bulk lookup; every dataset size has these games
+LOOKUP_IDS: list[int] = list(range(1, 21))
+# The game page's batch: the game, its reviews and the cart count
+BATCH_PATHS: tuple[str, ...] = ('game', 'reviews', 'cart_count')
+
+# Returns the path and JSON body of the request for iteration n
+RequestFactory = Callable[[FlaskClient, int], tuple[str, Any]]
+
+
+@dataclass
+class Scenario:
+    """One route and how to build a request for it."""
+
+    name: str
+    method: str
+    request: RequestFactory
+    status: int = 200
+
+
+def _add_item(client: FlaskClient, session_id: str, game_id: int) -> int:
+    response = client.post('/api/cart/items', json={'sessionId': session_id, 'gameId': game_id})
+    if response.status_code != 201:
+        raise RuntimeError(f'adding a cart item returned {response.status_code}')
+    return response.get_json()['items'][-1]['id']
+
+
+def build_scenarios(app: Flask) -> list[Scenario]:
+    """Create a scenario for every route, using ids from the app's dataset.
+
+    Write scenarios set up their own cart in an untimed request first, so each
+    timed request does the same amount of work.
+
+    Args:
+        app: App bound to a generated dataset.
+
+    Returns:
+        The scenarios, reads first.
+    """
+    paths = sample_paths(app)
+    game_id = int(paths['game'].rsplit('/', 1)[1])
+
+    def get(path: str) -> RequestFactory:
+        return lambda client, n: (path, None)
+
+    def add_item(client: FlaskClient, n: int) -> tuple[str, Any]:
+        return '/api/cart/items', {'sessionId': f'bench-add-{n}', 'gameId': game_id}
+
+    def update_item(client: FlaskClient, n: int) -> tuple[str, Any]:
+        item_id = _add_item(client, f'bench-update-{n}', game_id)
+        return f'/api/cart/items/{item_id}', {'quantity': 3}
+
+    def delete_item(client: FlaskClient, n: int) -> tuple[str, Any]:
+        item_id = _add_item(client, f'bench-delete-{n}', game_id)
+        return f'/api/cart/items/{item_id}', None
+
+    def checkout(client: FlaskClient, n: int) -> tuple[str, Any]:
+        _add_item(client, f'bench-checkout-{n}', game_id)
+        return '/api/checkout', {'sessionId': f'bench-checkout-{n}', 'paymentMethod': 'paypal'}
+
+    def create_review(client: FlaskClient, n: int) -> tuple[str, Any]:
+        return paths['reviews'], REVIEW_DATA
+
+    def lookup_games(client: FlaskClient, n: int) -> tuple[str, Any]:
+        return '/api/games/lookup', {'ids': LOOKUP_IDS}
+
+    def batch(client: FlaskClient, n: int) -> tuple[str, Any]:
+        return '/api/batch', {'requests': [{'path': paths[name]} for name in BATCH_PATHS]}
+
+    return [
+        *(Scenario(name, 'GET', get(path)) for name, path in paths.items()),
+        Scenario('add_item', 'POST', add_item, 201),
+        Scenario('update_item', 'PUT', update_item),
+        Scenario('delete_item', 'DELETE', delete_item),
+        Scenario('checkout', 'POST', checkout, 201),
+        Scenario('create_review', 'POST', create_review, 201),
+        Scenario('lookup_games', 'POST', lookup_games),
+        Scenario('batch', 'POST', batch),
+    ]
+
+
+@contextmanager
+def count_statements() -> Iterator[list[int]]:
+    """Count SQL statements executed on any engine while the block runs.
+
+    Yields:
+        A one-element list holding the running count.
+    """
+    count = [0]
+
+    def after_cursor_execute(*args: Any) -> None:
+        count[0] += 1
+
+    event.listen(Engine, 'after_cursor_execute', after_cursor_execute)
+    try:
+        yield count
+    finally:
+        event.remove(Engine, 'after_cursor_execute', after_cursor_execute)
+
+
+def calibrate(samples: int = 5) -> float:
+    """Time a fixed CPU-bound workload to gauge how fast this machine runs right now.
+
+    Args:
+        samples: Number of runs; the fastest one is kept.
+
+    Returns:
+        The workload's duration in milliseconds.
+    """
+    payload = [{'id': i, 'title': f'Game {i}', 'price': i * 1.5, 'tags': ['a', 'b']} for i in range(2000)]
+    best = float('inf')
+    for _ in range(samples):
+        start = time.perf_counter()
+        for _ in range(5):
+            json.loads(json.dumps(payload))
+            sorted(payload, key=lambda item: -item['price'])
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3)
+
+
+def summarize_latencies(latencies: list[float]) -> dict[str, float]:
+    """Compute throughput and latency percentiles.
+
+    Args:
+        latencies: Per-request latencies in seconds, at least two.
+
+    Returns:
+        opsPerSec, p50Ms, p95Ms and p99Ms.
+    """
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        'opsPerSec': round(len(latencies) / sum(latencies), 1),
+        'p50Ms': round(cuts[49] * 1000, 3),
+        'p95Ms': round(cuts[94] * 1000, 3),
+        'p99Ms': round(cuts[98] * 1000, 3),
+    }
+
+
+def run_scenario(client: FlaskClient, scenario: Scenario, iterations: int, warmup: int,
+                 rounds: int = DEFAULT_ROUNDS) -> dict[str, Any]:
+    """Time a scenario, count its statements and measure its peak allocation.
+
+    The timed requests are repeated for several rounds and the round with the
+    lowest median is kept, which filters out noise from other processes.
+
+    Args:
+        client: Flask test client.
+        scenario: The scenario to run.
+        iterations: Timed requests per round.
+        warmup: Untimed requests sent first.
+        rounds: Number of timed rounds.
+
+    Returns:
+        The scenario's results.
+    """
+    counter = itertools.count()
+
+    def send() -> tuple[float, int]:
+        path, body = scenario.request(client, next(counter))
+        with count_statements() as statements:
+            start = time.perf_counter()
+            response = client.open(path, method=scenario.method, json=body)
+            elapsed = time.perf_counter() - start
+        if response.status_code != scenario.status:
+            raise RuntimeError(f'{scenario.method} {path} returned {response.status_code}')
+        return elapsed, statements[0]
+
+    for _ in range(warmup):
+        send()
+    timings = min(
+        ([send() for _ in range(iterations)] for _ in range(max(rounds, 1))),
+        key=lambda round_timings: statistics.median(elapsed for elapsed, _ in round_timings),
+    )
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for _ in range(min(MEMORY_SAMPLES, iterations)):
+            path, body = scenario.request(client, next(counter))
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            client.open(path, method=scenario.method, json=body)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'method': scenario.method,
+        'iterations': iterations,
+        **summarize_latencies([elapsed for elapsed, _ in timings]),
+        'sqlPerRequest': statistics.median_low(count for _, count in timings),
+        'peakKiB': round(peak / 1024, 1),
+    }
+
+
+def run_size(config: GeneratorConfig, directory: str, iterations: int, warmup: int, rounds: int,
+             only: set[str] | None = None) -> dict[str, dict[str, Any]]:
+    """Run every scenario against one dataset.
+
+    Args:
+        config: The dataset to generate.
+        directory: Directory for the database file.
+        iterations: Timed requests per scenario and round.
+        warmup: Untimed requests per scenario.
+        rounds: Timed rounds per scenario.
+        only: Scenario names to run; all of them when None.
+
+    Returns:
+        Results keyed by scenario name.
+    """
+    app = create_dataset_app(config, directory, RESPONSE_CACHE_TTL=0, ENABLE_DEBUG_ENDPOINTS=False)
+    client = app.test_client()
+    results = {}
+    try:
+        for scenario in build_scenarios(app):
+            if only is None or scenario.name in only:
+                results[scenario.name] = run_scenario(client, scenario, iterations, warmup, rounds)
+    finally:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+    return results
+
+
+def compare(results: dict[str, dict[str, dict]], baseline: dict[str, dict[str, dict]],
+            threshold: float = DEFAULT_THRESHOLD, memory_threshold: float = DEFAULT_MEMORY_THRESHOLD,
+            speed: float = 1.0) -> list[str]:
+    """Find routes that got worse than the baseline.
+
+    The median statement count is deterministic, so any increase is a regression.
+    Median latency and peak allocations regress when they are worse by more
+    than their threshold and by more than a small absolute amount. Throughput
+    and tail latencies are reported but not compared, as a few slow requests
+    skew them.
+    Routes or sizes missing from the baseline are skipped.
+
+    Latencies are divided by speed first, so a run on a machine that is slower
+    than the baseline's, or busier at the time, is not reported as a regression.
+
+    Args:
+        results: Current results, keyed by size and then scenario.
+        baseline: Baseline results in the same shape.
+        threshold: Allowed relative growth of latency.
+        memory_threshold: Allowed relative growth of peak allocations.
+        speed: Calibration time of this run divided by the baseline's.
+
+    Returns:
+        One message per regression.
+    """
+    regressions = []
+    for size, scenarios in results.items():
+        for name, current in scenarios.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None:
+                continue
+            label = f'{size}/{name}'
+            if current['sqlPerRequest'] > base['sqlPerRequest']:
+                regressions.append(
+                    f"{label}: {current['sqlPerRequest']} statements per request, baseline {base['sqlPerRequest']}"
+                )
+            latency = current['p50Ms'] / speed
+            if latency > base['p50Ms'] * (1 + threshold) and latency - base['p50Ms'] > MIN_LATENCY_DELTA_MS:
+                regressions.append(f"{label}: p50 {latency:.3f} ms normalized, baseline {base['p50Ms']} ms")
+            if (current['peakKiB'] > base['peakKiB'] * (1 + memory_threshold)
+                    and current['peakKiB'] - base['peakKiB'] > MIN_MEMORY_DELTA_KIB):
+                regressions.append(f"{label}: peak {current['peakKiB']} KiB, baseline {base['peakKiB']} KiB")
+    return regressions
+
+
+def _print_table(size: str, results: dict[str, dict[str, Any]]) -> None:
+    print(f'\n{size}')
+    print(f"{'route':<14} {'ops/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'sql':>6} {'peak KiB':>9}")
+    for name, result in results.items():
+        print(f"{name:<14} {result['opsPerSec']:>9.1f} {result['p50Ms']:>8.2f} {result['p95Ms']:>8.2f} "
+              f"{result['p99Ms']:>8.2f} {result['sqlPerRequest']:>6} {result['peakKiB']:>9.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f"comma-separated, from {', '.join(SIZES)}")
+    parser.add_argument('--scenarios', help='comma-separated scenario names; all by default')
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--memory-threshold', type=float, default=DEFAULT_MEMORY_THRESHOLD)
+    parser.add_argument('--update-baseline', action='store_true', help='overwrite the baseline with these results')
+    args = parser.parse_args()
+
+    sizes = [size.strip() for size in args.sizes.split(',') if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown size {', '.join(unknown)}")
+    if args.iterations < 2:
+        parser.error('--iterations must be at least 2')
+    only = {name.strip() for name in args.scenarios.split(',')} if args.scenarios else None
+
+    directory = tempfile.mkdtemp(prefix='tailspin-bench-')
+    calibration = calibrate()
+    results = {}
+    for size in sizes:
+        results[size] = run_size(SIZES[size], directory, args.iterations, args.warmup, args.rounds, only)
+        _print_table(size, results[size])
+    # Keep the faster of the measurements taken before and after the run
+    calibration = min(calibration, calibrate())
+
+    report = {
+        'generatedAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'calibrationMs': calibration,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+            output.write('\n')
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as output:
+            json.dump(report, output, indent=2)
+            output.write('\n')
+        print(f'\nBaseline written to {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f'\nNo baseline at {args.baseline}; run with --update-baseline to create one')
+        return 0
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    speed = calibration / baseline.get('calibrationMs', calibration)
+    print(f'\nCalibration {calibration} ms, {speed:.2f}x the baseline machine')
+    regressions = compare(results, baseline['results'], args.threshold, args.memory_threshold, speed)
+    if regressions:
+        print('\nRegressions against the baseline:')
+        for regression in regressions:
+            print(f'  {regression}')
+        return 1
+    print('\nNo regressions against the baseline')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
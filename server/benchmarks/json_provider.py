@@ -0,0 +1,44 @@
+"""Throughput of list endpoints with Flask's default JSON provider versus FastJSONProvider.
+
+Run from the server directory:
+
+    python -m benchmarks.json_provider --games 2000 --iterations 200
+"""
+import argparse
+from flask.json.provider import DefaultJSONProvider
+from benchmarks.common import create_dataset_app, sample_paths, time_requests
+from utils.generate_data import GeneratorConfig
+from utils.json_provider import FastJSONProvider, orjson
+
+SCENARIOS: tuple[str, ...] = ('games', 'cart', 'reviews')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=2000)
+    parser.add_argument('--reviews-per-game', type=float, default=20.0)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    # No response cache or coalescing, so both providers serialize every response
+    app = create_dataset_app(GeneratorConfig(games=args.games, reviews_per_game=args.reviews_per_game, carts=200),
+                             RESPONSE_CACHE_TTL=0, SINGLE_FLIGHT=False)
+    paths = sample_paths(app)
+    client = app.test_client()
+    providers = {'default': DefaultJSONProvider(app), 'fast': FastJSONProvider(app)}
+
+    print(f"FastJSONProvider encoder: {'orjson' if orjson else 'stdlib'}")
+    print(f"{'endpoint':<10} {'default req/s':>14} {'fast req/s':>12} {'gain':>8}")
+    for scenario in SCENARIOS:
+        throughput = {}
+        for name, provider in providers.items():
+            app.json = provider
+            time_requests(client, paths[scenario], 5)  # warm up
+            latencies = time_requests(client, paths[scenario], args.iterations)
+            throughput[name] = len(latencies) / sum(latencies)
+        gain = throughput['fast'] / throughput['default'] - 1
+        print(f"{scenario:<10} {throughput['default']:>14.1f} {throughput['fast']:>12.1f} {gain:>8.0%}")
+
+
+if __name__ == '__main__':
+    main()
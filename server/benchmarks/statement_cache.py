@@ -0,0 +1,114 @@
+"""Micro-benchmark comparing per-request Query construction with prebuilt statements.
+
+Run from the server directory:
+
+    python -m benchmarks.statement_cache --iterations 2000
+"""
+import argparse
+import time
+from datetime import date
+from typing import Callable
+from flask import Flask
+from sqlalchemy import event
+from models import db, init_db, Cart, CartItem, Category, Game, Payment, Publisher
+from routes.cart import ACTIVE_CART_STATEMENT, CART_ITEM_STATEMENT
+from routes.games import GAME_BY_ID_STATEMENT, GAMES_LIST_STATEMENTS
+from routes.payments import PAYMENT_BY_TRANSACTION_STATEMENT
+
+SESSION_ID: str = 'bench-session'
+
+
+def create_app() -> Flask:
+    """Create an app with a small in-memory dataset for the hot queries."""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    init_db(app, testing=True)
+    with app.app_context():
+        db.create_all()
+        publisher = Publisher(name='Bench Publisher')
+        category = Category(name='Bench Category')
+        games = [
+            Game(title=f'Bench Game {i}', description='A game used for benchmarking queries',
+                 publisher=publisher, category=category, popularity=i,
+                 release_date=date(2025, 1, 1), price=9.99)
+            for i in range(20)
+        ]
+        cart = Cart(session_id=SESSION_ID)
+        db.session.add_all([publisher, category, cart, *games])
+        db.session.flush()
+        db.session.add(CartItem(cart_id=cart.id, game_id=games[0].id, quantity=1, price=9.99))
+        db.session.add(Payment(cart_id=cart.id, amount=9.99, payment_method='paypal',
+                               transaction_id='bench-transaction', status='completed'))
+        db.session.commit()
+    return app
+
+
+def legacy_queries() -> None:
+    """The hot queries as they were written before, rebuilt on every call."""
+    db.session.query(Game).join(Publisher, Game.publisher_id == Publisher.id, isouter=True).join(
+        Category, Game.category_id == Category.id, isouter=True
+    ).order_by(Game.popularity.desc()).all()
+    db.session.query(Game).join(Publisher, Game.publisher_id == Publisher.id, isouter=True).join(
+        Category, Game.category_id == Category.id, isouter=True
+    ).filter(Game.id == 1).first()
+    cart = db.session.query(Cart).filter_by(session_id=SESSION_ID, status='active').first()
+    db.session.query(CartItem).filter_by(cart_id=cart.id, game_id=1).first()
+    db.session.query(Payment).filter_by(transaction_id='bench-transaction').first()
+
+
+def prebuilt_queries() -> None:
+    """The same queries executed from the prebuilt statements in the routes."""
+    db.session.execute(GAMES_LIST_STATEMENTS[('popularity', False)]).scalars().all()
+    db.session.execute(GAME_BY_ID_STATEMENT, {'game_id': 1}).scalars().first()
+    cart = db.session.execute(ACTIVE_CART_STATEMENT, {'session_id': SESSION_ID}).scalars().first()
+    db.session.execute(CART_ITEM_STATEMENT, {'cart_id': cart.id, 'game_id': 1}).scalars().first()
+    db.session.execute(PAYMENT_BY_TRANSACTION_STATEMENT, {'transaction_id': 'bench-transaction'}).scalars().first()
+
+
+def measure(name: str, queries: Callable[[], None], iterations: int, cache_misses: list[int],
+            compiled_cache: bool = True) -> float:
+    """Run a query set once per simulated request and print microseconds per request and compiles."""
+    execution_options = {} if compiled_cache else {'compiled_cache': None}
+    queries()  # warm the compiled cache
+    db.session.remove()
+    cache_misses[0] = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        # Each request gets a fresh session, as it does under Flask-SQLAlchemy
+        db.session.connection(execution_options=execution_options)
+        queries()
+        db.session.remove()
+    elapsed = time.perf_counter() - start
+    per_request = elapsed / iterations * 1_000_000
+    print(f'{name:<34} {per_request:10.1f} us/request   compiles/request: {cache_misses[0] / iterations:.1f}')
+    return per_request
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        cache_misses = [0]
+
+        def count_compiles(conn, cursor, statement, parameters, context, executemany) -> None:
+            # Anything other than a cache hit means the statement was compiled for this call
+            if context.cache_hit != context.cache_hit.CACHE_HIT:
+                cache_misses[0] += 1
+        event.listen(db.engine, 'before_cursor_execute', count_compiles)
+
+        uncached = measure('legacy Query, compiled cache off', legacy_queries, args.iterations, cache_misses,
+                           compiled_cache=False)
+        legacy = measure('legacy Query objects', legacy_queries, args.iterations, cache_misses)
+        prebuilt = measure('prebuilt statements', prebuilt_queries, args.iterations, cache_misses)
+
+        print(f'\nCompile cost per request (cache off - legacy): {uncached - legacy:8.1f} us')
+        print(f'Saved per request (legacy - prebuilt):          {legacy - prebuilt:8.1f} us '
+              f'({(legacy - prebuilt) / legacy:.0%})')
+
+
+if __name__ == '__main__':
+    main()
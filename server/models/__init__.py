@@ -1,6 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
+from .session import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Import models after db is defined to avoid circular imports
 from .category import Category
@@ -10,10 +11,14 @@ from .review import Review
 from .cart import Cart
 from .cart_item import CartItem
 from .payment import Payment
+from .cache_generation import CacheGeneration
 
 def init_db(app, testing: bool = False):
-    """Initialize the database
-    
+    """Initialize the database extension for the app.
+
+    No DDL is issued here; the schema is managed by the migrations in
+    utils/migrations.py (``flask --app app migrate``).
+
     Args:
         app: The Flask application instance
         testing: If True, allows reinitialization for testing
@@ -26,8 +31,4 @@ def init_db(app, testing: bool = False):
             db.init_app(app)
         except RuntimeError:
             # Database already initialized
-            pass
-    
-    # Create tables when initializing
-    with app.app_context():
-        db.create_all()
\ No newline at end of file
+            pass
\ No newline at end of file
@@ -0,0 +1,16 @@
+from . import db
+
+
+class CacheGeneration(db.Model):
+    """Version of a response cache, shared by every worker through the database.
+
+    Writers bump the generation in their transaction; workers drop cached
+    responses that were built under an older generation.
+    """
+    __tablename__ = 'cache_generations'
+
+    name = db.Column(db.String(50), primary_key=True)
+    generation = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<CacheGeneration {self.name}: {self.generation}>'
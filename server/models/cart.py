@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 from . import db
 from .base import BaseModel
+from utils.instrumentation import timed_to_dict
 from sqlalchemy.orm import validates, relationship
 
 
@@ -52,6 +53,7 @@ class Cart(BaseModel):
     def __repr__(self) -> str:
         return f'<Cart {self.id}, Session: {self.session_id}, Status: {self.status}>'
 
+    @timed_to_dict
     def to_dict(self) -> dict:
         """Serialize the cart to a dictionary with camelCase keys.
 
@@ -1,5 +1,6 @@
 from . import db
 from .base import BaseModel
+from utils.instrumentation import timed_to_dict
 from sqlalchemy.orm import validates, relationship
 
 
@@ -7,6 +8,7 @@ class CartItem(BaseModel):
     """Represents an item in a shopping cart, linking a cart to a game."""
 
     __tablename__ = 'cart_items'
+    __table_args__ = (db.Index('ix_cart_items_cart_id_game_id', 'cart_id', 'game_id'),)
 
     id = db.Column(db.Integer, primary_key=True)
     cart_id = db.Column(db.Integer, db.ForeignKey('carts.id'), nullable=False)
@@ -50,6 +52,7 @@ class CartItem(BaseModel):
     def __repr__(self) -> str:
         return f'<CartItem {self.id}, Cart: {self.cart_id}, Game: {self.game_id}, Qty: {self.quantity}>'
 
+    @timed_to_dict
     def to_dict(self) -> dict:
         """Serialize the cart item to a dictionary with camelCase keys.
 
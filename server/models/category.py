@@ -1,5 +1,6 @@
 from . import db
 from .base import BaseModel
+from utils.instrumentation import timed_to_dict
 from sqlalchemy.orm import validates, relationship
 
 class Category(BaseModel):
@@ -23,6 +24,7 @@ class Category(BaseModel):
     def __repr__(self):
         return f'<Category {self.name}>'
         
+    @timed_to_dict
     def to_dict(self):
         return {
             'id': self.id,
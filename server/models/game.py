@@ -1,5 +1,6 @@
 from . import db
 from .base import BaseModel
+from utils.instrumentation import timed_to_dict
 from sqlalchemy.orm import validates, relationship
 
 class Game(BaseModel):
@@ -8,16 +9,16 @@ class Game(BaseModel):
     __tablename__ = 'games'
     
     id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(100), nullable=False)
+    title = db.Column(db.String(100), nullable=False, index=True)
     description = db.Column(db.Text, nullable=False)
     star_rating = db.Column(db.Float, nullable=True)
-    popularity = db.Column(db.Integer, nullable=True, default=0)
+    popularity = db.Column(db.Integer, nullable=True, default=0, index=True)
     release_date = db.Column(db.Date, nullable=True)
     price = db.Column(db.Float, nullable=False, default=0.0)
     
     # Foreign keys for one-to-many relationships
-    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False)
-    publisher_id = db.Column(db.Integer, db.ForeignKey('publishers.id'), nullable=False)
+    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False, index=True)
+    publisher_id = db.Column(db.Integer, db.ForeignKey('publishers.id'), nullable=False, index=True)
     
     # One-to-many relationships (many games belong to one category/publisher)
     category = relationship("Category", back_populates="games")
@@ -37,6 +38,7 @@ class Game(BaseModel):
     def __repr__(self):
         return f'<Game {self.title}, ID: {self.id}>'
 
+    @timed_to_dict
     def to_dict(self):
         """Serialize the game to a dictionary with camelCase keys.
 
@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime, timezone
 from . import db
 from .base import BaseModel
+from utils.instrumentation import timed_to_dict
 from sqlalchemy.orm import validates, relationship
 
 
@@ -14,7 +15,7 @@ class Payment(BaseModel):
     VALID_METHODS = ('credit_card', 'debit_card', 'paypal')
 
     id = db.Column(db.Integer, primary_key=True)
-    cart_id = db.Column(db.Integer, db.ForeignKey('carts.id'), nullable=False)
+    cart_id = db.Column(db.Integer, db.ForeignKey('carts.id'), nullable=False, index=True)
     amount = db.Column(db.Float, nullable=False)
     payment_method = db.Column(db.String(20), nullable=False)
     card_last_four = db.Column(db.String(4), nullable=True)
@@ -89,6 +90,7 @@ class Payment(BaseModel):
     def __repr__(self) -> str:
         return f'<Payment {self.id}, Cart: {self.cart_id}, Status: {self.status}, Amount: {self.amount}>'
 
+    @timed_to_dict
     def to_dict(self) -> dict:
         """Serialize the payment to a dictionary with camelCase keys.
 
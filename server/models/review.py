@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 from . import db
 from .base import BaseModel
+from utils.instrumentation import timed_to_dict
 from sqlalchemy.orm import validates, relationship
 
 
@@ -8,6 +9,7 @@ class Review(BaseModel):
     """Represents a user review for a game."""
 
     __tablename__ = 'reviews'
+    __table_args__ = (db.Index('ix_reviews_game_id_created_at', 'game_id', 'created_at'),)
 
     id = db.Column(db.Integer, primary_key=True)
     rating = db.Column(db.Integer, nullable=False)
@@ -38,6 +40,7 @@ class Review(BaseModel):
     def __repr__(self):
         return f'<Review {self.id} for Game {self.game_id}>'
 
+    @timed_to_dict
     def to_dict(self):
         return {
             'id': self.id,
@@ -0,0 +1,42 @@
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+# Bind key of the optional read replica in SQLALCHEMY_BINDS
+REPLICA_BIND_KEY: str = 'replica'
+
+
+class RoutingSession(Session):
+    """Session that sends read-only requests to the replica engine.
+
+    Requests opt in through the ``read_replica`` view decorator. Everything else,
+    including any flush, uses the primary engine.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        """Select the replica engine for read-only requests, otherwise the primary.
+
+        Args:
+            mapper: The mapper or model being queried.
+            clause: The clause being executed.
+            bind: An explicit bind that always wins.
+
+        Returns:
+            The engine or connection to use.
+        """
+        if bind is None and self._use_replica():
+            replica = self._db.engines.get(REPLICA_BIND_KEY)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _use_replica(self) -> bool:
+        if self._flushing or self.info.get('primary_pinned'):
+            return False
+        return has_request_context() and g.get('use_read_replica', False)
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _pin_to_primary(session: RoutingSession, flush_context, instances) -> None:
+    """Keep the rest of the session on the primary once it has written."""
+    session.info['primary_pinned'] = True
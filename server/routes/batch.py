@@ -0,0 +1,119 @@
+from contextlib import contextmanager
+from typing import Any, Iterator
+from flask import Blueprint, Response, current_app, g, jsonify, request
+from flask.blueprints import BlueprintSetupState
+from werkzeug.exceptions import HTTPException
+from models import db
+from utils.env import get_int_env
+from utils.instrumentation import RequestStats
+from utils.read_routing import READ_PRIMARY_HEADER, is_read_only, read_replica
+
+batch_bp = Blueprint('batch', __name__)
+
+BATCH_PATH: str = '/api/batch'
+# Only the public API can be batched; the debug tools and the batch itself cannot
+PUBLIC_API_PREFIX: str = '/api/'
+PRIVATE_PATH_PREFIXES: tuple[str, ...] = (BATCH_PATH, '/api/debug')
+DEFAULT_MAX_REQUESTS: int = 20
+# Sub-requests see the caller's read-your-writes cookie and read-primary header
+FORWARDED_HEADERS: tuple[str, ...] = ('Cookie', READ_PRIMARY_HEADER)
+
+
+@batch_bp.record_once
+def _configure(state: BlueprintSetupState) -> None:
+    state.app.config.setdefault('BATCH_MAX_REQUESTS', get_int_env('BATCH_MAX_REQUESTS', DEFAULT_MAX_REQUESTS))
+
+
+@contextmanager
+def _isolated_g() -> Iterator[None]:
+    """Give a sub-request its own g while it shares the app context and database session.
+
+    Sub-requests run in the caller's app context, so g would otherwise be shared.
+    Their teardown would then finish the caller's metrics and release its
+    admission slot early. The sub-request's statistics are added to the caller's
+    afterwards, so Server-Timing on the batch covers the whole batch.
+    """
+    outer = dict(vars(g))
+    vars(g).clear()
+    try:
+        yield
+    finally:
+        inner_stats = vars(g).get('_request_stats')
+        vars(g).clear()
+        vars(g).update(outer)
+        if inner_stats is not None:
+            outer_stats = g.setdefault('_request_stats', RequestStats())
+            outer_stats.add(inner_stats)
+
+
+def dispatch_subrequest(path: str) -> tuple[int, Any]:
+    """Run a GET on another route in this process, without another HTTP round trip.
+
+    The route's view runs with the caller's database session. The app's request
+    hooks run for it as for any other request, so each sub-request is admitted,
+    counted in the metrics and subject to fault injection on its own. Routes not
+    marked read-only are refused, since a GET that writes, such as the one that
+    creates a cart, would run on the replica without the read-your-writes cookie.
+
+    Args:
+        path: Path and query string of the route.
+
+    Returns:
+        The status code and the decoded JSON body.
+    """
+    app = current_app._get_current_object()
+    headers = {name: request.headers[name] for name in FORWARDED_HEADERS if name in request.headers}
+    with _isolated_g(), app.test_request_context(path, method='GET', headers=headers):
+        if request.routing_exception is None and not is_read_only(app.view_functions[request.endpoint]):
+            return 400, {"error": "Only read-only routes can be batched"}
+        try:
+            response = app.preprocess_request()
+            if response is None:
+                response = app.dispatch_request()
+            response = app.process_response(app.make_response(response))
+        except HTTPException as error:
+            return error.code or 500, {"error": error.description}
+        except Exception:
+            current_app.logger.exception('Batch sub-request %s failed', path)
+            db.session.rollback()
+            return 500, {"error": "Internal server error"}
+        return response.status_code, response.get_json(silent=True)
+
+
+@batch_bp.route(BATCH_PATH, methods=['POST'])
+@read_replica
+def batch() -> tuple[Response, int] | Response:
+    """Run several GET requests to other API routes in one round trip.
+
+    Request Body:
+        requests: List of objects with a 'path', e.g. {"path": "/api/games/1"}.
+            Only GET is supported; 'method' may be omitted.
+
+    Returns:
+        JSON with 'responses', one {"status", "body"} per sub-request in the
+        order given, or an error when the batch itself is invalid.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('requests'), list):
+        return jsonify({"error": "requests must be a list"}), 400
+
+    items = data['requests']
+    max_requests = current_app.config['BATCH_MAX_REQUESTS']
+    if len(items) > max_requests:
+        return jsonify({"error": f"A batch may contain at most {max_requests} requests"}), 400
+
+    responses = []
+    for item in items:
+        path = item.get('path') if isinstance(item, dict) else None
+        method = item.get('method', 'GET') if isinstance(item, dict) else None
+        if not isinstance(path, str) or not path.startswith(PUBLIC_API_PREFIX) or path.startswith(PRIVATE_PATH_PREFIXES):
+            responses.append({"status": 400, "body": {"error": "path must be a public API route"}})
+        elif not isinstance(method, str):
+            responses.append({"status": 400, "body": {"error": "method must be a string"}})
+        elif method.upper() != 'GET':
+            responses.append({"status": 405, "body": {"error": "Only GET requests can be batched"}})
+        else:
+            status, body = dispatch_subrequest(path)
+            responses.append({"status": status, "body": body})
+
+    return jsonify({"responses": responses})
@@ -1,8 +1,30 @@
 from flask import jsonify, request, Response, Blueprint
 from models import db, Cart, CartItem, Game
+from sqlalchemy import Select, bindparam, select
+from utils.read_routing import read_replica
 
 cart_bp = Blueprint('cart', __name__)
 
+# Hot lookups are built once and executed with bound parameters
+ACTIVE_CART_STATEMENT: Select = select(Cart).where(
+    Cart.session_id == bindparam('session_id'), Cart.status == 'active'
+).limit(1)
+CART_ITEM_STATEMENT: Select = select(CartItem).where(
+    CartItem.cart_id == bindparam('cart_id'), CartItem.game_id == bindparam('game_id')
+).limit(1)
+
+
+def find_active_cart(session_id: str) -> Cart | None:
+    """Find the active cart for a session.
+
+    Args:
+        session_id: The browser session identifier.
+
+    Returns:
+        The active Cart, or None if the session has none.
+    """
+    return db.session.execute(ACTIVE_CART_STATEMENT, {'session_id': session_id}).scalars().first()
+
 
 def get_or_create_cart(session_id: str) -> Cart:
     """Get an active cart for the session, or create one if none exists.
@@ -13,9 +35,7 @@ def get_or_create_cart(session_id: str) -> Cart:
     Returns:
         The active Cart instance for this session.
     """
-    cart = db.session.query(Cart).filter_by(
-        session_id=session_id, status='active'
-    ).first()
+    cart = find_active_cart(session_id)
     if not cart:
         cart = Cart(session_id=session_id)
         db.session.add(cart)
@@ -74,9 +94,9 @@ def add_item() -> tuple[Response, int] | Response:
 
     cart = get_or_create_cart(session_id)
 
-    existing_item = db.session.query(CartItem).filter_by(
-        cart_id=cart.id, game_id=game_id
-    ).first()
+    existing_item = db.session.execute(
+        CART_ITEM_STATEMENT, {'cart_id': cart.id, 'game_id': game_id}
+    ).scalars().first()
 
     if existing_item:
         existing_item.quantity = existing_item.quantity + quantity
@@ -153,6 +173,7 @@ def delete_item(item_id: int) -> tuple[Response, int] | Response:
 
 
 @cart_bp.route('/api/cart/count', methods=['GET'])
+@read_replica
 def get_cart_count() -> tuple[Response, int] | Response:
     """Get the total item count in the cart for badge display.
 
@@ -166,9 +187,7 @@ def get_cart_count() -> tuple[Response, int] | Response:
     if not session_id:
         return jsonify({"error": "session_id is required"}), 400
 
-    cart = db.session.query(Cart).filter_by(
-        session_id=session_id, status='active'
-    ).first()
+    cart = find_active_cart(session_id)
 
     if not cart:
         return jsonify({"count": 0})
@@ -1,12 +1,45 @@
 from __future__ import annotations
 
-from flask import Blueprint, jsonify, request, Response
+from flask import Blueprint, g, jsonify, request, Response
 from typing import List, Tuple
+from collections import OrderedDict
 import gc
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+from sqlalchemy.exc import SQLAlchemyError
+from models import db
+from utils.fault_injection import (
+    FAULT_TYPES, FAULTS, MAX_DURATION_MS, MAX_TTL_SECONDS, Fault, apply_request_faults,
+    default_pool_connections, exhaust_pool, start_sqlite_lock,
+)
+from utils.memory_stats import gc_stats, object_counts, peak_rss_bytes, rss_bytes, snapshot_diff, take_snapshot
+from utils.profiler import SamplingProfiler
+from utils.snapshots import sqlite_database_path
 
 # A module-level bucket to intentionally retain memory between requests
 _LEAK_BUCKET: List[bytearray] = []
 
+# Longest a profile may run before it stops on its own
+MAX_PROFILE_SECONDS: float = 300.0
+DEFAULT_PROFILE_SECONDS: float = 30.0
+# Requests sent with this header are profiled on their own; the result id is returned in PROFILE_ID_HEADER
+PROFILE_HEADER: str = 'X-Profile'
+PROFILE_ID_HEADER: str = 'X-Profile-Id'
+REQUEST_PROFILE_INTERVAL: float = 0.001
+MAX_REQUEST_PROFILES: int = 50
+
+_PROFILER_LOCK = threading.Lock()
+_profiler: SamplingProfiler | None = None
+_REQUEST_PROFILES: OrderedDict[str, str] = OrderedDict()
+
+# Named tracemalloc snapshots, oldest first
+MAX_MEMORY_SNAPSHOTS: int = 10
+SNAPSHOT_NAME_PATTERN: re.Pattern = re.compile(r'^[A-Za-z0-9_.-]{1,64}$')
+_MEMORY_SNAPSHOTS: OrderedDict[str, tracemalloc.Snapshot] = OrderedDict()
+
 debug_bp = Blueprint('debug', __name__)
 
 
@@ -68,3 +101,352 @@ def leak_clear() -> Response:
         'chunks': len(_LEAK_BUCKET),
         'totalBytes': _total_bytes()
     })
+
+
+def _float_param(name: str, default: float, minimum: float, maximum: float) -> float:
+    value = float(request.args.get(name) or request.form.get(name) or default)
+    if not minimum <= value <= maximum:
+        raise ValueError(f'{name} must be between {minimum:g} and {maximum:g}')
+    return value
+
+
+def _collapsed_response(profiler: SamplingProfiler) -> Response:
+    response = Response(profiler.collapsed() + '\n', mimetype='text/plain')
+    response.headers['X-Profile-Samples'] = str(profiler.samples)
+    return response
+
+
+def _new_profiler() -> SamplingProfiler:
+    return SamplingProfiler(
+        interval=_float_param('interval', 5, 1, 1000) / 1000,
+        include_idle=request.args.get('idle', '').lower() in ('1', 'true', 'yes'),
+    )
+
+
+@debug_bp.route('/api/debug/profile/start', methods=['POST'])
+def profile_start() -> Tuple[Response, int] | Response:
+    """
+    Start sampling every thread in this worker until stopped or for at most `seconds`.
+
+    Query/body params:
+    - seconds: automatic stop (default: 30, max: 300)
+    - interval: sampling interval in milliseconds (default: 5)
+    - idle: include threads waiting for work (default: false)
+    """
+    global _profiler
+    try:
+        seconds = _float_param('seconds', DEFAULT_PROFILE_SECONDS, 0.1, MAX_PROFILE_SECONDS)
+        profiler = _new_profiler()
+    except ValueError as ex:
+        return jsonify({'error': 'invalid_parameters', 'message': f'{ex}'}), 400
+
+    with _PROFILER_LOCK:
+        if _profiler is not None and _profiler.running:
+            return jsonify({'error': 'profile_running', 'message': 'Stop the current profile first'}), 409
+        _profiler = profiler
+        profiler.start(seconds)
+    return jsonify({'status': 'started', **profiler.summary()})
+
+
+@debug_bp.route('/api/debug/profile/stop', methods=['POST'])
+def profile_stop() -> Tuple[Response, int] | Response:
+    """Stop the running profile and return its collapsed stacks as text/plain."""
+    with _PROFILER_LOCK:
+        profiler = _profiler
+    if profiler is None:
+        return jsonify({'error': 'no_profile', 'message': 'No profile has been started'}), 404
+    profiler.stop()
+    return _collapsed_response(profiler)
+
+
+@debug_bp.route('/api/debug/profile/status', methods=['GET'])
+def profile_status() -> Response:
+    with _PROFILER_LOCK:
+        profiler = _profiler
+    return jsonify(profiler.summary() if profiler else {'running': False, 'samples': 0})
+
+
+@debug_bp.route('/api/debug/profile', methods=['GET'])
+def profile_for() -> Tuple[Response, int] | Response:
+    """
+    Sample every thread for `seconds` and return the collapsed stacks as text/plain.
+
+    Query params:
+    - seconds: how long to sample (default: 10, max: 300)
+    - interval: sampling interval in milliseconds (default: 5)
+    - idle: include threads waiting for work (default: false)
+    """
+    try:
+        seconds = _float_param('seconds', 10, 0.1, MAX_PROFILE_SECONDS)
+        profiler = _new_profiler()
+    except ValueError as ex:
+        return jsonify({'error': 'invalid_parameters', 'message': f'{ex}'}), 400
+    profiler.start()
+    time.sleep(seconds)
+    profiler.stop()
+    return _collapsed_response(profiler)
+
+
+@debug_bp.route('/api/debug/profile/requests/<profile_id>', methods=['GET'])
+def request_profile(profile_id: str) -> Tuple[Response, int] | Response:
+    """Return the collapsed stacks of a request sent with the X-Profile header."""
+    collapsed = _REQUEST_PROFILES.get(profile_id)
+    if collapsed is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    return Response(collapsed + '\n', mimetype='text/plain')
+
+
+@debug_bp.before_app_request
+def _start_request_profile() -> None:
+    if request.headers.get(PROFILE_HEADER, '').lower() not in ('1', 'true', 'yes'):
+        return
+    profiler = SamplingProfiler(interval=REQUEST_PROFILE_INTERVAL, thread_ids={threading.get_ident()})
+    profiler.start(MAX_PROFILE_SECONDS)
+    g._request_profiler = profiler
+
+
+@debug_bp.after_app_request
+def _finish_request_profile(response: Response) -> Response:
+    profiler = g.pop('_request_profiler', None)
+    if profiler is None:
+        return response
+    profiler.stop()
+    profile_id = uuid.uuid4().hex[:12]
+    with _PROFILER_LOCK:
+        _REQUEST_PROFILES[profile_id] = profiler.collapsed()
+        while len(_REQUEST_PROFILES) > MAX_REQUEST_PROFILES:
+            _REQUEST_PROFILES.popitem(last=False)
+    response.headers[PROFILE_ID_HEADER] = profile_id
+    return response
+
+
+def _int_param(name: str, default: int, minimum: int, maximum: int) -> int:
+    value = int(request.args.get(name) or request.form.get(name) or default)
+    if not minimum <= value <= maximum:
+        raise ValueError(f'{name} must be between {minimum} and {maximum}')
+    return value
+
+
+def _tracemalloc_status() -> dict:
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        'tracing': tracemalloc.is_tracing(),
+        'frames': tracemalloc.get_traceback_limit(),
+        'tracedBytes': current,
+        'peakTracedBytes': peak,
+        'snapshots': list(_MEMORY_SNAPSHOTS),
+    }
+
+
+@debug_bp.route('/api/debug/memory/tracemalloc/start', methods=['POST'])
+def tracemalloc_start() -> Tuple[Response, int] | Response:
+    """
+    Start tracing allocations. Tracing slows allocation down, so stop it when done.
+
+    Query/body params:
+    - frames: traceback depth stored per allocation (default: 1)
+    """
+    try:
+        frames = _int_param('frames', 1, 1, 50)
+    except ValueError as ex:
+        return jsonify({'error': 'invalid_parameters', 'message': f'{ex}'}), 400
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    return jsonify({'status': 'started', **_tracemalloc_status()})
+
+
+@debug_bp.route('/api/debug/memory/tracemalloc/stop', methods=['POST'])
+def tracemalloc_stop() -> Response:
+    """Stop tracing and drop all snapshots."""
+    tracemalloc.stop()
+    _MEMORY_SNAPSHOTS.clear()
+    return jsonify({'status': 'stopped', **_tracemalloc_status()})
+
+
+@debug_bp.route('/api/debug/memory/snapshots', methods=['POST'])
+def memory_snapshot() -> Tuple[Response, int] | Response:
+    """
+    Take a named tracemalloc snapshot. The oldest snapshot is dropped beyond 10.
+
+    Query/body params:
+    - name: snapshot name (default: snapshot-<n>)
+    """
+    if not tracemalloc.is_tracing():
+        return jsonify({'error': 'not_tracing', 'message': 'Start tracemalloc first'}), 409
+    name = request.args.get('name') or request.form.get('name') or f'snapshot-{len(_MEMORY_SNAPSHOTS) + 1}'
+    if not SNAPSHOT_NAME_PATTERN.match(name):
+        return jsonify({'error': 'invalid_parameters', 'message': f"Invalid snapshot name '{name}'"}), 400
+
+    snapshot = take_snapshot()
+    _MEMORY_SNAPSHOTS.pop(name, None)
+    _MEMORY_SNAPSHOTS[name] = snapshot
+    while len(_MEMORY_SNAPSHOTS) > MAX_MEMORY_SNAPSHOTS:
+        _MEMORY_SNAPSHOTS.popitem(last=False)
+    return jsonify({
+        'name': name,
+        'tracedBytes': sum(trace.size for trace in snapshot.traces),
+        'snapshots': list(_MEMORY_SNAPSHOTS),
+    })
+
+
+@debug_bp.route('/api/debug/memory/snapshots', methods=['GET'])
+def memory_snapshots() -> Response:
+    return jsonify(_tracemalloc_status())
+
+
+@debug_bp.route('/api/debug/memory/diff', methods=['GET'])
+def memory_diff() -> Tuple[Response, int] | Response:
+    """
+    Return the top allocation changes between two snapshots.
+
+    Query params:
+    - from: name of the earlier snapshot (required)
+    - to: name of the later snapshot (default: a new snapshot taken now)
+    - limit: number of entries (default: 20)
+    - groupBy: 'lineno' (file and line, default) or 'filename'
+    """
+    try:
+        limit = _int_param('limit', 20, 1, 500)
+    except ValueError as ex:
+        return jsonify({'error': 'invalid_parameters', 'message': f'{ex}'}), 400
+    group_by = request.args.get('groupBy', 'lineno')
+    if group_by not in ('lineno', 'filename'):
+        return jsonify({'error': 'invalid_parameters', 'message': "groupBy must be 'lineno' or 'filename'"}), 400
+
+    old = _MEMORY_SNAPSHOTS.get(request.args.get('from', ''))
+    if old is None:
+        return jsonify({'error': 'Snapshot not found'}), 404
+    to_name = request.args.get('to')
+    if to_name:
+        new = _MEMORY_SNAPSHOTS.get(to_name)
+        if new is None:
+            return jsonify({'error': 'Snapshot not found'}), 404
+    elif tracemalloc.is_tracing():
+        new = take_snapshot()
+    else:
+        return jsonify({'error': 'not_tracing', 'message': 'Start tracemalloc or name a snapshot in to'}), 409
+
+    entries = snapshot_diff(old, new, limit, group_by)
+    return jsonify({
+        'from': request.args['from'],
+        'to': to_name or 'now',
+        'totalSizeDiff': sum(trace.size for trace in new.traces) - sum(trace.size for trace in old.traces),
+        'top': entries,
+    })
+
+
+@debug_bp.route('/api/debug/memory/stats', methods=['GET'])
+def memory_stats() -> Tuple[Response, int] | Response:
+    """
+    Report process memory, garbage collector state and live object counts by type.
+
+    Query params:
+    - limit: number of object types (default: 25)
+    """
+    try:
+        limit = _int_param('limit', 25, 1, 500)
+    except ValueError as ex:
+        return jsonify({'error': 'invalid_parameters', 'message': f'{ex}'}), 400
+    return jsonify({
+        'rssBytes': rss_bytes(),
+        'peakRssBytes': peak_rss_bytes(),
+        'gc': gc_stats(),
+        'objects': object_counts(limit),
+        'tracemalloc': _tracemalloc_status(),
+        'leakBytes': _total_bytes(),
+    })
+
+
+def _duration_ms(data: dict, name: str, default: int | None = None) -> int:
+    value = data.get(name, default)
+    if not isinstance(value, int) or isinstance(value, bool) or not 0 < value <= MAX_DURATION_MS:
+        raise ValueError(f'{name} must be an integer between 1 and {MAX_DURATION_MS}')
+    return value
+
+
+def _build_fault(data: dict) -> Fault:
+    """Validate a fault request body and create the fault."""
+    fault_type = data.get('type')
+    if fault_type not in FAULT_TYPES:
+        raise ValueError(f"type must be one of {', '.join(FAULT_TYPES)}")
+    ttl = data.get('ttlSeconds', 60)
+    if not isinstance(ttl, (int, float)) or not 0 < ttl <= MAX_TTL_SECONDS:
+        raise ValueError(f'ttlSeconds must be greater than 0 and at most {MAX_TTL_SECONDS:g}')
+    probability = data.get('probability', 1.0)
+    if not isinstance(probability, (int, float)) or not 0 < probability <= 1:
+        raise ValueError('probability must be greater than 0 and at most 1')
+    route = data.get('route')
+    if route is not None and (not isinstance(route, str) or not route.startswith('/')):
+        raise ValueError("route must be a path prefix starting with '/'")
+
+    if fault_type in ('cpu', 'latency'):
+        params = {'ms': _duration_ms(data, 'ms')}
+    elif fault_type == 'sqlite_lock':
+        params = {'holdMs': _duration_ms(data, 'holdMs'), 'mode': data.get('mode', 'immediate')}
+        if params['mode'] not in ('immediate', 'exclusive'):
+            raise ValueError("mode must be 'immediate' or 'exclusive'")
+        if 'everyMs' in data:
+            params['everyMs'] = _duration_ms(data, 'everyMs')
+    else:
+        limit = default_pool_connections(db.engine)
+        connections = data.get('connections', limit)
+        if not isinstance(connections, int) or not 0 < connections <= limit:
+            raise ValueError(f'connections must be between 1 and {limit}')
+        params = {'connections': connections}
+    return Fault(type=fault_type, ttl=float(ttl), params=params, route=route, probability=float(probability))
+
+
+@debug_bp.route('/api/debug/faults', methods=['POST'])
+def create_fault() -> Tuple[Response, int] | Response:
+    """
+    Inject a fault into this worker until its TTL runs out.
+
+    JSON body:
+    - type: 'cpu' | 'latency' | 'sqlite_lock' | 'pool_exhaustion'
+    - ttlSeconds: lifetime (default: 60, max: 3600)
+    - cpu, latency: ms to burn or sleep per request; optional route (path prefix) and probability (0-1)
+    - sqlite_lock: holdMs to hold the write lock, optional everyMs to repeat, mode 'immediate' | 'exclusive'
+    - pool_exhaustion: connections to check out (default: pool size plus overflow)
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body is required'}), 400
+    try:
+        fault = _build_fault(data)
+        if fault.type == 'sqlite_lock':
+            database_path = sqlite_database_path(str(db.engine.url))
+    except ValueError as ex:
+        return jsonify({'error': 'invalid_parameters', 'message': f'{ex}'}), 400
+
+    if fault.type == 'sqlite_lock':
+        start_sqlite_lock(fault, database_path)
+    elif fault.type == 'pool_exhaustion':
+        try:
+            exhaust_pool(fault, db.engine)
+        except SQLAlchemyError as ex:
+            return jsonify({'error': 'pool_unavailable', 'message': f'{ex}'}), 503
+    FAULTS.add(fault)
+    return jsonify(fault.to_dict()), 201
+
+
+@debug_bp.route('/api/debug/faults', methods=['GET'])
+def list_faults() -> Response:
+    return jsonify({'faults': [fault.to_dict() for fault in FAULTS.active()]})
+
+
+@debug_bp.route('/api/debug/faults/<fault_id>', methods=['DELETE'])
+def delete_fault(fault_id: str) -> Tuple[Response, int] | Response:
+    fault = FAULTS.remove(fault_id)
+    if fault is None:
+        return jsonify({'error': 'Fault not found'}), 404
+    return jsonify({'status': 'removed', **fault.to_dict()})
+
+
+@debug_bp.route('/api/debug/faults', methods=['DELETE'])
+def clear_faults() -> Response:
+    return jsonify({'status': 'cleared', 'removed': FAULTS.clear()})
+
+
+@debug_bp.before_app_request
+def _inject_request_faults() -> None:
+    apply_request_faults(request.path)
@@ -1,6 +1,9 @@
 from flask import jsonify, request, Response, Blueprint
 from models import db, Game, Publisher, Category
-from sqlalchemy.orm import Query
+from sqlalchemy import Select, bindparam, select
+from sqlalchemy.orm import contains_eager
+from utils.read_routing import read_replica
+from utils.response_cache import CATALOG_CACHE, cached_response
 
 # Create a Blueprint for games routes
 games_bp = Blueprint('games', __name__)
@@ -13,13 +16,18 @@ SORT_OPTIONS: dict[str, list] = {
     'title': [Game.title.asc()],
 }
 
-def get_games_base_query() -> Query:
+DEFAULT_SORT: str = 'title'
+# Most ids accepted by one bulk lookup
+MAX_LOOKUP_IDS: int = 100
+
+def get_games_base_query() -> Select:
     """Build the base query for retrieving games with publisher and category joins.
 
     Returns:
-        SQLAlchemy Query with outer joins on Publisher and Category.
+        SQLAlchemy Select with outer joins on Publisher and Category, which also
+        populate each game's publisher and category so to_dict runs no further queries.
     """
-    return db.session.query(Game).join(
+    return select(Game).join(
         Publisher, 
         Game.publisher_id == Publisher.id, 
         isouter=True
@@ -27,9 +35,25 @@ def get_games_base_query() -> Query:
         Category, 
         Game.category_id == Category.id, 
         isouter=True
-    )
+    ).options(contains_eager(Game.publisher), contains_eager(Game.category))
+
+# Statements are built once at import and executed with bound parameters, so each
+# request skips statement construction and hits SQLAlchemy's compiled cache.
+GAMES_BASE_STATEMENT: Select = get_games_base_query()
+GAME_BY_ID_STATEMENT: Select = GAMES_BASE_STATEMENT.where(Game.id == bindparam('game_id'))
+# Publisher and category come from the base statement's joins, so the whole lookup is one query
+GAMES_BY_IDS_STATEMENT: Select = GAMES_BASE_STATEMENT.where(Game.id.in_(bindparam('game_ids', expanding=True)))
+GAMES_LIST_STATEMENTS: dict[tuple[str, bool], Select] = {
+    (sort, searched): (
+        GAMES_BASE_STATEMENT.where(Game.title.ilike(bindparam('search'))) if searched else GAMES_BASE_STATEMENT
+    ).order_by(*order_by)
+    for sort, order_by in SORT_OPTIONS.items()
+    for searched in (False, True)
+}
 
 @games_bp.route('/api/games', methods=['GET'])
+@read_replica
+@cached_response(CATALOG_CACHE)
 def get_games() -> Response:
     """Get all games, optionally filtered by search and sorted.
 
@@ -43,28 +67,28 @@ def get_games() -> Response:
     Returns:
         JSON list of games matching the criteria.
     """
-    games_query = get_games_base_query()
-
     # Apply search filter if provided
     search = request.args.get('search', '').strip()
-    if search:
-        games_query = games_query.filter(Game.title.ilike('%' + search + '%'))
 
-    # Apply sorting
+    # Apply sorting, falling back to title when the option is unknown
     sort = request.args.get('sort', '').strip()
-    if sort in SORT_OPTIONS:
-        games_query = games_query.order_by(*SORT_OPTIONS[sort])
-    else:
-        games_query = games_query.order_by(Game.title.asc())
+    if sort not in SORT_OPTIONS:
+        sort = DEFAULT_SORT
+
+    statement = GAMES_LIST_STATEMENTS[(sort, bool(search))]
+    params = {'search': '%' + search + '%'} if search else {}
+    games = db.session.execute(statement, params).scalars().all()
 
-    games_list = [game.to_dict() for game in games_query.all()]
+    games_list = [game.to_dict() for game in games]
     
     return jsonify(games_list)
 
 @games_bp.route('/api/games/<int:id>', methods=['GET'])
+@read_replica
+@cached_response(CATALOG_CACHE)
 def get_game(id: int) -> tuple[Response, int] | Response:
     # Use the base query and add filter for specific game
-    game_query = get_games_base_query().filter(Game.id == id).first()
+    game_query = db.session.execute(GAME_BY_ID_STATEMENT, {'game_id': id}).scalars().first()
     
     # Return 404 if game not found
     if not game_query: 
@@ -74,3 +98,31 @@ def get_game(id: int) -> tuple[Response, int] | Response:
     game = game_query.to_dict()
     
     return jsonify(game)
+
+@games_bp.route('/api/games/lookup', methods=['POST'])
+@read_replica
+def lookup_games() -> tuple[Response, int] | Response:
+    """Get several games by id in one query.
+
+    Request Body:
+        ids: List of game ids, at most MAX_LOOKUP_IDS.
+
+    Returns:
+        JSON with 'games' in the order the ids were given, each id once, and
+        'missingIds' for ids that match no game.
+    """
+    data = request.get_json(silent=True)
+    ids = data.get('ids') if isinstance(data, dict) else None
+    if not isinstance(ids, list) or not all(isinstance(game_id, int) and not isinstance(game_id, bool) for game_id in ids):
+        return jsonify({"error": "ids must be a list of integers"}), 400
+    if len(ids) > MAX_LOOKUP_IDS:
+        return jsonify({"error": f"At most {MAX_LOOKUP_IDS} ids can be looked up at once"}), 400
+
+    requested_ids = list(dict.fromkeys(ids))
+    games = db.session.execute(GAMES_BY_IDS_STATEMENT, {'game_ids': requested_ids}).scalars().all()
+    games_by_id = {game.id: game for game in games}
+
+    return jsonify({
+        "games": [games_by_id[game_id].to_dict() for game_id in requested_ids if game_id in games_by_id],
+        "missingIds": [game_id for game_id in requested_ids if game_id not in games_by_id],
+    })
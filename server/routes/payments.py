@@ -1,8 +1,16 @@
 from flask import jsonify, request, Response, Blueprint
-from models import db, Cart, CartItem, Payment
+from models import db, Payment
+from routes.cart import find_active_cart
+from sqlalchemy import Select, bindparam, select
+from utils.read_routing import read_replica
 
 payments_bp = Blueprint('payments', __name__)
 
+# Built once and executed with a bound transaction ID
+PAYMENT_BY_TRANSACTION_STATEMENT: Select = select(Payment).where(
+    Payment.transaction_id == bindparam('transaction_id')
+).limit(1)
+
 
 @payments_bp.route('/api/checkout', methods=['POST'])
 def checkout() -> tuple[Response, int] | Response:
@@ -31,9 +39,7 @@ def checkout() -> tuple[Response, int] | Response:
     if payment_method not in Payment.VALID_METHODS:
         return jsonify({"error": f"paymentMethod must be one of {Payment.VALID_METHODS}"}), 400
 
-    cart = db.session.query(Cart).filter_by(
-        session_id=session_id, status='active'
-    ).first()
+    cart = find_active_cart(session_id)
     if not cart:
         return jsonify({"error": "No active cart found for this session"}), 404
 
@@ -61,6 +67,7 @@ def checkout() -> tuple[Response, int] | Response:
 
 
 @payments_bp.route('/api/payments/<transaction_id>', methods=['GET'])
+@read_replica
 def get_payment(transaction_id: str) -> tuple[Response, int] | Response:
     """Get payment status by transaction ID.
 
@@ -70,9 +77,9 @@ def get_payment(transaction_id: str) -> tuple[Response, int] | Response:
     Returns:
         JSON representation of the payment, or a 404 error.
     """
-    payment = db.session.query(Payment).filter_by(
-        transaction_id=transaction_id
-    ).first()
+    payment = db.session.execute(
+        PAYMENT_BY_TRANSACTION_STATEMENT, {'transaction_id': transaction_id}
+    ).scalars().first()
 
     if not payment:
         return jsonify({"error": "Payment not found"}), 404
@@ -1,10 +1,14 @@
 from flask import jsonify, request, Response, Blueprint
 from models import db, Game, Review
+from utils.read_routing import read_replica
+from utils.response_cache import CATALOG_CACHE, cached_response, invalidate_cache
 
 reviews_bp = Blueprint('reviews', __name__)
 
 
 @reviews_bp.route('/api/games/<int:game_id>/reviews', methods=['GET'])
+@read_replica
+@cached_response(CATALOG_CACHE)
 def get_reviews(game_id: int) -> tuple[Response, int] | Response:
     """Get all reviews for a game."""
     game = db.session.query(Game).get(game_id)
@@ -69,6 +73,8 @@ def create_review(game_id: int) -> tuple[Response, int]:
         all_ratings = [r.rating for r in all_reviews] + [rating]
         game.star_rating = round(sum(all_ratings) / len(all_ratings), 1)
 
+        # The game's rating and review list changed; committed with the review
+        invalidate_cache(CATALOG_CACHE)
         db.session.commit()
         return jsonify(review.to_dict()), 201
     except ValueError as e:
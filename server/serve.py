@@ -0,0 +1,48 @@
+"""Production entry point: serves the app with gunicorn using CPU-derived worker counts.
+
+Run from the server directory with ``python serve.py``. Send SIGHUP to the master
+process for a graceful reload of the workers, or SIGTERM for a graceful shutdown.
+"""
+import os
+import tempfile
+from flask import Flask
+from gunicorn.app.base import BaseApplication
+from models import db
+from utils.metrics import METRICS_DIR_ENV, clear_metrics_dir
+from utils.serving import build_server_options
+from utils.warmup import start_warmup
+
+
+def post_fork(server, worker) -> None:
+    """Drop database connections inherited from the master so workers never share sockets,
+    then warm the worker up before it reports ready."""
+    app = server.app.wsgi()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    if app.config.get('WARMUP'):
+        start_warmup(app)
+
+
+class TailspinServer(BaseApplication):
+    """Gunicorn application that loads the Flask app once in the master before forking."""
+
+    def __init__(self, options: dict) -> None:
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> Flask:
+        from app import create_app
+        return create_app()
+
+
+if __name__ == '__main__':
+    # Workers share a metrics directory so /metrics on any worker reports the whole server
+    clear_metrics_dir(os.environ.setdefault(METRICS_DIR_ENV, os.path.join(tempfile.gettempdir(), 'tailspin-metrics')))
+    # Workers prime connections, statements and the catalog cache before reporting ready
+    os.environ.setdefault('WARMUP', 'true')
+    TailspinServer({**build_server_options(), 'post_fork': post_fork}).run()
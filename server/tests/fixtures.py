@@ -0,0 +1,71 @@
+import atexit
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from dataclasses import asdict
+from flask import Flask
+from models import db, init_db
+from utils.generate_data import GeneratorConfig, generate_database
+from utils.snapshots import copy_database
+
+# Templates are generated once per test process and shared by every module
+_TEMPLATE_DIR: str = tempfile.mkdtemp(prefix='tailspin-templates-')
+atexit.register(shutil.rmtree, _TEMPLATE_DIR, True)
+
+
+def template_database(config: GeneratorConfig) -> str:
+    """Get the path of a template database for a dataset, generating it on first use.
+
+    Args:
+        config: The synthetic dataset configuration.
+
+    Returns:
+        Path of the template SQLite file.
+    """
+    key = hashlib.sha1(repr(sorted(asdict(config).items())).encode()).hexdigest()[:12]
+    path = os.path.join(_TEMPLATE_DIR, f'template-{key}.db')
+    if not os.path.exists(path):
+        generate_database(config, f'sqlite:///{path}')
+    return path
+
+
+class TemplateDatabaseTestCase(unittest.TestCase):
+    """Test case that restores a generated template database once per test class.
+
+    Subclasses set DATASET and register blueprints in ``create_test_app``. The
+    restore uses the SQLite backup API, so the dataset is generated once per
+    process and each class starts from an identical copy.
+    """
+
+    DATASET: GeneratorConfig = GeneratorConfig(games=50, publishers=5, categories=4, carts=20)
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._database_dir = tempfile.TemporaryDirectory()
+        cls.database_path = os.path.join(cls._database_dir.name, 'test.db')
+        copy_database(template_database(cls.DATASET), cls.database_path)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._database_dir.cleanup()
+
+    @classmethod
+    def create_test_app(cls) -> Flask:
+        """Create a Flask app bound to the restored database."""
+        app = Flask(__name__)
+        app.config['TESTING'] = True
+        app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{cls.database_path}'
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        init_db(app, testing=True)
+        return app
+
+    def setUp(self) -> None:
+        self.app = self.create_test_app()
+        self.client = self.app.test_client()
+
+    def tearDown(self) -> None:
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
@@ -0,0 +1,146 @@
+import threading
+import time
+import unittest
+from unittest import mock
+from flask import Flask
+from utils import admission
+from utils.admission import (
+    HIGH_PRIORITY, LOW_PRIORITY, AdmissionController, init_admission_control, request_priority,
+)
+
+
+class TestAdmissionController(unittest.TestCase):
+    """Tests for priority-aware admission and adaptive load shedding."""
+
+    def test_request_priority(self) -> None:
+        """Test checkout, payments and cart writes are high priority and browsing is low."""
+        self.assertEqual(request_priority('POST', '/api/checkout'), HIGH_PRIORITY)
+        self.assertEqual(request_priority('GET', '/api/payments/abc'), HIGH_PRIORITY)
+        self.assertEqual(request_priority('POST', '/api/cart/items'), HIGH_PRIORITY)
+        self.assertEqual(request_priority('DELETE', '/api/cart/items/1'), HIGH_PRIORITY)
+        self.assertEqual(request_priority('GET', '/api/cart'), LOW_PRIORITY)
+        self.assertEqual(request_priority('GET', '/api/games'), LOW_PRIORITY)
+
+    def test_low_priority_leaves_room_for_high(self) -> None:
+        """Test low-priority work cannot take the slots reserved for high priority."""
+        controller = AdmissionController(max_in_flight=4, low_priority_share=0.5, target_queue_ms=10)
+
+        self.assertTrue(controller.admit(LOW_PRIORITY))
+        self.assertTrue(controller.admit(LOW_PRIORITY))
+        self.assertFalse(controller.admit(LOW_PRIORITY))
+        self.assertTrue(controller.admit(HIGH_PRIORITY))
+        self.assertTrue(controller.admit(HIGH_PRIORITY))
+
+        self.assertEqual(controller.stats()['shed'], {LOW_PRIORITY: 1})
+        self.assertEqual(controller.stats()['inFlight'], 4)
+
+    def test_high_priority_waits_for_slot(self) -> None:
+        """Test a high-priority request queues until a slot is released."""
+        controller = AdmissionController(max_in_flight=1, queue_timeout_ms=2000)
+        self.assertTrue(controller.admit(HIGH_PRIORITY))
+        threading.Timer(0.05, controller.release).start()
+
+        start = time.monotonic()
+        self.assertTrue(controller.admit(HIGH_PRIORITY))
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+    def test_high_priority_times_out(self) -> None:
+        """Test a high-priority request is shed when no slot frees up in time."""
+        controller = AdmissionController(max_in_flight=1, queue_timeout_ms=50)
+        controller.admit(HIGH_PRIORITY)
+
+        self.assertFalse(controller.admit(HIGH_PRIORITY))
+        self.assertEqual(controller.stats()['shed'], {HIGH_PRIORITY: 1})
+
+    def test_low_priority_waits_up_to_target(self) -> None:
+        """Test a low-priority request waits for a slot, but no longer than the target delay."""
+        controller = AdmissionController(max_in_flight=1, target_queue_ms=2000)
+        self.assertTrue(controller.admit(LOW_PRIORITY))
+        threading.Timer(0.05, controller.release).start()
+        self.assertTrue(controller.admit(LOW_PRIORITY))
+
+        controller.target_queue_ms = 50
+        start = time.monotonic()
+        self.assertFalse(controller.admit(LOW_PRIORITY))
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+    def test_low_priority_limit_adapts(self) -> None:
+        """Test the low-priority limit shrinks under sustained delay and recovers after."""
+        controller = AdmissionController(max_in_flight=8, target_queue_ms=1, queue_timeout_ms=5)
+        with mock.patch.object(admission, 'ADJUST_INTERVAL', 0):
+            for _ in range(8):
+                controller.admit(HIGH_PRIORITY)
+            for _ in range(20):
+                controller.admit(HIGH_PRIORITY)
+            self.assertEqual(controller.stats()['lowPriorityLimit'], 1)
+
+            for _ in range(8):
+                controller.release()
+            for _ in range(40):
+                controller.admit(HIGH_PRIORITY)
+                controller.release()
+            self.assertEqual(controller.stats()['lowPriorityLimit'], 6)
+
+
+class TestAdmissionMiddleware(unittest.TestCase):
+    """Tests for shedding requests in front of the blueprints."""
+
+    def setUp(self) -> None:
+        """Create an app with admission control and a few plain routes."""
+        self.app = Flask(__name__)
+        self.app.config['TESTING'] = True
+        self.app.config['ADMISSION_CONTROL'] = True
+        self.app.config['ADMISSION_MAX_IN_FLIGHT'] = 4
+        self.app.config['ADMISSION_TARGET_QUEUE_MS'] = 10
+        self.app.config['ADMISSION_RETRY_AFTER'] = 2
+        init_admission_control(self.app)
+        for path in ('/api/games', '/api/checkout', '/metrics'):
+            self.app.add_url_rule(path, path, lambda: 'ok', methods=['GET', 'POST'])
+        self.client = self.app.test_client()
+        self.controller: AdmissionController = self.app.extensions['admission']
+
+    def _fill_low_priority_slots(self) -> None:
+        """Helper method to take every slot low-priority requests may use."""
+        for _ in range(self.controller.low_priority_cap):
+            self.controller.admit(LOW_PRIORITY)
+
+    def test_shed_with_retry_after(self) -> None:
+        """Test a shed request gets 503 with Retry-After and a JSON error."""
+        self._fill_low_priority_slots()
+        response = self.client.get('/api/games')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '2')
+        self.assertIn('error', response.get_json())
+
+    def test_high_priority_and_exempt_paths_admitted(self) -> None:
+        """Test checkout and metrics still go through when browsing is shed."""
+        self._fill_low_priority_slots()
+
+        self.assertEqual(self.client.post('/api/checkout').status_code, 200)
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    def test_request_start_header_ignored(self) -> None:
+        """Test a client cannot get its request shed by claiming it queued for a long time."""
+        response = self.client.get('/api/games', headers={'X-Request-Start': 't=0'})
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_slots_released(self) -> None:
+        """Test every admitted request gives its slot back."""
+        for _ in range(10):
+            self.assertEqual(self.client.get('/api/games').status_code, 200)
+
+        self.assertEqual(self.controller.stats()['inFlight'], 0)
+
+    def test_disabled_by_default(self) -> None:
+        """Test nothing is registered unless ADMISSION_CONTROL is on."""
+        app = Flask(__name__)
+        with mock.patch.dict('os.environ', {'ADMISSION_CONTROL': ''}):
+            init_admission_control(app)
+
+        self.assertNotIn('admission', app.extensions)
+
+
+if __name__ == '__main__':
+    unittest.main()
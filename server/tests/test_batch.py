@@ -0,0 +1,162 @@
+import unittest
+from typing import Any, Dict
+from flask import Flask, request
+from sqlalchemy import event
+from models import Game, Publisher, Category, Review, db, init_db
+from routes.batch import batch_bp
+from routes.cart import cart_bp
+from routes.games import games_bp
+from routes.reviews import reviews_bp
+from utils.admission import init_admission_control
+
+
+class TestBatchRoutes(unittest.TestCase):
+    """Tests for running several GET requests in one batch."""
+
+    BATCH_API_PATH: str = '/api/batch'
+
+    def setUp(self) -> None:
+        """Create an app with the batch endpoint and a game with a review."""
+        self.app = Flask(__name__)
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        self.app.config['BATCH_MAX_REQUESTS'] = 5
+        self.app.config['ADMISSION_CONTROL'] = True
+        self.app.config['ADMISSION_MAX_IN_FLIGHT'] = 4
+        init_admission_control(self.app)
+        for blueprint in (games_bp, reviews_bp, cart_bp, batch_bp):
+            self.app.register_blueprint(blueprint)
+        self.client = self.app.test_client()
+
+        init_db(self.app, testing=True)
+        with self.app.app_context():
+            db.create_all()
+            game = Game(
+                title="Pipeline Panic",
+                description="Build your DevOps pipeline before chaos ensues",
+                publisher=Publisher(name="DevGames Inc"),
+                category=Category(name="Strategy"),
+                star_rating=4.5,
+            )
+            db.session.add(game)
+            db.session.flush()
+            db.session.add(Review(game_id=game.id, rating=5, review_text="Ship it on a Friday.", reviewer_name="Mona"))
+            db.session.commit()
+            self.game_id = game.id
+
+    def tearDown(self) -> None:
+        """Clean up test database and ensure proper connection closure"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+
+    def _batch(self, requests: Any) -> Any:
+        return self.client.post(self.BATCH_API_PATH, json={"requests": requests})
+
+    def test_game_page_in_one_request(self) -> None:
+        """Test game, reviews and cart count come back in order with their statuses."""
+        response = self._batch([
+            {"path": f"/api/games/{self.game_id}"},
+            {"path": f"/api/games/{self.game_id}/reviews"},
+            {"path": "/api/cart/count?session_id=abc"},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        results: list[Dict[str, Any]] = response.get_json()['responses']
+        self.assertEqual([result['status'] for result in results], [200, 200, 200])
+        self.assertEqual(results[0]['body']['title'], "Pipeline Panic")
+        self.assertEqual(results[1]['body']['totalReviews'], 1)
+        self.assertEqual(results[2]['body'], {"count": 0})
+
+    def test_per_item_errors(self) -> None:
+        """Test a failing sub-request reports its own status without failing the batch."""
+        response = self._batch([
+            {"path": "/api/games/999"},
+            {"path": "/api/nothing-here"},
+            {"path": "/api/cart/items"},
+            {"path": "/api/games", "method": "POST"},
+            {"path": "/healthz"},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['status'] for result in response.get_json()['responses']], [404, 404, 405, 405, 400])
+
+    def test_nested_batch_rejected(self) -> None:
+        """Test a batch cannot contain another batch."""
+        result = self._batch([{"path": self.BATCH_API_PATH}]).get_json()['responses'][0]
+
+        self.assertEqual(result['status'], 400)
+
+    def test_too_many_requests(self) -> None:
+        """Test batches above BATCH_MAX_REQUESTS are rejected."""
+        response = self._batch([{"path": "/api/games"}] * 6)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.get_json())
+
+    def test_invalid_body(self) -> None:
+        """Test a body without a requests list is rejected."""
+        self.assertEqual(self.client.post(self.BATCH_API_PATH, json={"paths": []}).status_code, 400)
+        self.assertEqual(self.client.post(self.BATCH_API_PATH, data="nope").status_code, 400)
+
+    def test_non_object_body(self) -> None:
+        """Test a JSON body that is not an object is rejected instead of failing the server."""
+        for body in ([1], "requests", 5):
+            response = self.client.post(self.BATCH_API_PATH, json=body)
+
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('error', response.get_json())
+
+    def test_non_string_method(self) -> None:
+        """Test a sub-request whose method is not a string gets its own 400."""
+        response = self._batch([{"path": "/api/games", "method": 5}, {"path": "/api/games"}])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['status'] for result in response.get_json()['responses']], [400, 200])
+
+    def test_shared_connection(self) -> None:
+        """Test every sub-request runs on the batch's single database connection."""
+        checkouts = []
+        with self.app.app_context():
+            engine = db.engine
+        listener = lambda *args: checkouts.append(args)
+        event.listen(engine, 'checkout', listener)
+        try:
+            self._batch([{"path": "/api/games"}, {"path": f"/api/games/{self.game_id}/reviews"}])
+        finally:
+            event.remove(engine, 'checkout', listener)
+
+        self.assertEqual(len(checkouts), 1)
+
+    def test_private_and_write_routes_rejected(self) -> None:
+        """Test debug routes and GET routes that write, such as the cart, cannot be batched."""
+        response = self._batch([
+            {"path": "/api/debug/leak"},
+            {"path": "/api/cart?session_id=abc"},
+            {"path": "/api/cart/count?session_id=abc"},
+        ])
+
+        self.assertEqual([result['status'] for result in response.get_json()['responses']], [400, 400, 200])
+        self.assertNotIn('Set-Cookie', response.headers)
+
+    def test_request_hooks_run_per_subrequest(self) -> None:
+        """Test each sub-request runs the app's request hooks on its own."""
+        paths = []
+        self.app.before_request(lambda: paths.append(request.path) and None)
+
+        self._batch([{"path": "/api/games"}, {"path": f"/api/games/{self.game_id}/reviews"}])
+
+        self.assertEqual(paths, [self.BATCH_API_PATH, '/api/games', f'/api/games/{self.game_id}/reviews'])
+
+    def test_admission_slot_per_subrequest(self) -> None:
+        """Test each sub-request takes and releases its own admission slot, and the batch none."""
+        self._batch([{"path": "/api/games"}, {"path": "/api/games"}])
+
+        stats = self.app.extensions['admission'].stats()
+        self.assertEqual(stats['inFlight'], 0)
+        self.assertEqual(stats['admitted'], {'low': 2})
+
+if __name__ == '__main__':
+    unittest.main()
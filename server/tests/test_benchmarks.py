@@ -0,0 +1,66 @@
+import unittest
+from typing import Any, Dict
+from benchmarks.endpoints import compare, summarize_latencies
+
+
+class TestEndpointBenchmarks(unittest.TestCase):
+    """Tests for the endpoint benchmark summary and baseline comparison."""
+
+    BASELINE: Dict[str, Any] = {
+        'small': {
+            'games': {'opsPerSec': 100.0, 'p50Ms': 10.0, 'p95Ms': 20.0, 'p99Ms': 30.0,
+                      'sqlPerRequest': 3, 'peakKiB': 500.0},
+        },
+    }
+
+    def _result(self, **changes: Any) -> Dict[str, Any]:
+        return {'small': {'games': {**self.BASELINE['small']['games'], **changes}}}
+
+    def test_summarize_latencies(self) -> None:
+        """Test throughput and percentiles are reported in requests per second and milliseconds."""
+        summary = summarize_latencies([i / 1000 for i in range(1, 101)])
+
+        self.assertAlmostEqual(summary['p50Ms'], 50.5, places=1)
+        self.assertAlmostEqual(summary['p95Ms'], 95.05, places=1)
+        self.assertAlmostEqual(summary['p99Ms'], 99.01, places=1)
+        self.assertAlmostEqual(summary['opsPerSec'], 19.8, places=1)
+
+    def test_unchanged_results_pass(self) -> None:
+        """Test results equal to the baseline report no regressions."""
+        self.assertEqual(compare(self._result(), self.BASELINE), [])
+
+    def test_extra_statement_is_regression(self) -> None:
+        """Test any increase in statements per request fails."""
+        regressions = compare(self._result(sqlPerRequest=4), self.BASELINE)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertIn('small/games', regressions[0])
+
+    def test_latency_threshold(self) -> None:
+        """Test latency only regresses beyond the threshold."""
+        self.assertEqual(compare(self._result(p50Ms=14.0), self.BASELINE, threshold=0.5), [])
+        self.assertEqual(len(compare(self._result(p50Ms=16.0), self.BASELINE, threshold=0.5)), 1)
+
+    def test_slower_machine_normalized(self) -> None:
+        """Test latency is scaled by the calibration speed before comparing."""
+        slower = self._result(p50Ms=20.0, p95Ms=40.0)
+
+        self.assertEqual(len(compare(slower, self.BASELINE, threshold=0.5)), 1)
+        self.assertEqual(compare(slower, self.BASELINE, threshold=0.5, speed=2.0), [])
+
+    def test_peak_allocation_threshold(self) -> None:
+        """Test peak allocations regress beyond the memory threshold."""
+        regressions = compare(self._result(peakKiB=700.0), self.BASELINE, memory_threshold=0.25)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertIn('peak', regressions[0])
+
+    def test_new_routes_skipped(self) -> None:
+        """Test routes missing from the baseline are not compared."""
+        results = {'medium': {'games': self.BASELINE['small']['games']}}
+
+        self.assertEqual(compare(results, self.BASELINE), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
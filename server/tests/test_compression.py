@@ -0,0 +1,198 @@
+import gzip
+import json
+import unittest
+from typing import Any, Dict
+from unittest import mock
+import brotli
+import zstandard
+from flask import Flask
+from sqlalchemy import Engine, event
+from models import CacheGeneration, Game, Publisher, Category, db, init_db
+from routes.games import games_bp
+from routes.reviews import reviews_bp
+from utils import compression
+from utils.compression import init_compression
+from utils.json_provider import FastJSONProvider
+from utils.response_cache import CATALOG_CACHE, get_cache, invalidate_cache
+
+
+class TestCompression(unittest.TestCase):
+    """Tests for Accept-Encoding negotiation and precompressed cached variants."""
+
+    GAME_COUNT: int = 30
+    GAMES_API_PATH: str = '/api/games'
+    REVIEW_DATA: Dict[str, Any] = {
+        "rating": 5,
+        "reviewText": "Deploying on Friday was never this much fun.",
+        "reviewerName": "Mona",
+    }
+
+    def setUp(self) -> None:
+        """Create an app with compression and a catalog large enough to compress."""
+        self.app = Flask(__name__)
+        self.app.json = FastJSONProvider(self.app)
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        self.app.register_blueprint(games_bp)
+        self.app.register_blueprint(reviews_bp)
+        init_compression(self.app)
+        self.client = self.app.test_client()
+
+        init_db(self.app, testing=True)
+        with self.app.app_context():
+            db.create_all()
+            publisher = Publisher(name="DevGames Inc")
+            category = Category(name="Strategy")
+            db.session.add_all([publisher, category])
+            db.session.add_all([
+                Game(
+                    title=f"Pipeline Panic {i}",
+                    description="Build your DevOps pipeline before chaos ensues",
+                    publisher=publisher,
+                    category=category,
+                    star_rating=4.5,
+                )
+                for i in range(self.GAME_COUNT)
+            ])
+            db.session.commit()
+
+    def tearDown(self) -> None:
+        """Clean up test database and ensure proper connection closure"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+
+    def _get(self, path: str, encoding: str) -> Any:
+        return self.client.get(path, headers={'Accept-Encoding': encoding})
+
+    def test_gzip_response(self) -> None:
+        """Test gzip is used when it is the only accepted encoding."""
+        response = self._get(self.GAMES_API_PATH, 'gzip')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(len(json.loads(gzip.decompress(response.data))), self.GAME_COUNT)
+
+    def test_brotli_preferred(self) -> None:
+        """Test brotli wins when the client accepts every encoding."""
+        response = self._get(self.GAMES_API_PATH, 'gzip, deflate, br, zstd')
+
+        self.assertEqual(response.headers['Content-Encoding'], 'br')
+        self.assertEqual(len(json.loads(brotli.decompress(response.data))), self.GAME_COUNT)
+
+    def test_zstd_response(self) -> None:
+        """Test zstd is used when requested."""
+        response = self._get(self.GAMES_API_PATH, 'zstd')
+
+        self.assertEqual(response.headers['Content-Encoding'], 'zstd')
+        body = zstandard.ZstdDecompressor().decompressobj().decompress(response.data)
+        self.assertEqual(len(json.loads(body)), self.GAME_COUNT)
+
+    def test_identity_not_compressed(self) -> None:
+        """Test the body is sent as is without a supported encoding."""
+        response = self._get(self.GAMES_API_PATH, 'identity')
+
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(len(json.loads(response.data)), self.GAME_COUNT)
+
+    def test_small_response_not_compressed(self) -> None:
+        """Test bodies below COMPRESSION_MIN_SIZE are sent uncompressed."""
+        response = self._get(f'{self.GAMES_API_PATH}/1', 'gzip')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(json.loads(response.data)['id'], 1)
+
+    def test_cached_variant_reused(self) -> None:
+        """Test a cached response is compressed once per encoding."""
+        with mock.patch.object(compression, 'compress', wraps=compression.compress) as compress:
+            first = self._get(self.GAMES_API_PATH, 'gzip')
+            second = self._get(self.GAMES_API_PATH, 'gzip')
+            self._get(self.GAMES_API_PATH, 'br')
+            self._get(self.GAMES_API_PATH, 'br')
+
+        self.assertEqual(first.headers['X-Cache'], 'MISS')
+        self.assertEqual(second.headers['X-Cache'], 'HIT')
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(compress.call_count, 2)
+
+    def test_review_invalidates_catalog(self) -> None:
+        """Test creating a review drops cached game and review responses."""
+        reviews_path = f'{self.GAMES_API_PATH}/1/reviews'
+        self.assertEqual(self.client.get(reviews_path).headers['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(reviews_path).headers['X-Cache'], 'HIT')
+
+        response = self.client.post(reviews_path, json=self.REVIEW_DATA)
+        self.assertEqual(response.status_code, 201)
+
+        refreshed = self.client.get(reviews_path)
+        self.assertEqual(refreshed.headers['X-Cache'], 'MISS')
+        self.assertEqual(json.loads(refreshed.data)['totalReviews'], 1)
+
+    def test_write_in_another_worker_invalidates(self) -> None:
+        """Test a generation bumped by another worker's write makes this worker rebuild its copy."""
+        self.client.get(self.GAMES_API_PATH)
+        self.assertEqual(self.client.get(self.GAMES_API_PATH).headers['X-Cache'], 'HIT')
+
+        # What invalidate_cache commits in the worker that handled the write
+        with self.app.app_context():
+            db.session.add(CacheGeneration(name=CATALOG_CACHE, generation=1))
+            db.session.commit()
+
+        # Still served from this worker's copy until the generation is read again
+        self.assertEqual(self.client.get(self.GAMES_API_PATH).headers['X-Cache'], 'HIT')
+        with self.app.app_context():
+            cache = get_cache(CATALOG_CACHE)
+            cache.generation_read_at -= cache.generation_interval
+
+        self.assertEqual(self.client.get(self.GAMES_API_PATH).headers['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(self.GAMES_API_PATH).headers['X-Cache'], 'HIT')
+
+    def test_hit_runs_no_query(self) -> None:
+        """Test a cache hit within the generation interval does not touch the database."""
+        self.client.get(self.GAMES_API_PATH)
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(Engine, 'before_cursor_execute', listener)
+        try:
+            response = self.client.get(self.GAMES_API_PATH)
+        finally:
+            event.remove(Engine, 'before_cursor_execute', listener)
+
+        self.assertEqual(response.headers['X-Cache'], 'HIT')
+        self.assertEqual(statements, [])
+
+    def test_invalidate_upserts_generation(self) -> None:
+        """Test invalidation creates the generation row once and bumps it afterwards."""
+        with self.app.test_request_context():
+            for _ in range(3):
+                invalidate_cache(CATALOG_CACHE)
+            db.session.commit()
+
+            self.assertEqual(db.session.get(CacheGeneration, CATALOG_CACHE).generation, 3)
+
+    def test_primary_reads_bypass(self) -> None:
+        """Test clients that need their own writes are never given a cached response."""
+        self.client.get(self.GAMES_API_PATH)
+
+        response = self.client.get(self.GAMES_API_PATH, headers={'X-Read-Primary': 'true'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Cache', response.headers)
+
+    def test_cache_disabled(self) -> None:
+        """Test a TTL of zero turns caching off."""
+        self.app.config['RESPONSE_CACHE_TTL'] = 0
+
+        self.client.get(self.GAMES_API_PATH)
+        response = self.client.get(self.GAMES_API_PATH)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,16 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
 from flask import Flask
+from sqlalchemy import exc as sqlalchemy_exc
+from models import db
+from utils.database import init_db
 from routes.debug import debug_bp
+from utils.fault_injection import Fault, exhaust_pool
 
 
 class TestDebugLeak(unittest.TestCase):
@@ -46,5 +56,235 @@ class TestDebugLeak(unittest.TestCase):
         self.assertEqual(data['error'], 'invalid_parameters')
 
 
+class TestDebugProfiler(unittest.TestCase):
+    """Tests for the sampling profiler endpoints."""
+
+    def setUp(self) -> None:
+        self.app = Flask(__name__)
+        self.app.config['TESTING'] = True
+        self.app.register_blueprint(debug_bp)
+        self.app.add_url_rule('/busy', 'busy', self._busy)
+        self.client = self.app.test_client()
+
+    def tearDown(self) -> None:
+        self.client.post('/api/debug/profile/stop')
+
+    @staticmethod
+    def _busy() -> str:
+        deadline = time.monotonic() + 0.2
+        total = 0
+        while time.monotonic() < deadline:
+            total += sum(range(1000))
+        return str(total)
+
+    def test_start_and_stop_returns_collapsed_stacks(self) -> None:
+        resp = self.client.post('/api/debug/profile/start?seconds=5&interval=1')
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.get_json()['running'])
+
+        # A second profile cannot start while one is running
+        self.assertEqual(self.client.post('/api/debug/profile/start').status_code, 409)
+
+        worker = threading.Thread(target=self._busy)
+        worker.start()
+        worker.join()
+
+        resp = self.client.post('/api/debug/profile/stop')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.mimetype, 'text/plain')
+        lines = resp.get_data(as_text=True).strip().splitlines()
+        self.assertTrue(any('test_debug.py:_busy' in line for line in lines))
+        for line in lines:
+            stack, count = line.rsplit(' ', 1)
+            self.assertGreater(int(count), 0)
+        self.assertFalse(self.client.get('/api/debug/profile/status').get_json()['running'])
+
+    def test_profile_for_seconds(self) -> None:
+        resp = self.client.get('/api/debug/profile?seconds=0.1&interval=1')
+        self.assertEqual(resp.status_code, 200)
+        self.assertGreater(int(resp.headers['X-Profile-Samples']), 0)
+
+    def test_invalid_parameters(self) -> None:
+        resp = self.client.post('/api/debug/profile/start?seconds=9999')
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.get_json()['error'], 'invalid_parameters')
+
+    def test_single_request_profile(self) -> None:
+        resp = self.client.get('/busy', headers={'X-Profile': '1'})
+        self.assertEqual(resp.status_code, 200)
+        profile_id = resp.headers['X-Profile-Id']
+
+        resp = self.client.get(f'/api/debug/profile/requests/{profile_id}')
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn('test_debug.py:_busy', resp.get_data(as_text=True))
+
+        self.assertNotIn('X-Profile-Id', self.client.get('/busy').headers)
+        self.assertEqual(self.client.get('/api/debug/profile/requests/missing').status_code, 404)
+
+
+
+class TestDebugMemory(unittest.TestCase):
+    """Tests for the tracemalloc and memory stats endpoints."""
+
+    def setUp(self) -> None:
+        self.app = Flask(__name__)
+        self.app.config['TESTING'] = True
+        self.app.register_blueprint(debug_bp)
+        self.client = self.app.test_client()
+
+    def tearDown(self) -> None:
+        self.client.post('/api/debug/memory/tracemalloc/stop')
+        self.client.post('/api/debug/leak/clear')
+
+    def test_snapshot_diff_points_at_leak(self) -> None:
+        resp = self.client.post('/api/debug/memory/tracemalloc/start')
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.get_json()['tracing'])
+
+        self.assertEqual(self.client.post('/api/debug/memory/snapshots?name=before').status_code, 200)
+        self.client.post('/api/debug/leak?mb=2&count=1')
+        resp = self.client.post('/api/debug/memory/snapshots?name=after')
+        self.assertEqual(resp.get_json()['snapshots'], ['before', 'after'])
+
+        resp = self.client.get('/api/debug/memory/diff?from=before&to=after&limit=5')
+        self.assertEqual(resp.status_code, 200)
+        data = resp.get_json()
+        self.assertGreaterEqual(data['totalSizeDiff'], 2 * 1024 * 1024)
+        top = data['top'][0]
+        self.assertTrue(top['file'].endswith('debug.py'))
+        self.assertIsInstance(top['line'], int)
+        self.assertGreaterEqual(top['sizeDiff'], 2 * 1024 * 1024)
+
+        # Without 'to' the diff is against the current heap
+        self.assertEqual(self.client.get('/api/debug/memory/diff?from=before&groupBy=filename').status_code, 200)
+
+    def test_snapshot_requires_tracing(self) -> None:
+        self.assertEqual(self.client.post('/api/debug/memory/snapshots').status_code, 409)
+
+    def test_diff_unknown_snapshot(self) -> None:
+        self.client.post('/api/debug/memory/tracemalloc/start')
+        self.assertEqual(self.client.get('/api/debug/memory/diff?from=missing').status_code, 404)
+        self.assertEqual(self.client.post('/api/debug/memory/snapshots?name=bad/name').status_code, 400)
+
+    def test_memory_stats(self) -> None:
+        resp = self.client.get('/api/debug/memory/stats?limit=5')
+        self.assertEqual(resp.status_code, 200)
+        data = resp.get_json()
+        self.assertGreater(data['rssBytes'], 0)
+        self.assertEqual(len(data['gc']['counts']), 3)
+        self.assertEqual(len(data['objects']), 5)
+        self.assertFalse(data['tracemalloc']['tracing'])
+
+
+
+class TestDebugFaults(unittest.TestCase):
+    """Tests for the fault injection endpoints."""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.database_path = os.path.join(self.temp_dir.name, 'faults.db')
+        self.app = Flask(__name__)
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'pool_size': 1, 'max_overflow': 0, 'pool_timeout': 0.1}
+        init_db(self.app, connection_string=f'sqlite:///{self.database_path}', testing=True)
+        self.app.register_blueprint(debug_bp)
+        self.app.add_url_rule('/api/slow', 'slow', lambda: 'ok')
+        self.app.add_url_rule('/api/fast', 'fast', lambda: 'ok')
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self) -> None:
+        self.client.delete('/api/debug/faults')
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        self.temp_dir.cleanup()
+
+    def _timed_get(self, path: str) -> float:
+        start = time.perf_counter()
+        self.client.get(path)
+        return time.perf_counter() - start
+
+    def test_latency_on_route(self) -> None:
+        resp = self.client.post('/api/debug/faults', json={'type': 'latency', 'ms': 200, 'route': '/api/slow'})
+        self.assertEqual(resp.status_code, 201)
+        fault_id = resp.get_json()['id']
+
+        self.assertGreaterEqual(self._timed_get('/api/slow'), 0.2)
+        self.assertLess(self._timed_get('/api/fast'), 0.2)
+        self.assertLess(self._timed_get('/api/debug/faults'), 0.2)
+
+        faults = self.client.get('/api/debug/faults').get_json()['faults']
+        self.assertEqual([(f['id'], f['hits']) for f in faults], [(fault_id, 1)])
+
+        self.assertEqual(self.client.delete(f'/api/debug/faults/{fault_id}').status_code, 200)
+        self.assertLess(self._timed_get('/api/slow'), 0.2)
+        self.assertEqual(self.client.delete(f'/api/debug/faults/{fault_id}').status_code, 404)
+
+    def test_cpu_burn_expires(self) -> None:
+        self.client.post('/api/debug/faults', json={'type': 'cpu', 'ms': 50, 'ttlSeconds': 0.3})
+        self.assertGreaterEqual(self._timed_get('/api/fast'), 0.05)
+
+        time.sleep(0.4)
+        self.assertEqual(self.client.get('/api/debug/faults').get_json()['faults'], [])
+
+    def test_sqlite_write_lock(self) -> None:
+        resp = self.client.post('/api/debug/faults', json={'type': 'sqlite_lock', 'holdMs': 5000})
+        self.assertEqual(resp.status_code, 201)
+        time.sleep(0.1)
+
+        with self.assertRaises(sqlite3.OperationalError):
+            with sqlite3.connect(self.database_path, timeout=0.1) as connection:
+                connection.execute('INSERT INTO categories (name) VALUES (?)', ('Strategy',))
+
+        self.client.delete(f"/api/debug/faults/{resp.get_json()['id']}")
+        time.sleep(0.1)
+        with sqlite3.connect(self.database_path, timeout=1) as connection:
+            connection.execute('INSERT INTO categories (name) VALUES (?)', ('Strategy',))
+
+    def test_pool_exhaustion(self) -> None:
+        resp = self.client.post('/api/debug/faults', json={'type': 'pool_exhaustion'})
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.get_json()['params']['connections'], 1)
+
+        with self.app.app_context():
+            with self.assertRaises(sqlalchemy_exc.TimeoutError):
+                db.engine.connect()
+
+        self.client.delete('/api/debug/faults')
+        with self.app.app_context():
+            db.engine.connect().close()
+
+    def test_pool_exhaustion_unavailable(self) -> None:
+        with self.app.app_context():
+            held = db.engine.connect()
+            try:
+                resp = self.client.post('/api/debug/faults', json={'type': 'pool_exhaustion'})
+            finally:
+                held.close()
+
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(self.client.get('/api/debug/faults').get_json()['faults'], [])
+
+    def test_pool_exhaustion_releases_on_failure(self) -> None:
+        opened = mock.Mock()
+        engine = mock.Mock(connect=mock.Mock(side_effect=[opened, sqlalchemy_exc.TimeoutError()]))
+        fault = Fault(type='pool_exhaustion', ttl=60.0, params={'connections': 2})
+
+        with self.assertRaises(sqlalchemy_exc.TimeoutError):
+            exhaust_pool(fault, engine)
+
+        opened.close.assert_called_once_with()
+        self.assertEqual(fault._connections, [])
+
+    def test_invalid_fault(self) -> None:
+        for body in ({'type': 'meteor'}, {'type': 'latency'}, {'type': 'latency', 'ms': 10, 'ttlSeconds': 0},
+                     {'type': 'latency', 'ms': 10, 'route': 'api'}, {'type': 'pool_exhaustion', 'connections': 99}):
+            resp = self.client.post('/api/debug/faults', json=body)
+            self.assertEqual(resp.status_code, 400, body)
+            self.assertEqual(resp.get_json()['error'], 'invalid_parameters')
+
+
 if __name__ == '__main__':
     unittest.main()
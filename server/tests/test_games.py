@@ -3,8 +3,9 @@ import json
 from datetime import date
 from typing import Dict, List, Any, Optional
 from flask import Flask, Response
+from sqlalchemy import Engine, event
 from models import Game, Publisher, Category, db, init_db
-from routes.games import games_bp
+from routes.games import MAX_LOOKUP_IDS, games_bp
 
 class TestGamesRoutes(unittest.TestCase):
     # Test data as complete objects
@@ -41,6 +42,7 @@ class TestGamesRoutes(unittest.TestCase):
     
     # API paths
     GAMES_API_PATH: str = '/api/games'
+    LOOKUP_API_PATH: str = '/api/games/lookup'
 
     def setUp(self) -> None:
         """Set up test database and seed data"""
@@ -273,5 +275,86 @@ class TestGamesRoutes(unittest.TestCase):
             self.assertIsNotNone(game['popularity'])
             self.assertIsNotNone(game['releaseDate'])
 
+    def test_release_date_iso_format(self) -> None:
+        """Test that releaseDate is an ISO 8601 string with Flask's default JSON provider"""
+        response = self.client.get(f'{self.GAMES_API_PATH}?sort=title')
+        data = self._get_response_data(response)
+
+        self.assertEqual(data[1]['releaseDate'], '2025-06-15')
+
+    def _game_ids_by_title(self) -> Dict[str, int]:
+        """Helper method to map game titles to their ids"""
+        return {game['title']: game['id'] for game in self._get_response_data(self.client.get(self.GAMES_API_PATH))}
+
+    def test_lookup_preserves_requested_order(self) -> None:
+        """Test bulk lookup returns games in the order the ids were given"""
+        ids = self._game_ids_by_title()
+        requested = [ids['Pipeline Panic'], ids['Agile Adventures']]
+
+        response = self.client.post(self.LOOKUP_API_PATH, json={"ids": requested})
+        data = self._get_response_data(response)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([game['id'] for game in data['games']], requested)
+        self.assertEqual(data['games'][0]['publisher']['name'], 'DevGames Inc')
+        self.assertEqual(data['games'][0]['category']['name'], 'Strategy')
+        self.assertEqual(data['missingIds'], [])
+
+    def test_lookup_reports_missing_ids(self) -> None:
+        """Test unknown ids are reported and duplicates are returned once"""
+        game_id = self._game_ids_by_title()['Agile Adventures']
+
+        response = self.client.post(self.LOOKUP_API_PATH, json={"ids": [999, game_id, game_id]})
+        data = self._get_response_data(response)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([game['id'] for game in data['games']], [game_id])
+        self.assertEqual(data['missingIds'], [999])
+
+    def test_list_and_detail_run_one_query(self) -> None:
+        """Test the list and detail routes load publishers and categories from their joins"""
+        statements: List[str] = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(Engine, 'before_cursor_execute', listener)
+        try:
+            list_response = self.client.get(self.GAMES_API_PATH)
+            game_id = self._get_response_data(list_response)[0]['id']
+            detail_response = self.client.get(f"{self.GAMES_API_PATH}/{game_id}")
+        finally:
+            event.remove(Engine, 'before_cursor_execute', listener)
+
+        self.assertEqual(list_response.status_code, 200)
+        self.assertEqual(detail_response.status_code, 200)
+        # Ignore the cache generation reads; no lazy loads of publishers or categories may follow
+        self.assertEqual(len([statement for statement in statements if 'cache_generations' not in statement]), 2)
+
+    def test_lookup_runs_one_query(self) -> None:
+        """Test bulk lookup loads games, publishers and categories in a single query"""
+        ids = list(self._game_ids_by_title().values())
+        statements: List[str] = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(Engine, 'before_cursor_execute', listener)
+        try:
+            response = self.client.post(self.LOOKUP_API_PATH, json={"ids": ids})
+        finally:
+            event.remove(Engine, 'before_cursor_execute', listener)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(statements), 1)
+
+    def test_lookup_invalid_ids(self) -> None:
+        """Test bulk lookup rejects a missing or non-integer id list"""
+        for body in ({}, {"ids": "1,2"}, {"ids": [1, "2"]}, {"ids": [True]}):
+            response = self.client.post(self.LOOKUP_API_PATH, json=body)
+            self.assertEqual(response.status_code, 400)
+
+    def test_lookup_too_many_ids(self) -> None:
+        """Test bulk lookup rejects more than MAX_LOOKUP_IDS ids"""
+        response = self.client.post(self.LOOKUP_API_PATH, json={"ids": list(range(1, MAX_LOOKUP_IDS + 2))})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', self._get_response_data(response))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
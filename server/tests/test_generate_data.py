@@ -0,0 +1,121 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from sqlalchemy.dialects import postgresql
+from models import Cart
+from utils.generate_data import GeneratorConfig, generate_database, sequence_reset_statement
+
+
+class TestGenerateData(unittest.TestCase):
+    """Tests for the deterministic synthetic data generator."""
+
+    CONFIG: GeneratorConfig = GeneratorConfig(
+        games=200, categories=5, publishers=10, reviews_per_game=4.0, carts=50, seed=7, batch_size=64,
+    )
+    TABLES: tuple[str, ...] = ("categories", "publishers", "games", "reviews", "carts", "cart_items", "payments")
+
+    def setUp(self) -> None:
+        """Create a temporary directory for generated databases."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        """Remove generated databases."""
+        self.temp_dir.cleanup()
+
+    def _generate(self, name: str, config: GeneratorConfig, reset: bool = False) -> tuple[str, dict[str, int]]:
+        """Helper method to generate a dataset into a named database file."""
+        path = os.path.join(self.temp_dir.name, f"{name}.db")
+        return path, generate_database(config, f"sqlite:///{path}", reset=reset)
+
+    def _dump(self, path: str) -> dict[str, list[tuple]]:
+        """Helper method to read every row of every application table."""
+        with sqlite3.connect(path) as connection:
+            return {
+                table: connection.execute(f"SELECT * FROM {table} ORDER BY id").fetchall()
+                for table in self.TABLES
+            }
+
+    def test_generate_counts(self) -> None:
+        """Test row counts follow the configuration."""
+        _, counts = self._generate("counts", self.CONFIG)
+
+        self.assertEqual(counts["games"], self.CONFIG.games)
+        self.assertEqual(counts["categories"], self.CONFIG.categories)
+        self.assertEqual(counts["carts"], self.CONFIG.carts)
+        self.assertGreaterEqual(counts["cart_items"], self.CONFIG.carts)
+        self.assertAlmostEqual(counts["reviews"] / self.CONFIG.games, self.CONFIG.reviews_per_game, delta=1.0)
+
+    def test_generate_is_deterministic(self) -> None:
+        """Test the same seed produces identical databases."""
+        first, _ = self._generate("first", self.CONFIG)
+        second, _ = self._generate("second", self.CONFIG)
+
+        self.assertEqual(self._dump(first), self._dump(second))
+
+    def test_generate_different_seed_differs(self) -> None:
+        """Test a different seed produces a different dataset."""
+        first, _ = self._generate("first", self.CONFIG)
+        other = GeneratorConfig(**{**self.CONFIG.__dict__, "seed": 8})
+        second, _ = self._generate("second", other)
+
+        self.assertNotEqual(self._dump(first)["games"], self._dump(second)["games"])
+
+    def test_payments_only_for_checked_out_carts(self) -> None:
+        """Test every payment belongs to a checked out cart."""
+        path, _ = self._generate("payments", self.CONFIG)
+
+        with sqlite3.connect(path) as connection:
+            statuses = connection.execute(
+                "SELECT DISTINCT carts.status FROM payments JOIN carts ON carts.id = payments.cart_id"
+            ).fetchall()
+        self.assertEqual(statuses, [("checked_out",)])
+
+    def test_cart_items_use_game_prices(self) -> None:
+        """Test cart items are priced at their game's price."""
+        path, _ = self._generate("prices", self.CONFIG)
+
+        with sqlite3.connect(path) as connection:
+            mismatched = connection.execute(
+                "SELECT COUNT(*) FROM cart_items JOIN games ON games.id = cart_items.game_id"
+                " WHERE cart_items.price != games.price"
+            ).fetchone()
+        self.assertEqual(mismatched, (0,))
+
+    def test_generate_refuses_non_empty_database(self) -> None:
+        """Test a populated database is only replaced when reset is requested."""
+        self._generate("existing", self.CONFIG)
+
+        with self.assertRaises(RuntimeError):
+            self._generate("existing", self.CONFIG)
+
+        _, counts = self._generate("existing", self.CONFIG, reset=True)
+        self.assertEqual(counts["games"], self.CONFIG.games)
+
+    def test_batch_size_does_not_change_rows(self) -> None:
+        """Test carts, items and payments streamed in small batches match a single large batch."""
+        first, _ = self._generate("large", self.CONFIG)
+        second, _ = self._generate("small", GeneratorConfig(**{**self.CONFIG.__dict__, "batch_size": 3}))
+
+        self.assertEqual(self._dump(first), self._dump(second))
+
+    def test_reset_keeps_cache_generation(self) -> None:
+        """Test clearing data keeps the catalog cache generation seeded by the migrations."""
+        self._generate("generation", self.CONFIG)
+        path, _ = self._generate("generation", self.CONFIG, reset=True)
+
+        with sqlite3.connect(path) as connection:
+            names = connection.execute("SELECT name FROM cache_generations").fetchall()
+        self.assertEqual(names, [("catalog",)])
+
+    def test_sequence_reset_statement(self) -> None:
+        """Test PostgreSQL sequences are moved past the highest generated id."""
+        sql = str(sequence_reset_statement(Cart.__table__).compile(dialect=postgresql.dialect()))
+
+        self.assertIn("setval(pg_get_serial_sequence(", sql)
+        self.assertIn("max(carts.id)", sql)
+        self.assertIn("FROM carts", sql)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import json
+import unittest
+from unittest import mock
+from flask import Flask
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import OperationalError
+from models import db, init_db
+from utils import health
+from utils.health import HealthChecker, init_health
+
+
+class TestHealthEndpoints(unittest.TestCase):
+    """Tests for the liveness and readiness probes."""
+
+    def setUp(self) -> None:
+        """Create an app with the probes and an in-memory database."""
+        self.app = Flask(__name__)
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        self.app.config['HEALTH_CHECK_GRACE'] = 30
+        init_db(self.app, testing=True)
+        init_health(self.app)
+        self.checker: HealthChecker = self.app.extensions['health']
+        self.client = self.app.test_client()
+
+    def tearDown(self) -> None:
+        """Clean up test database and ensure proper connection closure"""
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+    def _readyz(self) -> tuple[int, dict]:
+        with mock.patch.object(HealthChecker, 'ensure_running'):
+            response = self.client.get('/readyz')
+        return response.status_code, json.loads(response.data)
+
+    def test_healthz_does_no_io(self) -> None:
+        """Test liveness answers without running any SQL."""
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(Engine, 'before_cursor_execute', listener)
+        try:
+            response = self.client.get('/healthz')
+        finally:
+            event.remove(Engine, 'before_cursor_execute', listener)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['status'], 'ok')
+        self.assertEqual(statements, [])
+
+    def test_not_ready_before_first_check(self) -> None:
+        """Test readiness waits for the first database check."""
+        status, body = self._readyz()
+
+        self.assertEqual(status, 503)
+        self.assertEqual(body['checks']['database']['status'], 'pending')
+
+    def test_ready_after_check(self) -> None:
+        """Test readiness reports the cached database check."""
+        self.assertTrue(self.checker.check_database())
+
+        status, body = self._readyz()
+
+        self.assertEqual(status, 200)
+        self.assertEqual(body['status'], 'ready')
+        self.assertEqual(body['checks']['database']['status'], 'ok')
+
+    def test_readyz_uses_cached_result(self) -> None:
+        """Test probes never query the database themselves."""
+        self.checker.check_database()
+
+        with mock.patch.object(self.checker, 'check_database') as check:
+            for _ in range(5):
+                self._readyz()
+
+        check.assert_not_called()
+
+    def test_transient_failure_tolerated(self) -> None:
+        """Test one failed check within the grace period keeps the worker ready."""
+        self.checker.check_database()
+        locked = OperationalError('SELECT 1', {}, Exception('database is locked'))
+        with mock.patch.object(health, 'text', side_effect=locked):
+            self.assertFalse(self.checker.check_database())
+
+        status, body = self._readyz()
+
+        self.assertEqual(status, 200)
+        self.assertIn('database is locked', body['checks']['database']['lastError'])
+
+    def test_unready_after_grace(self) -> None:
+        """Test the worker becomes unready once no check has succeeded for the grace period."""
+        self.checker.check_database()
+        self.checker.last_success -= 31
+
+        status, body = self._readyz()
+
+        self.assertEqual(status, 503)
+        self.assertEqual(body['checks']['database']['status'], 'failing')
+
+    def test_not_ready_until_warm(self) -> None:
+        """Test readiness also waits for warm-up."""
+        self.checker.check_database()
+        self.checker.warmed_up.clear()
+
+        status, body = self._readyz()
+
+        self.assertEqual(status, 503)
+        self.assertEqual(body['checks']['warmup'], 'running')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import json
+import unittest
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest import mock
+from flask import Flask
+from utils import json_provider
+from utils.json_provider import FastJSONProvider
+
+
+class TestFastJSONProvider(unittest.TestCase):
+    """Tests for the compact JSON provider and its stdlib fallback."""
+
+    TEST_DATA: dict = {
+        "releaseDate": date(2025, 6, 15),
+        "createdAt": datetime(2025, 6, 15, 10, 30, 0),
+        "updatedAt": datetime(2025, 6, 15, 10, 30, 0, 250000, tzinfo=timezone.utc),
+        "price": Decimal("19.99"),
+        "title": "Pipeline Panic",
+    }
+    EXPECTED: dict = {
+        "releaseDate": "2025-06-15",
+        "createdAt": "2025-06-15T10:30:00",
+        "updatedAt": "2025-06-15T10:30:00.250000+00:00",
+        "price": 19.99,
+        "title": "Pipeline Panic",
+    }
+
+    def setUp(self) -> None:
+        """Create an app using the provider with a route returning dates."""
+        self.app = Flask(__name__)
+        self.app.json = FastJSONProvider(self.app)
+        self.app.add_url_rule("/data", "data", lambda: self.TEST_DATA)
+        self.client = self.app.test_client()
+
+    def test_response_encodes_dates_as_iso(self) -> None:
+        """Test dates and datetimes are returned as ISO 8601 strings."""
+        response = self.client.get("/data")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertEqual(json.loads(response.data), self.EXPECTED)
+
+    def test_response_is_compact(self) -> None:
+        """Test the body has no whitespace between tokens."""
+        response = self.client.get("/data")
+
+        self.assertNotIn(b", ", response.data)
+        self.assertNotIn(b": ", response.data)
+
+    def test_stdlib_fallback_matches(self) -> None:
+        """Test the stdlib fallback produces the same output without orjson."""
+        fast = self.client.get("/data").data
+
+        with mock.patch.object(json_provider, "orjson", None):
+            fallback = self.client.get("/data").data
+            self.assertEqual(self.app.json.loads(fallback), self.EXPECTED)
+
+        self.assertEqual(json.loads(fast), json.loads(fallback))
+
+    def test_loads_round_trip(self) -> None:
+        """Test loads decodes what dumps produces."""
+        encoded = self.app.json.dumps(self.TEST_DATA)
+
+        self.assertEqual(self.app.json.loads(encoded), self.EXPECTED)
+
+    def test_response_arguments(self) -> None:
+        """Test response() accepts one value, several values or keyword arguments."""
+        with self.app.app_context():
+            self.assertEqual(json.loads(self.app.json.response({"a": 1}).data), {"a": 1})
+            self.assertEqual(json.loads(self.app.json.response(1, 2).data), [1, 2])
+            self.assertEqual(json.loads(self.app.json.response(a=1).data), {"a": 1})
+            self.assertIsNone(json.loads(self.app.json.response().data))
+            with self.assertRaises(TypeError):
+                self.app.json.response(1, a=1)
+
+    def test_unsupported_type_raises(self) -> None:
+        """Test unsupported values raise TypeError."""
+        with self.assertRaises(TypeError):
+            self.app.json.dumps({"value": object()})
+
+
+if __name__ == '__main__':
+    unittest.main()
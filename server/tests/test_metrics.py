@@ -0,0 +1,165 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from flask import Flask
+from models import Game, Publisher, Category, db, init_db
+from routes.games import games_bp
+from utils.metrics import (
+    DEAD_WORKERS_FILE, MetricsRegistry, REQUEST_DURATION, REQUESTS_TOTAL, init_metrics, merge_snapshots, render_prometheus,
+)
+
+
+class TestMetrics(unittest.TestCase):
+    """Tests for request and SQL metrics in Prometheus format."""
+
+    METRICS_PATH: str = '/metrics'
+    GAMES_API_PATH: str = '/api/games'
+    GAMES_LABELS: str = 'method="GET",endpoint="games.get_games"'
+
+    def setUp(self) -> None:
+        """Create an app with metrics enabled and a single game."""
+        self.app = Flask(__name__)
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        self.app.config['RESPONSE_CACHE_TTL'] = 0
+        self.app.config['METRICS_DIR'] = None
+        self.app.register_blueprint(games_bp)
+        init_metrics(self.app)
+        self.client = self.app.test_client()
+
+        init_db(self.app, testing=True)
+        with self.app.app_context():
+            db.create_all()
+            publisher = Publisher(name="DevGames Inc")
+            category = Category(name="Strategy")
+            db.session.add(Game(title="Pipeline Panic", description="Build your DevOps pipeline",
+                                publisher=publisher, category=category, star_rating=4.5))
+            db.session.commit()
+
+    def tearDown(self) -> None:
+        """Clean up test database and ensure proper connection closure"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+
+    def _metrics_lines(self) -> list[str]:
+        response = self.client.get(self.METRICS_PATH)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        return response.get_data(as_text=True).splitlines()
+
+    def test_request_counted_by_endpoint_and_status(self) -> None:
+        """Test requests are counted per endpoint and status code."""
+        self.client.get(self.GAMES_API_PATH)
+        self.client.get(self.GAMES_API_PATH)
+        self.client.get(f'{self.GAMES_API_PATH}/999')
+
+        lines = self._metrics_lines()
+
+        self.assertIn(f'tailspin_http_requests_total{{{self.GAMES_LABELS},status="200"}} 2', lines)
+        self.assertIn('tailspin_http_requests_total{method="GET",endpoint="games.get_game",status="404"} 1', lines)
+
+    def test_latency_histogram(self) -> None:
+        """Test latency buckets are cumulative and end with +Inf equal to the count."""
+        self.client.get(self.GAMES_API_PATH)
+
+        lines = self._metrics_lines()
+
+        self.assertIn('# TYPE tailspin_http_request_duration_seconds histogram', lines)
+        self.assertIn(f'tailspin_http_request_duration_seconds_bucket{{{self.GAMES_LABELS},le="+Inf"}} 1', lines)
+        self.assertIn(f'tailspin_http_request_duration_seconds_count{{{self.GAMES_LABELS}}} 1', lines)
+
+    def test_sql_statements_recorded(self) -> None:
+        """Test SQL statements executed by a request are counted."""
+        self.client.get(self.GAMES_API_PATH)
+
+        lines = self._metrics_lines()
+
+        sum_line = next(line for line in lines if line.startswith(f'tailspin_db_queries_per_request_sum{{{self.GAMES_LABELS}}}'))
+        self.assertGreaterEqual(float(sum_line.split()[-1]), 1)
+        self.assertTrue(any(line.startswith(f'tailspin_db_time_per_request_seconds_sum{{{self.GAMES_LABELS}}}')
+                            for line in lines))
+
+    def test_in_flight_returns_to_zero(self) -> None:
+        """Test the in-flight gauge is decremented after each request."""
+        self.client.get(self.GAMES_API_PATH)
+
+        lines = self._metrics_lines()
+
+        self.assertIn(f'tailspin_http_requests_in_flight{{{self.GAMES_LABELS}}} 0', lines)
+
+    def test_workers_aggregated_through_directory(self) -> None:
+        """Test /metrics sums the files written by every worker in METRICS_DIR."""
+        metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, metrics_dir)
+        self.app.config['METRICS_DIR'] = metrics_dir
+        other = MetricsRegistry()
+        other.inc(REQUESTS_TOTAL, ('GET', 'games.get_games', '200'), 5)
+        with open(os.path.join(metrics_dir, f'worker-{os.getppid()}.json'), 'w', encoding='utf-8') as file:
+            json.dump(other.snapshot(), file)
+
+        self.client.get(self.GAMES_API_PATH)
+        lines = self._metrics_lines()
+
+        self.assertIn(f'tailspin_http_requests_total{{{self.GAMES_LABELS},status="200"}} 6', lines)
+        self.assertTrue(os.path.exists(os.path.join(metrics_dir, f'worker-{os.getpid()}.json')))
+
+    def _write_worker_file(self, metrics_dir: str, pid: int, requests: int) -> None:
+        """Helper method to write the snapshot of another worker that served some requests."""
+        registry = MetricsRegistry()
+        registry.inc(REQUESTS_TOTAL, ('GET', 'games.get_games', '200'), requests)
+        with open(os.path.join(metrics_dir, f'worker-{pid}.json'), 'w', encoding='utf-8') as file:
+            json.dump(registry.snapshot(), file)
+
+    def test_exited_workers_folded(self) -> None:
+        """Test files of exited workers are added to one aggregate file and removed."""
+        metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, metrics_dir)
+        self.app.config['METRICS_DIR'] = metrics_dir
+        exited = [subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'],
+                                 capture_output=True, text=True, check=True).stdout.strip() for _ in range(2)]
+        for pid in exited:
+            self._write_worker_file(metrics_dir, int(pid), 3)
+
+        self.client.get(self.GAMES_API_PATH)
+        first = self._metrics_lines()
+        second = self._metrics_lines()
+
+        expected = f'tailspin_http_requests_total{{{self.GAMES_LABELS},status="200"}} 7'
+        self.assertIn(expected, first)
+        self.assertIn(expected, second)
+        self.assertEqual(sorted(entry for entry in os.listdir(metrics_dir) if entry.endswith('.json')),
+                         sorted([DEAD_WORKERS_FILE, f'worker-{os.getpid()}.json']))
+
+    def test_reused_pid_keeps_counts(self) -> None:
+        """Test a new worker with a reused pid keeps the counts of the file it would overwrite."""
+        metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, metrics_dir)
+        self.app.config['METRICS_DIR'] = metrics_dir
+        self._write_worker_file(metrics_dir, os.getpid(), 4)
+
+        self.client.get(self.GAMES_API_PATH)
+
+        self.assertIn(f'tailspin_http_requests_total{{{self.GAMES_LABELS},status="200"}} 5', self._metrics_lines())
+
+    def test_merge_and_render_histograms(self) -> None:
+        """Test histogram snapshots from two workers are summed slot by slot."""
+        first, second = MetricsRegistry(), MetricsRegistry()
+        first.observe(REQUEST_DURATION, ('GET', 'games.get_games'), 0.002)
+        second.observe(REQUEST_DURATION, ('GET', 'games.get_games'), 0.3)
+
+        text = render_prometheus(merge_snapshots([first.snapshot(), second.snapshot()]))
+
+        self.assertIn(f'tailspin_http_request_duration_seconds_bucket{{{self.GAMES_LABELS},le="0.005"}} 1', text)
+        self.assertIn(f'tailspin_http_request_duration_seconds_bucket{{{self.GAMES_LABELS},le="0.5"}} 2', text)
+        self.assertIn(f'tailspin_http_request_duration_seconds_sum{{{self.GAMES_LABELS}}} 0.302', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
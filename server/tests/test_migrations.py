@@ -0,0 +1,147 @@
+import os
+import shutil
+import tempfile
+import unittest
+from flask import Flask
+from sqlalchemy import inspect
+from models import db, init_db
+from utils.migrations import MIGRATIONS, current_version, migrate, migrate_command
+
+
+class TestMigrations(unittest.TestCase):
+    """Tests for the versioned schema migrations."""
+
+    LEGACY_DATABASE: str = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "data", "tailspin-toys.db",
+    )
+    EXPECTED_INDEXES: dict[str, set[str]] = {
+        "games": {"ix_games_title", "ix_games_popularity", "ix_games_category_id", "ix_games_publisher_id"},
+        "reviews": {"ix_reviews_game_id_created_at"},
+        "cart_items": {"ix_cart_items_cart_id_game_id"},
+        "payments": {"ix_payments_cart_id"},
+    }
+
+    def setUp(self) -> None:
+        """Set up an app pointing at a temporary database file."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.database_path = os.path.join(self.temp_dir.name, "migrations.db")
+        self.app = Flask(__name__)
+        self.app.config["TESTING"] = True
+        self.app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{self.database_path}"
+        self.app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+        init_db(self.app, testing=True)
+
+    def tearDown(self) -> None:
+        """Dispose of the engine and remove the temporary database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        self.temp_dir.cleanup()
+
+    def _index_names(self, table_name: str) -> set[str]:
+        """Helper method to list index names on a table."""
+        return {index["name"] for index in inspect(db.engine).get_indexes(table_name)}
+
+    def _schema(self) -> dict[str, tuple[set[str], set[str]]]:
+        """Helper method to list column and index names per table."""
+        inspector = inspect(db.engine)
+        return {
+            table_name: ({c["name"] for c in inspector.get_columns(table_name)}, self._index_names(table_name))
+            for table_name in inspector.get_table_names()
+        }
+
+    def test_init_db_does_not_create_tables(self) -> None:
+        """Test app initialization issues no DDL."""
+        with self.app.app_context():
+            self.assertEqual(inspect(db.engine).get_table_names(), [])
+
+    def test_migrate_fresh_database(self) -> None:
+        """Test all migrations apply to an empty database."""
+        with self.app.app_context():
+            applied = migrate(db.engine)
+
+            self.assertEqual([m.version for m in applied], [m.version for m in MIGRATIONS])
+            with db.engine.connect() as connection:
+                self.assertEqual(current_version(connection), MIGRATIONS[-1].version)
+            for table_name, indexes in self.EXPECTED_INDEXES.items():
+                self.assertTrue(indexes.issubset(self._index_names(table_name)))
+            schema = self._schema()
+            for table in db.metadata.sorted_tables:
+                self.assertEqual(schema[table.name][0], set(table.columns.keys()))
+
+    def test_migrate_is_idempotent(self) -> None:
+        """Test a second run applies nothing."""
+        with self.app.app_context():
+            migrate(db.engine)
+            self.assertEqual(migrate(db.engine), [])
+
+    def test_migrate_to_target(self) -> None:
+        """Test migrating stops at the requested version."""
+        with self.app.app_context():
+            applied = migrate(db.engine, target=1)
+
+            self.assertEqual([m.version for m in applied], [1])
+            with db.engine.connect() as connection:
+                self.assertEqual(current_version(connection), 1)
+
+    def test_version_one_is_frozen(self) -> None:
+        """Test version 1 creates the original schema, whatever the current models declare."""
+        with self.app.app_context():
+            migrate(db.engine, target=1)
+
+            columns = {c["name"] for c in inspect(db.engine).get_columns("games")}
+            self.assertFalse({"popularity", "release_date", "price"} & columns)
+            self.assertEqual(self._index_names("games"), set())
+            self.assertNotIn("cache_generations", inspect(db.engine).get_table_names())
+
+    def test_fresh_database_matches_upgraded(self) -> None:
+        """Test a fresh database ends with the same schema as the upgraded shipped one."""
+        with self.app.app_context():
+            migrate(db.engine)
+            fresh = self._schema()
+            db.engine.dispose()
+
+        os.remove(self.database_path)
+        shutil.copyfile(self.LEGACY_DATABASE, self.database_path)
+        with self.app.app_context():
+            migrate(db.engine)
+            self.assertEqual(self._schema(), fresh)
+
+    def test_migrate_legacy_database(self) -> None:
+        """Test the shipped database gains the new columns and indexes without losing rows."""
+        shutil.copyfile(self.LEGACY_DATABASE, self.database_path)
+
+        with self.app.app_context():
+            before = db.session.execute(db.text("SELECT COUNT(*) FROM games")).scalar()
+            migrate(db.engine)
+            after = db.session.execute(db.text("SELECT COUNT(*) FROM games")).scalar()
+
+            columns = {c["name"] for c in inspect(db.engine).get_columns("games")}
+            self.assertTrue({"popularity", "release_date", "price"}.issubset(columns))
+            self.assertEqual(before, after)
+            for table_name, indexes in self.EXPECTED_INDEXES.items():
+                self.assertTrue(indexes.issubset(self._index_names(table_name)))
+
+    def test_migrate_command(self) -> None:
+        """Test the migrate CLI command applies and then reports up to date."""
+        runner = self.app.test_cli_runner()
+
+        result = runner.invoke(migrate_command)
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Applied: 1", result.output)
+
+        result = runner.invoke(migrate_command)
+        self.assertIn("Database is up to date", result.output)
+
+    def test_migrate_command_status(self) -> None:
+        """Test the status flag lists pending migrations without applying them."""
+        result = self.app.test_cli_runner().invoke(migrate_command, ["--status"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Current version: 0", result.output)
+        self.assertIn("Pending: 1", result.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
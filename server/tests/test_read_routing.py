@@ -0,0 +1,149 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+from typing import Any, Dict
+from unittest import mock
+from flask import Flask
+from sqlalchemy import event
+from models import Game, Publisher, Category, db
+from models.session import REPLICA_BIND_KEY
+from routes.games import games_bp
+from routes.cart import cart_bp
+from routes.batch import batch_bp
+from utils.database import init_db
+from utils.read_routing import init_read_routing, READ_YOUR_WRITES_COOKIE, READ_PRIMARY_HEADER
+
+
+class TestReadRouting(unittest.TestCase):
+    """Tests for routing read-only requests to the read replica."""
+
+    TEST_DATA: Dict[str, Any] = {
+        "publisher": {"name": "DevGames Inc"},
+        "category": {"name": "Strategy"},
+        "game": {
+            "title": "Pipeline Panic",
+            "description": "Build your DevOps pipeline before chaos ensues",
+            "star_rating": 4.5,
+            "popularity": 500,
+            "release_date": date(2025, 6, 15),
+            "price": 29.99,
+        },
+    }
+
+    def setUp(self) -> None:
+        """Create a file database with a read-only replica bind pointing at it."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        database_path = os.path.join(self.temp_dir.name, "routing.db")
+        read_url = f"sqlite:///file:{database_path}?mode=ro&uri=true"
+
+        self.app = Flask(__name__)
+        self.app.config["TESTING"] = True
+        self.app.register_blueprint(games_bp)
+        self.app.register_blueprint(cart_bp)
+        self.app.register_blueprint(batch_bp)
+
+        with mock.patch.dict(os.environ, {"DATABASE_READ_URL": read_url}):
+            init_db(self.app, connection_string=f"sqlite:///{database_path}", testing=True)
+        init_read_routing(self.app)
+        self.client = self.app.test_client()
+
+        self.statements: Dict[str, int] = {"primary": 0, "replica": 0}
+        with self.app.app_context():
+            db.create_all()
+            self._seed_test_data()
+            self._count_statements(db.engines[None], "primary")
+            self._count_statements(db.engines[REPLICA_BIND_KEY], "replica")
+
+    def tearDown(self) -> None:
+        """Clean up the database and engines."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            for engine in db.engines.values():
+                engine.dispose()
+        # init_app registers a metadata per bind on the shared db; drop it so
+        # create_all() in later apps without a replica does not look for it
+        db.metadatas.pop(REPLICA_BIND_KEY, None)
+        self.temp_dir.cleanup()
+
+    def _seed_test_data(self) -> None:
+        """Helper method to seed test data."""
+        publisher = Publisher(**self.TEST_DATA["publisher"])
+        category = Category(**self.TEST_DATA["category"])
+        game = Game(**self.TEST_DATA["game"], publisher=publisher, category=category)
+        db.session.add_all([publisher, category, game])
+        db.session.commit()
+        self.game_id = game.id
+
+    def _count_statements(self, engine: Any, name: str) -> None:
+        """Helper method to count statements executed on an engine."""
+        def before_cursor_execute(*args: Any) -> None:
+            self.statements[name] += 1
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+
+    def test_get_games_uses_replica(self) -> None:
+        """Test a read-only endpoint is served by the replica."""
+        response = self.client.get("/api/games")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)), 1)
+        self.assertGreater(self.statements["replica"], 0)
+        self.assertEqual(self.statements["primary"], 0)
+
+    def test_mutation_uses_primary_and_sets_cookie(self) -> None:
+        """Test a mutation writes to the primary and pins subsequent reads."""
+        response = self.client.post(
+            "/api/cart/items",
+            data=json.dumps({"sessionId": "routing-session", "gameId": self.game_id}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertGreater(self.statements["primary"], 0)
+        self.assertIn(READ_YOUR_WRITES_COOKIE, response.headers.get("Set-Cookie", ""))
+
+    def test_read_your_writes_after_mutation(self) -> None:
+        """Test reads after a mutation are served by the primary."""
+        self.client.post(
+            "/api/cart/items",
+            data=json.dumps({"sessionId": "routing-session", "gameId": self.game_id, "quantity": 2}),
+            content_type="application/json",
+        )
+        self.statements.update(primary=0, replica=0)
+
+        response = self.client.get("/api/cart/count?session_id=routing-session")
+
+        self.assertEqual(json.loads(response.data)["count"], 2)
+        self.assertGreater(self.statements["primary"], 0)
+        self.assertEqual(self.statements["replica"], 0)
+
+    def test_read_primary_header_forces_primary(self) -> None:
+        """Test the read-primary header bypasses the replica."""
+        response = self.client.get("/api/games", headers={READ_PRIMARY_HEADER: "1"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(self.statements["primary"], 0)
+        self.assertEqual(self.statements["replica"], 0)
+
+    def test_get_cart_stays_on_primary(self) -> None:
+        """Test GET /api/cart, which can create a cart, is not routed to the replica."""
+        response = self.client.get("/api/cart?session_id=new-session")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.statements["replica"], 0)
+
+    def test_batch_reads_replica_without_pinning(self) -> None:
+        """Test a batch of reads uses the replica and, though sent as POST, sets no cookie."""
+        response = self.client.post("/api/batch", json={"requests": [{"path": "/api/games"}]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["responses"][0]["status"], 200)
+        self.assertGreater(self.statements["replica"], 0)
+        self.assertEqual(self.statements["primary"], 0)
+        self.assertNotIn(READ_YOUR_WRITES_COOKIE, response.headers.get("Set-Cookie", ""))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import csv
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+from flask import Flask
+from models import db, init_db, Category, Game, Publisher
+from utils.seed_database import create_games, iter_csv_rows
+
+
+class TestSeedDatabase(unittest.TestCase):
+    """Tests for the bulk CSV seeder."""
+
+    GAME_COUNT: int = 25
+    CATEGORIES: list[str] = ["Strategy", "Card Game", "Puzzle"]
+    PUBLISHERS: list[str] = ["DevGames Inc", "Scrum Masters"]
+
+    def setUp(self) -> None:
+        """Write a temporary CSV and point DATABASE_URL at a temporary database."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.database_url = f"sqlite:///{os.path.join(self.temp_dir.name, 'seed.db')}"
+        self.csv_path = os.path.join(self.temp_dir.name, "games.csv")
+        with open(self.csv_path, "w", encoding="utf-8", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["Title", "Category", "Publisher", "Description"])
+            for i in range(self.GAME_COUNT):
+                writer.writerow([
+                    f"Game {i}",
+                    self.CATEGORIES[i % len(self.CATEGORIES)],
+                    self.PUBLISHERS[i % len(self.PUBLISHERS)],
+                    f"Description for game number {i}",
+                ])
+        self.env = mock.patch.dict(os.environ, {"DATABASE_URL": self.database_url})
+        self.env.start()
+
+    def tearDown(self) -> None:
+        """Remove the temporary files."""
+        self.env.stop()
+        self.temp_dir.cleanup()
+
+    def _seed(self, batch_size: int) -> Flask:
+        """Helper method to run the seeder quietly and return an app bound to the database."""
+        with redirect_stdout(io.StringIO()):
+            self.result = create_games(self.csv_path, batch_size=batch_size)
+        app = Flask(__name__)
+        app.config["SQLALCHEMY_DATABASE_URI"] = self.database_url
+        init_db(app, testing=True)
+        self.addCleanup(self._dispose, app)
+        return app
+
+    def _dispose(self, app: Flask) -> None:
+        """Helper method to close the app's database connections."""
+        with app.app_context():
+            db.engine.dispose()
+
+    def test_iter_csv_rows_streams_rows(self) -> None:
+        """Test the CSV reader yields rows lazily."""
+        rows = iter_csv_rows(self.csv_path)
+
+        self.assertEqual(next(rows)["Title"], "Game 0")
+        self.assertEqual(len(list(rows)), self.GAME_COUNT - 1)
+
+    def test_create_games_in_batches(self) -> None:
+        """Test all rows are inserted when they span several batches."""
+        app = self._seed(batch_size=10)
+
+        with app.app_context():
+            self.assertEqual(db.session.query(Game).count(), self.GAME_COUNT)
+            self.assertEqual(db.session.query(Category).count(), len(self.CATEGORIES))
+            self.assertEqual(db.session.query(Publisher).count(), len(self.PUBLISHERS))
+            game = db.session.query(Game).filter_by(title="Game 4").one()
+            self.assertEqual(game.category.name, self.CATEGORIES[4 % len(self.CATEGORIES)])
+            self.assertEqual(game.publisher.name, self.PUBLISHERS[0])
+
+        self.assertEqual(self.result.games, self.GAME_COUNT)
+        self.assertGreater(self.result.rows_per_second, 0)
+
+    def test_create_games_reuses_existing_lookups(self) -> None:
+        """Test a second run reuses existing categories and publishers."""
+        self._seed(batch_size=100)
+        app = self._seed(batch_size=100)
+
+        with app.app_context():
+            self.assertEqual(db.session.query(Game).count(), self.GAME_COUNT * 2)
+            self.assertEqual(db.session.query(Category).count(), len(self.CATEGORIES))
+
+    def test_invalid_batch_size_rejected(self) -> None:
+        """Test a batch size below 1 fails instead of silently inserting nothing."""
+        for batch_size in (0, -5):
+            with self.assertRaises(ValueError):
+                self._seed(batch_size=batch_size)
+
+        # The failed runs rolled back, so only the valid run's games are there
+        app = self._seed(batch_size=10)
+        with app.app_context():
+            self.assertEqual(db.session.query(Game).count(), self.GAME_COUNT)
+
+
+if __name__ == '__main__':
+    unittest.main()
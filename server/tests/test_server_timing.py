@@ -0,0 +1,104 @@
+import re
+import time
+import unittest
+from flask import Flask
+from models import Game, Publisher, Category, db, init_db
+from routes.games import games_bp
+from utils.instrumentation import get_request_stats
+from utils.json_provider import FastJSONProvider
+from utils.server_timing import format_server_timing, init_server_timing
+
+
+class TestServerTiming(unittest.TestCase):
+    """Tests for the Server-Timing response header."""
+
+    GAMES_API_PATH: str = '/api/games'
+    PHASE_PATTERN: re.Pattern = re.compile(r'(\w+);dur=([\d.]+)')
+
+    def setUp(self) -> None:
+        """Create an app with Server-Timing enabled and a single game."""
+        self.app = Flask(__name__)
+        self.app.json = FastJSONProvider(self.app)
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        self.app.config['RESPONSE_CACHE_TTL'] = 0
+        self.app.config['SERVER_TIMING'] = True
+        init_server_timing(self.app)
+        self.app.register_blueprint(games_bp)
+        self.client = self.app.test_client()
+
+        init_db(self.app, testing=True)
+        with self.app.app_context():
+            db.create_all()
+            publisher = Publisher(name="DevGames Inc")
+            category = Category(name="Strategy")
+            db.session.add(Game(title="Pipeline Panic", description="Build your DevOps pipeline",
+                                publisher=publisher, category=category, star_rating=4.5))
+            db.session.commit()
+
+    def tearDown(self) -> None:
+        """Clean up test database and ensure proper connection closure"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+
+    def test_header_has_all_phases(self) -> None:
+        """Test responses carry the db, orm and serialize phases, app and total extras and a query count."""
+        response = self.client.get(self.GAMES_API_PATH)
+
+        header = response.headers['Server-Timing']
+        phases = {name: float(value) for name, value in self.PHASE_PATTERN.findall(header)}
+        self.assertEqual(set(phases), {'db', 'orm', 'serialize', 'app', 'total'})
+        self.assertGreater(phases['db'], 0)
+        self.assertGreater(phases['serialize'], 0)
+        self.assertGreater(phases['orm'], 0)
+        self.assertLessEqual(phases['db'] + phases['orm'] + phases['serialize'], phases['total'] + 0.01)
+        self.assertRegex(header, r'queries;desc="[1-9]\d*"')
+
+    def test_error_responses_timed(self) -> None:
+        """Test error responses are timed too."""
+        response = self.client.get(f'{self.GAMES_API_PATH}/999')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('total;dur=', response.headers['Server-Timing'])
+
+    def test_disabled_by_config(self) -> None:
+        """Test no header is added when SERVER_TIMING is off."""
+        app = Flask(__name__)
+        app.config['SERVER_TIMING'] = False
+        init_server_timing(app)
+        app.add_url_rule('/ping', 'ping', lambda: 'pong')
+
+        response = app.test_client().get('/ping')
+
+        self.assertNotIn('Server-Timing', response.headers)
+
+    def test_app_phase_is_remainder(self) -> None:
+        """Test app is the time left after SQL, ORM materialization and serialization, never negative."""
+        self.assertEqual(
+            format_server_timing(0.010, 0.004, 0.002, 0.001, 3),
+            'db;dur=4.00, orm;dur=2.00, serialize;dur=1.00, app;dur=3.00, total;dur=10.00, queries;desc="3"',
+        )
+        self.assertIn('app;dur=0.00', format_server_timing(0.001, 0.002, 0.0, 0.0, 1))
+
+    def test_to_dict_excludes_sql(self) -> None:
+        """Test to_dict time leaves out the SQL of lazy loads it triggers."""
+        with self.app.test_request_context():
+            game = db.session.execute(db.select(Game)).scalars().one()
+            db.session.expire(game, ['publisher', 'category'])
+            stats = get_request_stats()
+            sql_before = stats.sql_seconds
+            start = time.perf_counter()
+            game.to_dict()
+            elapsed = time.perf_counter() - start
+
+            sql_seconds = stats.sql_seconds - sql_before
+            self.assertGreater(sql_seconds, 0)
+            self.assertGreater(stats.to_dict_seconds, 0)
+            self.assertLessEqual(stats.to_dict_seconds, elapsed - sql_seconds + 1e-6)
+            self.assertEqual(stats.to_dict_depth, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from utils.serving import (
+    available_cpus, build_server_options, cgroup_cpu_limit, default_thread_count, default_worker_count,
+    CGROUP_V1_PERIOD, CGROUP_V1_QUOTA, CGROUP_V2_CPU_MAX,
+)
+
+
+class TestServing(unittest.TestCase):
+    """Tests for the production server settings."""
+
+    def setUp(self) -> None:
+        """Create a fake filesystem root for cgroup files."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+
+    def tearDown(self) -> None:
+        """Remove the fake filesystem root."""
+        self.temp_dir.cleanup()
+
+    def _write(self, relative_path: str, content: str) -> None:
+        """Helper method to write a fake cgroup file."""
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+    def test_cgroup_v2_limit(self) -> None:
+        """Test a cgroup v2 quota is converted to CPUs."""
+        self._write(CGROUP_V2_CPU_MAX, "150000 100000\n")
+
+        self.assertEqual(cgroup_cpu_limit(self.root), 1.5)
+
+    def test_cgroup_v2_unlimited(self) -> None:
+        """Test an unlimited cgroup v2 quota reports no limit."""
+        self._write(CGROUP_V2_CPU_MAX, "max 100000\n")
+
+        self.assertIsNone(cgroup_cpu_limit(self.root))
+
+    def test_cgroup_v1_limit(self) -> None:
+        """Test a cgroup v1 quota and period are converted to CPUs."""
+        self._write(CGROUP_V1_QUOTA, "100000\n")
+        self._write(CGROUP_V1_PERIOD, "100000\n")
+
+        self.assertEqual(cgroup_cpu_limit(self.root), 1.0)
+
+    def test_cgroup_v1_unlimited(self) -> None:
+        """Test a negative cgroup v1 quota reports no limit."""
+        self._write(CGROUP_V1_QUOTA, "-1\n")
+        self._write(CGROUP_V1_PERIOD, "100000\n")
+
+        self.assertIsNone(cgroup_cpu_limit(self.root))
+
+    def test_available_cpus_uses_smaller_quota(self) -> None:
+        """Test the cgroup quota caps the affinity CPU count."""
+        self._write(CGROUP_V2_CPU_MAX, "50000 100000\n")
+
+        with mock.patch("os.sched_getaffinity", return_value={0, 1, 2, 3}):
+            self.assertEqual(available_cpus(self.root), 0.5)
+
+    def test_default_worker_count(self) -> None:
+        """Test worker counts scale with CPUs and round fractional quotas up."""
+        self.assertEqual(default_worker_count(0.5), 3)
+        self.assertEqual(default_worker_count(1), 3)
+        self.assertEqual(default_worker_count(4), 9)
+
+    def test_default_thread_count(self) -> None:
+        """Test thread counts scale with CPUs within their bounds."""
+        self.assertEqual(default_thread_count(0.25), 2)
+        self.assertEqual(default_thread_count(0.5), 2)
+        self.assertEqual(default_thread_count(1), 4)
+        self.assertEqual(default_thread_count(1.5), 6)
+        self.assertEqual(default_thread_count(16), 8)
+
+    def test_build_server_options_defaults(self) -> None:
+        """Test default options preload the app and use threaded workers."""
+        self._write(CGROUP_V2_CPU_MAX, "100000 100000\n")
+
+        with mock.patch.dict(os.environ, {"WEB_CONCURRENCY": "", "SERVER_THREADS": "", "PORT": ""}):
+            options = build_server_options(self.root)
+
+        self.assertEqual(options["bind"], "0.0.0.0:5100")
+        self.assertEqual(options["workers"], 3)
+        self.assertEqual(options["threads"], 4)
+        self.assertEqual(options["worker_class"], "gthread")
+        self.assertTrue(options["preload_app"])
+
+    def test_build_server_options_env_overrides(self) -> None:
+        """Test environment variables override derived settings."""
+        env = {"WEB_CONCURRENCY": "2", "SERVER_THREADS": "8", "SERVER_KEEPALIVE": "75", "PORT": "8000"}
+
+        with mock.patch.dict(os.environ, env):
+            options = build_server_options(self.root)
+
+        self.assertEqual(options["workers"], 2)
+        self.assertEqual(options["threads"], 8)
+        self.assertEqual(options["keepalive"], 75)
+        self.assertEqual(options["bind"], "0.0.0.0:8000")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import threading
+import time
+import unittest
+from typing import Any, List
+from flask import Flask, jsonify
+from models import db, init_db
+from utils.response_cache import cached_response
+from utils.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Tests for coalescing identical concurrent computations."""
+
+    def test_concurrent_callers_share_one_run(self) -> None:
+        """Test callers arriving during a run wait for it and share its result."""
+        group: SingleFlight[int] = SingleFlight()
+        calls: List[int] = []
+
+        def compute() -> int:
+            calls.append(1)
+            time.sleep(0.1)
+            return 42
+
+        results: List[Any] = []
+        threads = [threading.Thread(target=lambda: results.append(group.do('key', compute))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(results), [(42, False)] + [(42, True)] * 4)
+        self.assertEqual(group.in_flight(), 0)
+
+    def test_error_shared_with_followers(self) -> None:
+        """Test followers see the leader's exception."""
+        group: SingleFlight[int] = SingleFlight()
+        started = threading.Event()
+
+        def fail() -> int:
+            started.set()
+            time.sleep(0.1)
+            raise RuntimeError('database is locked')
+
+        errors: List[BaseException] = []
+
+        def call() -> None:
+            try:
+                group.do('key', fail)
+            except RuntimeError as error:
+                errors.append(error)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait()
+        call()
+        leader.join()
+
+        self.assertEqual(len(errors), 2)
+
+    def test_follower_times_out(self) -> None:
+        """Test a follower computes on its own when the leader takes too long."""
+        group: SingleFlight[str] = SingleFlight(timeout=0.05)
+        release = threading.Event()
+        leader = threading.Thread(target=group.do, args=('key', lambda: release.wait(1) and 'leader'))
+        leader.start()
+        time.sleep(0.01)
+
+        self.assertEqual(group.do('key', lambda: 'follower'), ('follower', False))
+        release.set()
+        leader.join()
+
+
+class TestCoalescedRoutes(unittest.TestCase):
+    """Tests for coalescing concurrent identical GET requests to cached views."""
+
+    def setUp(self) -> None:
+        """Create an app with a slow cached view that counts its calls."""
+        self.app = Flask(__name__)
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.calls: List[str] = []
+        # Cached views read the cache generation from the database
+        init_db(self.app, testing=True)
+        with self.app.app_context():
+            db.create_all()
+
+        @self.app.route('/api/games')
+        @cached_response('catalog')
+        def games() -> Any:
+            self.calls.append('games')
+            time.sleep(0.2)
+            return jsonify([{'id': 1, 'title': 'Pipeline Panic'}])
+
+    def tearDown(self) -> None:
+        """Clean up test database and ensure proper connection closure"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+
+    def _concurrent_get(self, paths: List[str]) -> List[Any]:
+        responses: List[Any] = [None] * len(paths)
+
+        def get(index: int) -> None:
+            responses[index] = self.app.test_client().get(paths[index])
+
+        threads = [threading.Thread(target=get, args=(i,)) for i in range(len(paths))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return responses
+
+    def test_identical_requests_run_view_once(self) -> None:
+        """Test one request runs the view and the rest receive copies."""
+        self.app.config['RESPONSE_CACHE_TTL'] = 0
+
+        responses = self._concurrent_get(['/api/games?sort=popularity&page=1', '/api/games?page=1&sort=popularity'] * 4)
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertTrue(all(r.status_code == 200 for r in responses))
+        self.assertEqual({r.data for r in responses}, {responses[0].data})
+        self.assertEqual(sorted(r.headers['X-Cache'] for r in responses), ['COALESCED'] * 7 + ['MISS'])
+
+    def test_different_arguments_not_coalesced(self) -> None:
+        """Test requests with different arguments each run the view."""
+        responses = self._concurrent_get(['/api/games?sort=title', '/api/games?sort=popularity'])
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual([r.headers['X-Cache'] for r in responses], ['MISS', 'MISS'])
+
+    def test_disabled_by_config(self) -> None:
+        """Test SINGLE_FLIGHT off lets every request run the view."""
+        self.app.config['RESPONSE_CACHE_TTL'] = 0
+        self.app.config['SINGLE_FLIGHT'] = False
+
+        self._concurrent_get(['/api/games'] * 3)
+
+        self.assertEqual(len(self.calls), 3)
+
+    def test_primary_reads_bypass(self) -> None:
+        """Test clients that need their own writes are never given a cached or shared response."""
+        client = self.app.test_client()
+        client.get('/api/games')
+        response = client.get('/api/games', headers={'X-Read-Primary': 'true'})
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertNotIn('X-Cache', response.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import json
+import unittest
+from typing import Any
+from flask import Flask
+from models import Game, Publisher, Category, db, init_db
+from routes.games import games_bp
+from utils.slow_query_log import SlowQueryLog, fingerprint, init_slow_query_log, parameter_shape
+
+
+class TestSlowQueryLog(unittest.TestCase):
+    """Tests for slow statement logging with plan capture."""
+
+    LOGGER_NAME: str = 'tailspin.slow_query'
+    GAMES_API_PATH: str = '/api/games'
+
+    def setUp(self) -> None:
+        """Create an app whose threshold makes every statement slow."""
+        self.app = Flask(__name__)
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        self.app.config['RESPONSE_CACHE_TTL'] = 0
+        self.app.config['SLOW_QUERY_THRESHOLD_MS'] = 0.000001
+        self.app.register_blueprint(games_bp)
+        init_db(self.app, testing=True)
+        with self.app.app_context():
+            db.create_all()
+            publisher = Publisher(name="DevGames Inc")
+            category = Category(name="Strategy")
+            db.session.add(Game(title="Pipeline Panic", description="Build your DevOps pipeline",
+                                publisher=publisher, category=category, star_rating=4.5))
+            db.session.commit()
+        init_slow_query_log(self.app)
+        self.client = self.app.test_client()
+
+    def tearDown(self) -> None:
+        """Clean up test database and ensure proper connection closure"""
+        # Every statement counts as slow here; keep the DROP statements out of the log
+        self.app.extensions.pop('slow_query_log', None)
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+
+    def _records(self, logs: Any) -> list[dict]:
+        return [json.loads(record.getMessage()) for record in logs.records]
+
+    def test_logs_statement_with_endpoint_and_plan(self) -> None:
+        """Test a slow statement is logged with its endpoint, parameter shapes and plan."""
+        with self.assertLogs(self.LOGGER_NAME, 'WARNING') as logs:
+            response = self.client.get(f'{self.GAMES_API_PATH}/1')
+
+        self.assertEqual(response.status_code, 200)
+        record = self._records(logs)[0]
+        self.assertEqual(record['event'], 'slow_query')
+        self.assertEqual(record['endpoint'], 'games.get_game')
+        self.assertIn('FROM games', record['sql'])
+        self.assertEqual(record['parameters'], ['int'])
+        self.assertTrue(any('games' in line for line in record['plan']))
+
+    def test_repeated_statement_deduplicated(self) -> None:
+        """Test the same statement is logged once per dedupe window."""
+        with self.assertLogs(self.LOGGER_NAME, 'WARNING') as logs:
+            self.client.get(f'{self.GAMES_API_PATH}/1')
+            self.client.get(f'{self.GAMES_API_PATH}/1')
+
+        fingerprints = [record['fingerprint'] for record in self._records(logs)]
+        self.assertEqual(len(fingerprints), len(set(fingerprints)))
+
+    def test_fast_statements_ignored(self) -> None:
+        """Test statements under the threshold are not logged."""
+        slow_query_log = SlowQueryLog(threshold_ms=10_000)
+        with self.app.app_context():
+            connection = db.session.connection()
+            self.assertIsNone(slow_query_log.observe(connection, 'SELECT 1', (), 0.001))
+
+    def test_rate_limited_across_fingerprints(self) -> None:
+        """Test no more than max_per_minute statements are logged and the rest are counted."""
+        slow_query_log = SlowQueryLog(threshold_ms=1, max_per_minute=2, capture_plan=False)
+        with self.app.app_context():
+            connection = db.session.connection()
+            with self.assertLogs(self.LOGGER_NAME, 'WARNING') as logs:
+                results = [
+                    slow_query_log.observe(connection, statement, (), 0.5)
+                    for statement in ('SELECT 1 FROM games', 'SELECT 1 FROM reviews', 'SELECT 1 FROM carts')
+                ]
+        self.assertEqual(len(logs.records), 2)
+        self.assertIsNone(results[2])
+
+    def test_non_select_not_explained(self) -> None:
+        """Test writes are logged without running EXPLAIN."""
+        slow_query_log = SlowQueryLog(threshold_ms=1)
+        with self.app.app_context():
+            connection = db.session.connection()
+            with self.assertLogs(self.LOGGER_NAME, 'WARNING'):
+                record = slow_query_log.observe(connection, 'UPDATE games SET popularity = ?', (1,), 0.5)
+        self.assertIsNone(record['plan'])
+
+    def test_fingerprint_ignores_literals_and_in_lists(self) -> None:
+        """Test statements that differ only in values share a fingerprint."""
+        self.assertEqual(
+            fingerprint("SELECT * FROM games WHERE id IN (?, ?, ?) AND title = 'Pipeline'"),
+            fingerprint("SELECT *  FROM games WHERE id IN (?) AND title = 'Agile'"),
+        )
+        self.assertNotEqual(fingerprint('SELECT * FROM games'), fingerprint('SELECT * FROM reviews'))
+
+    def test_parameter_shape_hides_values(self) -> None:
+        """Test parameters are described by type only."""
+        self.assertEqual(parameter_shape({'title': 'Pipeline', 'id': 3}), {'title': 'str', 'id': 'int'})
+        self.assertEqual(parameter_shape([(1, 'a'), (2, 'b')]), {'executemany': 2, 'row': ['int', 'str']})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from flask import Flask
+from models import db, init_db
+from routes.games import games_bp
+from tests.fixtures import TemplateDatabaseTestCase
+from utils.snapshots import (
+    create_snapshot, list_snapshots, restore_snapshot, snapshot_path, sqlite_database_path,
+    snapshot_command, restore_command,
+)
+
+
+class TestSnapshots(unittest.TestCase):
+    """Tests for SQLite snapshot and restore."""
+
+    def setUp(self) -> None:
+        """Create a small database and a snapshot directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.snapshot_dir = os.path.join(self.temp_dir.name, "snapshots")
+        self.database_path = os.path.join(self.temp_dir.name, "live.db")
+        with sqlite3.connect(self.database_path) as connection:
+            connection.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            connection.execute("INSERT INTO items (name) VALUES ('original')")
+
+    def tearDown(self) -> None:
+        """Remove the temporary files."""
+        self.temp_dir.cleanup()
+
+    def _names(self) -> list[str]:
+        """Helper method to read item names from the live database."""
+        with sqlite3.connect(self.database_path) as connection:
+            return [row[0] for row in connection.execute("SELECT name FROM items ORDER BY id")]
+
+    def _change_database(self) -> None:
+        """Helper method to modify the live database."""
+        with sqlite3.connect(self.database_path) as connection:
+            connection.execute("UPDATE items SET name = 'changed'")
+            connection.execute("INSERT INTO items (name) VALUES ('extra')")
+
+    def test_snapshot_and_restore(self) -> None:
+        """Test restoring returns the database to the captured state."""
+        create_snapshot(self.database_path, "baseline", snapshot_dir=self.snapshot_dir)
+        self._change_database()
+
+        restore_snapshot(self.database_path, "baseline", snapshot_dir=self.snapshot_dir)
+
+        self.assertEqual(self._names(), ["original"])
+
+    def test_snapshot_and_restore_with_clone(self) -> None:
+        """Test the file clone path restores the same state."""
+        create_snapshot(self.database_path, "cloned", clone=True, snapshot_dir=self.snapshot_dir)
+        self._change_database()
+
+        restore_snapshot(self.database_path, "cloned", clone=True, snapshot_dir=self.snapshot_dir)
+
+        self.assertEqual(self._names(), ["original"])
+
+    def test_restore_while_connection_open(self) -> None:
+        """Test an online restore is visible to a connection opened beforehand."""
+        create_snapshot(self.database_path, "online", snapshot_dir=self.snapshot_dir)
+        self._change_database()
+        connection = sqlite3.connect(self.database_path)
+        try:
+            restore_snapshot(self.database_path, "online", snapshot_dir=self.snapshot_dir)
+            names = [row[0] for row in connection.execute("SELECT name FROM items")]
+        finally:
+            connection.close()
+
+        self.assertEqual(names, ["original"])
+
+    def test_list_snapshots(self) -> None:
+        """Test snapshots are listed by name."""
+        self.assertEqual(list_snapshots(self.snapshot_dir), [])
+        create_snapshot(self.database_path, "b-second", snapshot_dir=self.snapshot_dir)
+        create_snapshot(self.database_path, "a-first", snapshot_dir=self.snapshot_dir)
+
+        self.assertEqual(list_snapshots(self.snapshot_dir), ["a-first", "b-second"])
+
+    def test_invalid_snapshot_name(self) -> None:
+        """Test names that could escape the snapshot directory are rejected."""
+        with self.assertRaises(ValueError):
+            snapshot_path("../outside", self.snapshot_dir)
+
+    def test_restore_missing_snapshot(self) -> None:
+        """Test restoring an unknown snapshot raises."""
+        with self.assertRaises(FileNotFoundError):
+            restore_snapshot(self.database_path, "missing", snapshot_dir=self.snapshot_dir)
+
+    def test_sqlite_database_path_rejects_other_backends(self) -> None:
+        """Test only file-based SQLite URLs can be snapshotted."""
+        self.assertEqual(sqlite_database_path(f"sqlite:///{self.database_path}"), self.database_path)
+        with self.assertRaises(ValueError):
+            sqlite_database_path("sqlite:///:memory:")
+        with self.assertRaises(ValueError):
+            sqlite_database_path("postgresql://user@localhost/tailspin")
+
+    def test_snapshot_and_restore_commands(self) -> None:
+        """Test the CLI commands capture and restore the app database."""
+        app = Flask(__name__)
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{self.database_path}"
+        init_db(app, testing=True)
+        runner = app.test_cli_runner()
+
+        with mock.patch.dict(os.environ, {"SNAPSHOT_DIR": self.snapshot_dir}):
+            result = runner.invoke(snapshot_command, ["cli"])
+            self.assertEqual(result.exit_code, 0, result.output)
+            self._change_database()
+            result = runner.invoke(restore_command, ["cli"])
+            self.assertEqual(result.exit_code, 0, result.output)
+            listing = runner.invoke(snapshot_command, [])
+
+        self.assertEqual(self._names(), ["original"])
+        self.assertIn("cli", listing.output)
+        with app.app_context():
+            db.engine.dispose()
+
+
+class TestTemplateDatabaseFixture(TemplateDatabaseTestCase):
+    """Tests for the template database fixture used by dataset-backed tests."""
+
+    @classmethod
+    def create_test_app(cls) -> Flask:
+        app = super().create_test_app()
+        app.register_blueprint(games_bp)
+        return app
+
+    def test_template_data_is_restored(self) -> None:
+        """Test the restored template holds the generated games."""
+        response = self.client.get("/api/games")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)), self.DATASET.games)
+
+
+if __name__ == '__main__':
+    unittest.main()
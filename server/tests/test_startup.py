@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from app import create_app
+from models import db
+
+SERVER_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestStartup(unittest.TestCase):
+    """Tests for the app factory and import-time budget."""
+
+    # Cumulative `python -X importtime` budget for `import app`, in milliseconds
+    IMPORT_TIME_BUDGET_MS: int = int(os.getenv('IMPORT_TIME_BUDGET_MS', '1500'))
+
+    def setUp(self) -> None:
+        """Create a temporary directory for a file database."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.database_path = os.path.join(self.temp_dir.name, "startup.db")
+
+    def tearDown(self) -> None:
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def _run_python(self, *args: str) -> subprocess.CompletedProcess:
+        """Helper method to run a fresh interpreter in the server directory."""
+        env = {**os.environ, "ENABLE_DEBUG_ENDPOINTS": "false"}
+        return subprocess.run(
+            [sys.executable, *args], cwd=SERVER_DIR, env=env, capture_output=True, text=True, check=True,
+        )
+
+    def test_import_time_within_budget(self) -> None:
+        """Test importing the app module stays within the import-time budget."""
+        result = self._run_python("-X", "importtime", "-c", "import app")
+
+        app_line = [line for line in result.stderr.splitlines() if line.rstrip().endswith("| app")][-1]
+        cumulative_us = int(app_line.split("|")[1])
+        self.assertLess(cumulative_us / 1000, self.IMPORT_TIME_BUDGET_MS)
+
+    def test_import_has_no_side_effects(self) -> None:
+        """Test importing the app module builds no app and skips the debug blueprint."""
+        result = self._run_python("-c", "import sys, app; print(hasattr(app, 'app'), 'routes.debug' in sys.modules)")
+
+        self.assertEqual(result.stdout.split(), ["False", "False"])
+
+    def test_create_app_does_not_touch_database(self) -> None:
+        """Test creating the app opens no database connection."""
+        create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{self.database_path}"})
+
+        self.assertFalse(os.path.exists(self.database_path))
+
+    def test_create_app_applies_config(self) -> None:
+        """Test config passed to the factory is used for the database."""
+        app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{self.database_path}"})
+
+        with app.app_context():
+            self.assertEqual(db.engine.url.database, self.database_path)
+            db.engine.dispose()
+
+    def test_debug_blueprint_registered_only_when_enabled(self) -> None:
+        """Test the debug blueprint follows ENABLE_DEBUG_ENDPOINTS."""
+        uri = f"sqlite:///{self.database_path}"
+        disabled = create_app({"SQLALCHEMY_DATABASE_URI": uri, "ENABLE_DEBUG_ENDPOINTS": False})
+        enabled = create_app({"SQLALCHEMY_DATABASE_URI": uri, "ENABLE_DEBUG_ENDPOINTS": True})
+
+        self.assertNotIn("debug", disabled.blueprints)
+        self.assertIn("debug", enabled.blueprints)
+
+
+if __name__ == '__main__':
+    unittest.main()
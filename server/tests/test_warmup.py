@@ -0,0 +1,124 @@
+import threading
+import unittest
+from unittest import mock
+from flask import Flask
+from sqlalchemy import func, select
+from models import Cart, Category, Game, Publisher, db, init_db
+from routes.cart import cart_bp
+from routes.games import games_bp
+from routes.payments import payments_bp
+from routes.reviews import reviews_bp
+from utils import warmup
+from utils.admission import init_admission_control
+from utils.health import HealthChecker, init_health
+from utils.metrics import REQUESTS_TOTAL, init_metrics
+from utils.warmup import init_warmup, run_warmup, start_warmup
+
+
+class TestWarmup(unittest.TestCase):
+    """Tests for priming a worker before it reports ready."""
+
+    def setUp(self) -> None:
+        """Create an app with warm-up enabled and a small catalog."""
+        self.app = Flask(__name__)
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        self.app.config['WARMUP'] = True
+        for blueprint in (games_bp, reviews_bp, cart_bp, payments_bp):
+            self.app.register_blueprint(blueprint)
+        init_db(self.app, testing=True)
+        init_warmup(self.app)
+        init_health(self.app)
+        self.checker: HealthChecker = self.app.extensions['health']
+        self.client = self.app.test_client()
+        # /readyz would otherwise start warm-up and health threads that outlive the test database
+        for patcher in (mock.patch('utils.health.start_warmup'), mock.patch.object(HealthChecker, 'ensure_running')):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        with self.app.app_context():
+            db.create_all()
+            publisher = Publisher(name="DevGames Inc")
+            category = Category(name="Strategy")
+            db.session.add_all([
+                Game(title=f"Pipeline Panic {i}", description="Build your DevOps pipeline before chaos ensues",
+                     publisher=publisher, category=category, star_rating=4.5)
+                for i in range(3)
+            ])
+            db.session.commit()
+
+    def tearDown(self) -> None:
+        """Clean up test database and ensure proper connection closure"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+
+    def test_not_ready_until_warm(self) -> None:
+        """Test readiness fails while warm-up has not run, even with a healthy database."""
+        self.checker.check_database()
+
+        response = self.client.get('/readyz')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.get_json()['checks']['warmup'], 'running')
+
+    def test_warmup_marks_ready(self) -> None:
+        """Test a finished warm-up reports every step and lets readiness pass."""
+        timings = run_warmup(self.app)
+        self.checker.check_database()
+
+        self.assertEqual(set(timings), {'mappers', 'connections', 'requests'})
+        self.assertTrue(self.checker.warmed_up.is_set())
+        self.assertEqual(self.client.get('/readyz').status_code, 200)
+
+    def test_warmup_fills_catalog_cache(self) -> None:
+        """Test the first catalog request after warm-up is served from the cache."""
+        run_warmup(self.app)
+
+        response = self.client.get('/api/games?sort=popularity')
+        self.assertEqual(response.headers['X-Cache'], 'HIT')
+        top_game = response.get_json()[0]['id']
+        self.assertEqual(self.client.get(f'/api/games/{top_game}').headers['X-Cache'], 'HIT')
+
+    def test_warmup_writes_nothing(self) -> None:
+        """Test warm-up only reads, so it never creates a cart."""
+        run_warmup(self.app)
+
+        with self.app.app_context():
+            self.assertEqual(db.session.execute(select(func.count()).select_from(Cart)).scalar(), 0)
+
+    def test_warmup_not_counted_as_traffic(self) -> None:
+        """Test warm-up requests are left out of the metrics and take no admission slot."""
+        self.app.config['ADMISSION_CONTROL'] = True
+        init_metrics(self.app)
+        init_admission_control(self.app)
+
+        run_warmup(self.app)
+
+        self.assertEqual(self.app.extensions['metrics'].snapshot().get(REQUESTS_TOTAL.name, []), [])
+        self.assertEqual(self.app.extensions['admission'].stats()['admitted'], {})
+
+    def test_failed_warmup_still_marks_ready(self) -> None:
+        """Test a failing step does not keep the worker unready forever."""
+        with mock.patch.object(warmup, 'configure_mappers', side_effect=RuntimeError('boom')):
+            with self.assertLogs('tailspin.warmup', level='ERROR'):
+                run_warmup(self.app)
+
+        self.assertTrue(self.checker.warmed_up.is_set())
+
+    def test_started_once_per_process(self) -> None:
+        """Test repeated starts in the same worker run warm-up only once."""
+        with mock.patch.object(warmup, 'run_warmup') as run:
+            start_warmup(self.app)
+            start_warmup(self.app)
+            for thread in threading.enumerate():
+                if thread.name == 'warmup':
+                    thread.join(1)
+
+        run.assert_called_once_with(self.app)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+import threading
+import time
+from collections import Counter
+from flask import Flask, Response, current_app, g, jsonify, request
+from utils.env import get_bool_env, get_float_env, get_int_env
+from utils.serving import server_threads
+from utils.warmup import is_warmup_request
+
+HIGH_PRIORITY: str = 'high'
+LOW_PRIORITY: str = 'low'
+
+# Paths that always run: probes, metrics and the debug tools used during an incident. A batch
+# only dispatches; each of its sub-requests is admitted on its own
+EXEMPT_PATH_PREFIXES: tuple[str, ...] = ('/healthz', '/readyz', '/metrics', '/api/debug', '/api/batch')
+# Checkout and payment confirmation are always high priority; cart only for writes
+HIGH_PRIORITY_PREFIXES: tuple[str, ...] = ('/api/checkout', '/api/payments')
+CART_PREFIX: str = '/api/cart'
+MUTATING_METHODS: tuple[str, ...] = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+# Kept below SERVER_THREADS: the spare threads are where requests wait for a slot
+DEFAULT_MAX_IN_FLIGHT: int = 3
+DEFAULT_LOW_PRIORITY_SHARE: float = 0.75
+DEFAULT_TARGET_QUEUE_MS: float = 100.0
+DEFAULT_QUEUE_TIMEOUT_MS: float = 1000.0
+DEFAULT_RETRY_AFTER: int = 1
+# How often the low-priority limit is adjusted, and the weight of new delay samples
+ADJUST_INTERVAL: float = 0.1
+DELAY_SMOOTHING: float = 0.2
+
+
+def request_priority(method: str, path: str) -> str:
+    """Classify a request for admission.
+
+    Args:
+        method: The HTTP method.
+        path: The request path.
+
+    Returns:
+        HIGH_PRIORITY for checkout, payments and cart writes, otherwise LOW_PRIORITY.
+    """
+    if path.startswith(HIGH_PRIORITY_PREFIXES):
+        return HIGH_PRIORITY
+    if path.startswith(CART_PREFIX) and method in MUTATING_METHODS:
+        return HIGH_PRIORITY
+    return LOW_PRIORITY
+
+
+class AdmissionController:
+    """Limits concurrent requests per worker and sheds low-priority work under load.
+
+    Requests wait for a slot inside the worker, and that wait is the queueing
+    delay the controller reacts to, measured on the worker's own clock.
+    High-priority requests may use every slot and wait up to queue_timeout_ms
+    for one. Low-priority requests wait at most target_queue_ms, never while a
+    high-priority request is waiting, and only for slots under the low-priority
+    limit. That limit adapts: it shrinks multiplicatively while the smoothed
+    queueing delay is above target, and grows back by one slot per interval once
+    it is below, so catalog traffic always leaves room for checkout.
+    """
+
+    def __init__(self, max_in_flight: int, low_priority_share: float = DEFAULT_LOW_PRIORITY_SHARE,
+                 target_queue_ms: float = DEFAULT_TARGET_QUEUE_MS,
+                 queue_timeout_ms: float = DEFAULT_QUEUE_TIMEOUT_MS) -> None:
+        self.max_in_flight = max(max_in_flight, 1)
+        self.low_priority_cap = max(int(self.max_in_flight * low_priority_share), 1)
+        self.low_priority_limit = float(self.low_priority_cap)
+        self.target_queue_ms = target_queue_ms
+        self.queue_timeout_ms = queue_timeout_ms
+        self.in_flight = 0
+        self.waiting: Counter[str] = Counter()
+        self.queue_delay_ms = 0.0
+        self.admitted: Counter[str] = Counter()
+        self.shed: Counter[str] = Counter()
+        self._condition = threading.Condition()
+        self._last_adjust = 0.0
+
+    def admit(self, priority: str) -> bool:
+        """Decide whether a request may run, waiting a bounded time for a slot.
+
+        Args:
+            priority: HIGH_PRIORITY or LOW_PRIORITY.
+
+        Returns:
+            True if the request was admitted and must call release() when done.
+        """
+        timeout_ms = self.queue_timeout_ms if priority == HIGH_PRIORITY else self.target_queue_ms
+        with self._condition:
+            start = time.monotonic()
+            deadline = start + timeout_ms / 1000
+            self.waiting[priority] += 1
+            try:
+                while not self._has_slot(priority):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._observe_delay(timeout_ms)
+                        return self._reject(priority)
+                    self._condition.wait(remaining)
+            finally:
+                self.waiting[priority] -= 1
+            self._observe_delay((time.monotonic() - start) * 1000)
+            return self._accept(priority)
+
+    def release(self) -> None:
+        """Free the slot of a finished request."""
+        with self._condition:
+            self.in_flight -= 1
+            # Waiters of both priorities check different limits, so wake them all
+            self._condition.notify_all()
+
+    def stats(self) -> dict:
+        """Describe the current limits and counts."""
+        with self._condition:
+            return {
+                'inFlight': self.in_flight,
+                'waiting': sum(self.waiting.values()),
+                'maxInFlight': self.max_in_flight,
+                'lowPriorityLimit': int(self.low_priority_limit),
+                'queueDelayMs': round(self.queue_delay_ms, 2),
+                'admitted': dict(self.admitted),
+                'shed': dict(self.shed),
+            }
+
+    def _has_slot(self, priority: str) -> bool:
+        if priority == HIGH_PRIORITY:
+            return self.in_flight < self.max_in_flight
+        return (not self.waiting[HIGH_PRIORITY]
+                and self.in_flight < min(int(self.low_priority_limit), self.max_in_flight))
+
+    def _accept(self, priority: str) -> bool:
+        self.in_flight += 1
+        self.admitted[priority] += 1
+        return True
+
+    def _reject(self, priority: str) -> bool:
+        self.shed[priority] += 1
+        return False
+
+    def _observe_delay(self, delay_ms: float) -> None:
+        self.queue_delay_ms += DELAY_SMOOTHING * (delay_ms - self.queue_delay_ms)
+        now = time.monotonic()
+        if now - self._last_adjust < ADJUST_INTERVAL:
+            return
+        self._last_adjust = now
+        if self.queue_delay_ms > self.target_queue_ms:
+            self.low_priority_limit = max(self.low_priority_limit * 0.75, 1.0)
+        else:
+            self.low_priority_limit = min(self.low_priority_limit + 1, float(self.low_priority_cap))
+
+
+def init_admission_control(app: Flask) -> None:
+    """Shed load with 503 and Retry-After before it reaches the blueprints.
+
+    Enabled by ADMISSION_CONTROL. Register it after hooks that should see shed
+    requests too, such as metrics.
+
+    Args:
+        app: The Flask application instance.
+    """
+    app.config.setdefault('ADMISSION_CONTROL', get_bool_env('ADMISSION_CONTROL', False))
+    if not app.config['ADMISSION_CONTROL']:
+        return
+    app.config.setdefault('ADMISSION_RETRY_AFTER', get_int_env('ADMISSION_RETRY_AFTER', DEFAULT_RETRY_AFTER))
+    app.config.setdefault('ADMISSION_MAX_IN_FLIGHT', get_int_env('ADMISSION_MAX_IN_FLIGHT', DEFAULT_MAX_IN_FLIGHT))
+    threads = server_threads()
+    if app.config['ADMISSION_MAX_IN_FLIGHT'] >= threads:
+        app.logger.warning('ADMISSION_MAX_IN_FLIGHT (%d) should be below SERVER_THREADS (%d), '
+                           'otherwise requests queue in gunicorn where admission control cannot see them',
+                           app.config['ADMISSION_MAX_IN_FLIGHT'], threads)
+    app.extensions['admission'] = AdmissionController(
+        max_in_flight=app.config['ADMISSION_MAX_IN_FLIGHT'],
+        low_priority_share=app.config.get('ADMISSION_LOW_PRIORITY_SHARE',
+                                          get_float_env('ADMISSION_LOW_PRIORITY_SHARE', DEFAULT_LOW_PRIORITY_SHARE)),
+        target_queue_ms=app.config.get('ADMISSION_TARGET_QUEUE_MS',
+                                       get_float_env('ADMISSION_TARGET_QUEUE_MS', DEFAULT_TARGET_QUEUE_MS)),
+        queue_timeout_ms=app.config.get('ADMISSION_QUEUE_TIMEOUT_MS',
+                                        get_float_env('ADMISSION_QUEUE_TIMEOUT_MS', DEFAULT_QUEUE_TIMEOUT_MS)),
+    )
+    app.before_request(_admit_request)
+    app.teardown_request(_release_request)
+
+
+def _admit_request() -> tuple[Response, int] | None:
+    if request.path.startswith(EXEMPT_PATH_PREFIXES) or is_warmup_request():
+        return None
+    controller: AdmissionController = current_app.extensions['admission']
+    if controller.admit(request_priority(request.method, request.path)):
+        g._admitted = True
+        return None
+    response = jsonify({"error": "Server is busy, please retry shortly"})
+    response.headers['Retry-After'] = str(current_app.config['ADMISSION_RETRY_AFTER'])
+    return response, 503
+
+
+def _release_request(error: BaseException | None) -> None:
+    if g.pop('_admitted', False):
+        current_app.extensions['admission'].release()
@@ -0,0 +1,98 @@
+import gzip
+from flask import Flask, Response, current_app, request
+from utils.env import get_int_env
+
+# Optional encoders; gzip from the standard library is always available
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on installed packages
+    brotli = None
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on installed packages
+    zstandard = None
+
+DEFAULT_MIN_SIZE: int = 1024
+DEFAULT_GZIP_LEVEL: int = 6
+DEFAULT_BROTLI_QUALITY: int = 5
+DEFAULT_ZSTD_LEVEL: int = 3
+
+COMPRESSIBLE_MIMETYPES: tuple[str, ...] = ('application/json', 'text/plain', 'text/html')
+
+
+def available_encodings() -> list[str]:
+    """List supported content encodings in server preference order.
+
+    Returns:
+        Encoding names, best compression ratio first.
+    """
+    encodings = []
+    if brotli is not None:
+        encodings.append('br')
+    if zstandard is not None:
+        encodings.append('zstd')
+    encodings.append('gzip')
+    return encodings
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a body with the given content encoding using the app's configured level.
+
+    Args:
+        data: The uncompressed body.
+        encoding: One of the names from available_encodings().
+
+    Returns:
+        The compressed body.
+    """
+    config = current_app.config
+    if encoding == 'br':
+        return brotli.compress(data, quality=config['COMPRESSION_BROTLI_QUALITY'])
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=config['COMPRESSION_ZSTD_LEVEL']).compress(data)
+    # mtime=0 keeps output identical across calls so cached variants are stable
+    return gzip.compress(data, compresslevel=config['COMPRESSION_GZIP_LEVEL'], mtime=0)
+
+
+def init_compression(app: Flask) -> None:
+    """Register response compression negotiated on Accept-Encoding.
+
+    Args:
+        app: The Flask application instance.
+    """
+    app.config.setdefault('COMPRESSION_MIN_SIZE', get_int_env('COMPRESSION_MIN_SIZE', DEFAULT_MIN_SIZE))
+    app.config.setdefault('COMPRESSION_GZIP_LEVEL', get_int_env('COMPRESSION_GZIP_LEVEL', DEFAULT_GZIP_LEVEL))
+    app.config.setdefault('COMPRESSION_BROTLI_QUALITY', get_int_env('COMPRESSION_BROTLI_QUALITY', DEFAULT_BROTLI_QUALITY))
+    app.config.setdefault('COMPRESSION_ZSTD_LEVEL', get_int_env('COMPRESSION_ZSTD_LEVEL', DEFAULT_ZSTD_LEVEL))
+    app.after_request(_compress_response)
+
+
+def _compress_response(response: Response) -> Response:
+    if (
+        response.direct_passthrough
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or 'Content-Encoding' in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(available_encodings())
+    if encoding is None:
+        return response
+
+    entry = getattr(response, 'cached_entry', None)
+    if entry is not None and encoding in entry.variants:
+        body = entry.variants[encoding]
+    else:
+        data = response.get_data()
+        if len(data) < current_app.config['COMPRESSION_MIN_SIZE']:
+            return response
+        body = compress(data, encoding)
+        if entry is not None:
+            entry.variants[encoding] = body
+
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
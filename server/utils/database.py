@@ -1,11 +1,25 @@
 import os
 from models import init_db as models_init_db
+from models.session import REPLICA_BIND_KEY
+from utils.env import get_bool_env, get_int_env
+
+# Environment variables that tune the connection pool for server-based databases
+POOL_SIZE_ENV: str = 'DB_POOL_SIZE'
+MAX_OVERFLOW_ENV: str = 'DB_MAX_OVERFLOW'
+POOL_RECYCLE_ENV: str = 'DB_POOL_RECYCLE'
+POOL_PRE_PING_ENV: str = 'DB_POOL_PRE_PING'
+
+DEFAULT_POOL_SIZE: int = 5
+DEFAULT_MAX_OVERFLOW: int = 10
+DEFAULT_POOL_RECYCLE: int = 1800
 
 def init_db(app, connection_string=None, testing=False):
     """
     Initializes the database with the given Flask app and connection string.
-    If no connection string is provided, a default SQLite connection string is used.
-    
+    If no connection string is provided, the DATABASE_URL environment variable is used,
+    falling back to the default SQLite database. DATABASE_READ_URL, when set, adds a
+    read replica bind used by read-only endpoints.
+
     Args:
         app: The Flask application instance
         connection_string: Optional database connection string
@@ -15,19 +29,55 @@ def init_db(app, connection_string=None, testing=False):
         connection_string = __get_connection_string()
     app.config['SQLALCHEMY_DATABASE_URI'] = connection_string
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', get_engine_options(connection_string))
+
+    # Optional read replica for GET endpoints marked with read_replica
+    read_url = os.getenv('DATABASE_READ_URL', '').strip()
+    if read_url:
+        binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+        binds.setdefault(REPLICA_BIND_KEY, {'url': read_url, **get_engine_options(read_url)})
     models_init_db(app, testing=testing)
 
+def get_engine_options(connection_string: str) -> dict:
+    """
+    Builds the SQLAlchemy engine options for the given connection string.
+
+    Pre-ping and recycling apply to every backend. Pool sizing only applies to
+    server-based databases, since SQLite uses its own pool implementations.
+
+    Args:
+        connection_string: The database connection string
+
+    Returns:
+        Dictionary suitable for SQLALCHEMY_ENGINE_OPTIONS.
+    """
+    options: dict = {
+        'pool_pre_ping': get_bool_env(POOL_PRE_PING_ENV, True),
+        'pool_recycle': get_int_env(POOL_RECYCLE_ENV, DEFAULT_POOL_RECYCLE),
+    }
+    if not connection_string.startswith('sqlite'):
+        options['pool_size'] = get_int_env(POOL_SIZE_ENV, DEFAULT_POOL_SIZE)
+        options['max_overflow'] = get_int_env(MAX_OVERFLOW_ENV, DEFAULT_MAX_OVERFLOW)
+    return options
+
 def __get_connection_string():
     """
     Returns the connection string for the database.
     """
+    database_url = os.getenv('DATABASE_URL', '').strip()
+    if database_url:
+        # Heroku-style URLs use a scheme SQLAlchemy no longer accepts
+        if database_url.startswith('postgres://'):
+            database_url = 'postgresql://' + database_url[len('postgres://'):]
+        return database_url
+
     # Get the server directory
     server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     # Go up one level to project root, then into data folder
     project_root = os.path.dirname(server_dir)
     data_dir = os.path.join(project_root, "data")
-    
+
     # Create the data directory if it doesn't exist
     os.makedirs(data_dir, exist_ok=True)
-    
-    return f'sqlite:///{os.path.join(data_dir, "tailspin-toys.db")}'
\ No newline at end of file
+
+    return f'sqlite:///{os.path.join(data_dir, "tailspin-toys.db")}'
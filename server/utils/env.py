@@ -0,0 +1,45 @@
+import os
+
+
+def get_int_env(name: str, default: int) -> int:
+    """Read an integer environment variable, falling back to the default when unset.
+
+    Args:
+        name: The environment variable name.
+        default: Value used when the variable is unset or empty.
+
+    Returns:
+        The parsed integer.
+    """
+    value = os.getenv(name, '').strip()
+    return int(value) if value else default
+
+
+def get_float_env(name: str, default: float) -> float:
+    """Read a float environment variable, falling back to the default when unset.
+
+    Args:
+        name: The environment variable name.
+        default: Value used when the variable is unset or empty.
+
+    Returns:
+        The parsed float.
+    """
+    value = os.getenv(name, '').strip()
+    return float(value) if value else default
+
+
+def get_bool_env(name: str, default: bool) -> bool:
+    """Read a boolean environment variable, falling back to the default when unset.
+
+    Args:
+        name: The environment variable name.
+        default: Value used when the variable is unset or empty.
+
+    Returns:
+        True for '1', 'true' or 'yes' (case-insensitive).
+    """
+    value = os.getenv(name, '').strip().lower()
+    if not value:
+        return default
+    return value in ('1', 'true', 'yes')
@@ -0,0 +1,225 @@
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+from sqlalchemy import Engine
+
+MAX_TTL_SECONDS: float = 3600.0
+MAX_DURATION_MS: int = 60_000
+# Requests under this prefix are never slowed down, so faults can always be removed
+EXEMPT_PATH_PREFIX: str = '/api/debug'
+
+FAULT_TYPES: tuple[str, ...] = ('cpu', 'latency', 'sqlite_lock', 'pool_exhaustion')
+
+
+@dataclass
+class Fault:
+    """An injected fault that removes itself when its TTL runs out."""
+
+    type: str
+    ttl: float
+    params: dict[str, Any]
+    route: str | None = None
+    probability: float = 1.0
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+    expires_at: float = 0.0
+    hits: int = 0
+    # Background resources, released by stop()
+    _stop_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    _connections: list = field(default_factory=list, repr=False)
+
+    def __post_init__(self) -> None:
+        self.expires_at = time.monotonic() + self.ttl
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def applies_to(self, path: str) -> bool:
+        """Check whether a per-request fault should fire for a request path."""
+        if path.startswith(EXEMPT_PATH_PREFIX):
+            return False
+        if self.route is not None and not path.startswith(self.route):
+            return False
+        return self.probability >= 1.0 or random.random() < self.probability
+
+    def stop(self) -> None:
+        """Release any lock or connections held for this fault."""
+        self._stop_event.set()
+        connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'type': self.type,
+            'route': self.route,
+            'probability': self.probability,
+            'params': self.params,
+            'hits': self.hits,
+            'expiresInSeconds': round(max(self.expires_at - time.monotonic(), 0.0), 1),
+        }
+
+
+class FaultRegistry:
+    """Active faults of this worker. Expired faults are stopped and dropped."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._faults: dict[str, Fault] = {}
+
+    def add(self, fault: Fault) -> Fault:
+        """Register a fault and schedule its removal when the TTL runs out.
+
+        Args:
+            fault: The fault to activate.
+
+        Returns:
+            The fault.
+        """
+        with self._lock:
+            self._faults[fault.id] = fault
+        timer = threading.Timer(fault.ttl, self.remove, args=(fault.id,))
+        timer.daemon = True
+        timer.start()
+        return fault
+
+    def remove(self, fault_id: str) -> Fault | None:
+        """Stop and drop a fault.
+
+        Args:
+            fault_id: The fault id.
+
+        Returns:
+            The removed fault, or None if it was not active.
+        """
+        with self._lock:
+            fault = self._faults.pop(fault_id, None)
+        if fault is not None:
+            fault.stop()
+        return fault
+
+    def clear(self) -> int:
+        """Stop and drop every fault.
+
+        Returns:
+            How many faults were removed.
+        """
+        with self._lock:
+            faults = list(self._faults)
+        return sum(1 for fault_id in faults if self.remove(fault_id) is not None)
+
+    def active(self) -> list[Fault]:
+        """Get the faults that have not expired yet."""
+        with self._lock:
+            faults = list(self._faults.values())
+        for fault in faults:
+            if fault.expired:
+                self.remove(fault.id)
+        return [fault for fault in faults if not fault.expired]
+
+
+FAULTS = FaultRegistry()
+
+
+def burn_cpu(milliseconds: float) -> None:
+    """Keep the current thread busy computing for a while.
+
+    Args:
+        milliseconds: How long to burn.
+    """
+    deadline = time.perf_counter() + milliseconds / 1000
+    value = 0
+    while time.perf_counter() < deadline:
+        value = (value * 31 + 7) % 1_000_003
+
+
+def apply_request_faults(path: str) -> None:
+    """Run the CPU burn and latency faults that apply to a request.
+
+    Args:
+        path: The request path.
+    """
+    for fault in FAULTS.active():
+        if fault.type not in ('cpu', 'latency') or not fault.applies_to(path):
+            continue
+        fault.hits += 1
+        if fault.type == 'cpu':
+            burn_cpu(fault.params['ms'])
+        else:
+            time.sleep(fault.params['ms'] / 1000)
+
+
+def start_sqlite_lock(fault: Fault, database_path: str) -> None:
+    """Hold a SQLite write lock from a background thread until the fault stops.
+
+    The lock is held for holdMs. With everyMs it is taken again every everyMs.
+    In exclusive mode readers are blocked as well as writers.
+
+    Args:
+        fault: A sqlite_lock fault.
+        database_path: Path of the SQLite database file.
+    """
+    hold = fault.params['holdMs'] / 1000
+    every = fault.params.get('everyMs')
+    begin = 'BEGIN EXCLUSIVE' if fault.params.get('mode') == 'exclusive' else 'BEGIN IMMEDIATE'
+
+    def hold_lock() -> None:
+        connection = sqlite3.connect(database_path, timeout=hold or 1, isolation_level=None)
+        try:
+            while not fault._stop_event.is_set() and not fault.expired:
+                started = time.monotonic()
+                try:
+                    connection.execute(begin)
+                except sqlite3.OperationalError:
+                    # Someone else holds the lock; try again on the next cycle
+                    pass
+                else:
+                    fault.hits += 1
+                    fault._stop_event.wait(hold)
+                    connection.execute('ROLLBACK')
+                if every is None:
+                    break
+                fault._stop_event.wait(max(every / 1000 - (time.monotonic() - started), 0))
+        finally:
+            connection.close()
+
+    threading.Thread(target=hold_lock, name=f'fault-{fault.id}', daemon=True).start()
+
+
+def exhaust_pool(fault: Fault, engine: Engine) -> None:
+    """Check out connections from the engine's pool and keep them until the fault stops.
+
+    If a checkout fails, the connections taken so far are returned before the
+    error is raised, since the fault is never registered and would not stop.
+
+    Args:
+        fault: A pool_exhaustion fault.
+        engine: The engine whose pool to drain.
+    """
+    try:
+        for _ in range(fault.params['connections']):
+            fault._connections.append(engine.connect())
+            fault.hits += 1
+    except Exception:
+        fault.stop()
+        raise
+
+
+def default_pool_connections(engine: Engine) -> int:
+    """Number of connections that fills the engine's pool including overflow.
+
+    Args:
+        engine: The engine.
+
+    Returns:
+        Pool size plus max overflow, or 1 for pools without a limit.
+    """
+    pool = engine.pool
+    size = pool.size() if hasattr(pool, 'size') else 0
+    overflow = getattr(pool, '_max_overflow', 0)
+    return max(size + max(overflow, 0), 1)
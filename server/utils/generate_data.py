@@ -0,0 +1,315 @@
+import argparse
+import random
+import time
+import uuid
+from bisect import bisect
+from dataclasses import dataclass, fields
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Iterator
+from sqlalchemy import Connection, Select, Table, delete, func, insert, select
+from models import db, CacheGeneration, Cart, CartItem, Category, Game, Payment, Publisher, Review
+from utils.migrations import migrate
+from utils.seed_database import DEFAULT_BATCH_SIZE, create_app, insert_in_batches
+
+# Fixed reference point so generated dates never depend on when the generator runs
+REFERENCE_DATETIME: datetime = datetime(2026, 1, 1, 12, 0, 0)
+REFERENCE_DATE: date = REFERENCE_DATETIME.date()
+
+GENRES: tuple[str, ...] = (
+    'Strategy', 'Card Game', 'Puzzle', 'Adventure', 'Party', 'Cooperative', 'Deck Builder',
+    'Worker Placement', 'Roll and Write', 'Trivia', 'Dexterity', 'Bluffing',
+)
+TITLE_WORDS: tuple[str, ...] = (
+    'Pipeline', 'Deploy', 'Merge', 'Sprint', 'Cluster', 'Cache', 'Kernel', 'Commit', 'Branch',
+    'Container', 'Latency', 'Token', 'Packet', 'Quantum', 'Refactor', 'Runtime', 'Daemon', 'Vector',
+)
+TITLE_SUFFIXES: tuple[str, ...] = ('Panic', 'Quest', 'Tactics', 'Legends', 'Rush', 'Siege', 'Saga', 'Duel')
+REVIEWER_NAMES: tuple[str, ...] = (
+    'Mona', 'Ada', 'Linus', 'Grace', 'Ken', 'Barbara', 'Dennis', 'Margaret', 'Guido', 'Radia',
+)
+REVIEW_TEXTS: tuple[str, ...] = (
+    'Great fun with friends, we played it three times in a row.',
+    'Rules took a while to learn but the strategy is deep.',
+    'Components feel cheap, though the gameplay holds up.',
+    'A solid addition to any collection of developer games.',
+    'Too long for a weeknight, perfect for a weekend session.',
+)
+
+
+@dataclass
+class GeneratorConfig:
+    """Row counts and distribution parameters for a synthetic dataset."""
+
+    games: int = 1000
+    categories: int = 12
+    publishers: int = 100
+    reviews_per_game: float = 5.0
+    popularity_skew: float = 1.1
+    carts: int = 500
+    abandoned_ratio: float = 0.3
+    checked_out_ratio: float = 0.4
+    cart_size: float = 2.5
+    seed: int = 42
+    batch_size: int = DEFAULT_BATCH_SIZE
+
+
+def generate(connection: Connection, config: GeneratorConfig) -> dict[str, int]:
+    """Insert a deterministic synthetic dataset into an empty schema.
+
+    Every id, value and timestamp is derived from the config, so the same config
+    always produces the same rows.
+
+    Args:
+        connection: Connection with an open transaction.
+        config: Row counts, distribution parameters and random seed.
+
+    Returns:
+        Number of rows inserted per table.
+    """
+    rng = random.Random(config.seed)
+    batch_size = config.batch_size
+    counts: dict[str, int] = {}
+
+    counts['categories'] = insert_in_batches(connection, Category.__table__, (
+        {'id': i, 'name': f'{GENRES[(i - 1) % len(GENRES)]} {(i - 1) // len(GENRES) + 1}',
+         'description': f'Synthetic category number {i} for capacity testing'}
+        for i in range(1, config.categories + 1)
+    ), batch_size)
+    counts['publishers'] = insert_in_batches(connection, Publisher.__table__, (
+        {'id': i, 'name': f'Publisher {i:05d}', 'description': f'Synthetic publisher number {i} for capacity testing'}
+        for i in range(1, config.publishers + 1)
+    ), batch_size)
+
+    # Zipf-like popularity: a few games are far more popular than the long tail
+    ranks = list(range(1, config.games + 1))
+    rng.shuffle(ranks)
+    weights = [1.0 / rank ** config.popularity_skew for rank in ranks]
+    quality = [rng.uniform(2.5, 5.0) for _ in ranks]
+    cumulative_weights = list(accumulate(weights))
+    # Filled as games are generated, so cart items can use each game's price
+    prices: list[float] = []
+
+    counts['games'] = insert_in_batches(
+        connection, Game.__table__, _iter_games(rng, config, ranks, quality, prices), batch_size
+    )
+    counts['reviews'] = insert_in_batches(
+        connection, Review.__table__, _iter_reviews(rng, config, weights, quality), batch_size
+    )
+
+    counts.update(_insert_carts(connection, _iter_carts(rng, config, cumulative_weights, prices), batch_size))
+
+    # Ids were given explicitly, so move the id sequences past them for later inserts
+    reset_sequences(connection, [table for table in db.metadata.sorted_tables if table.autoincrement_column is not None])
+    return counts
+
+
+def clear_data(connection: Connection) -> None:
+    """Delete all application rows, children first.
+
+    Cache generations are schema state seeded by a migration, so they are kept.
+
+    Args:
+        connection: Connection with an open transaction.
+    """
+    for table in reversed(db.metadata.sorted_tables):
+        if table is not CacheGeneration.__table__:
+            connection.execute(delete(table))
+
+
+def sequence_reset_statement(table: Table) -> Select:
+    """Build the PostgreSQL statement that moves a table's id sequence past its rows.
+
+    Args:
+        table: A table with a serial id column.
+
+    Returns:
+        SELECT setval(...) that makes the next id MAX(id) + 1, or 1 for an empty table.
+    """
+    column = table.autoincrement_column
+    highest = func.max(column)
+    return select(func.setval(
+        func.pg_get_serial_sequence(table.name, column.name), func.coalesce(highest, 1), highest.is_not(None)
+    )).select_from(table)
+
+
+def reset_sequences(connection: Connection, tables: list[Table]) -> None:
+    """Move the id sequences past rows inserted with explicit ids.
+
+    Only PostgreSQL needs this. SQLite and MySQL continue after the highest id.
+
+    Args:
+        connection: Connection with an open transaction.
+        tables: Tables with a serial id column.
+    """
+    if connection.dialect.name != 'postgresql':
+        return
+    for table in tables:
+        connection.execute(sequence_reset_statement(table))
+
+
+def _iter_games(rng: random.Random, config: GeneratorConfig, ranks: list[int], quality: list[float],
+                prices: list[float]) -> Iterator[dict]:
+    for index, rank in enumerate(ranks):
+        game_id = index + 1
+        title = f'{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_SUFFIXES)} {game_id}'
+        prices.append(round(rng.uniform(9.99, 79.99), 2))
+        yield {
+            'id': game_id,
+            'title': title,
+            'description': f'{title} is a synthetic game generated for load and capacity testing.',
+            'category_id': rng.randint(1, config.categories),
+            'publisher_id': rng.randint(1, config.publishers),
+            'star_rating': round(quality[index], 1),
+            'popularity': max(1, int(100000 / rank ** config.popularity_skew)),
+            'release_date': REFERENCE_DATE - timedelta(days=rng.randint(0, 5 * 365)),
+            'price': prices[index],
+        }
+
+
+def _iter_reviews(rng: random.Random, config: GeneratorConfig, weights: list[float],
+                  quality: list[float]) -> Iterator[dict]:
+    # Review counts follow popularity, scaled so the mean per game matches the config
+    scale = config.reviews_per_game * len(weights) / sum(weights) if weights else 0
+    review_id = 0
+    for index, weight in enumerate(weights):
+        for _ in range(int(weight * scale + rng.random())):
+            review_id += 1
+            yield {
+                'id': review_id,
+                'game_id': index + 1,
+                'rating': min(5, max(1, round(rng.gauss(quality[index], 0.8)))),
+                'review_text': rng.choice(REVIEW_TEXTS),
+                'reviewer_name': f'{rng.choice(REVIEWER_NAMES)} {rng.randint(1, 9999)}',
+                'created_at': REFERENCE_DATETIME - timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60)),
+            }
+
+
+def _iter_carts(rng: random.Random, config: GeneratorConfig, cumulative_weights: list[float],
+                prices: list[float]) -> Iterator[tuple[dict, list[dict], dict | None]]:
+    total_weight = cumulative_weights[-1] if cumulative_weights else 0
+    item_id = 0
+    payment_id = 0
+
+    for cart_id in range(1, config.carts + 1):
+        roll = rng.random()
+        if roll < config.checked_out_ratio:
+            status = 'checked_out'
+        elif roll < config.checked_out_ratio + config.abandoned_ratio:
+            status = 'abandoned'
+        else:
+            status = 'active'
+        created_at = REFERENCE_DATETIME - timedelta(minutes=rng.randint(0, 90 * 24 * 60))
+        cart = {
+            'id': cart_id,
+            'session_id': f'synthetic-{config.seed}-{cart_id}',
+            'status': status,
+            'created_at': created_at,
+            'updated_at': created_at + timedelta(minutes=rng.randint(0, 120)),
+        }
+
+        # Popular games are more likely to end up in carts
+        size = min(len(cumulative_weights), 1 + int(rng.expovariate(1 / max(config.cart_size - 1, 0.01))))
+        game_ids: set[int] = set()
+        while len(game_ids) < size:
+            game_ids.add(bisect(cumulative_weights, rng.random() * total_weight) + 1)
+
+        items: list[dict] = []
+        amount = 0.0
+        for game_id in sorted(game_ids):
+            quantity = rng.choice((1, 1, 1, 2, 3))
+            price = prices[game_id - 1]
+            amount += price * quantity
+            item_id += 1
+            items.append({'id': item_id, 'cart_id': cart_id, 'game_id': game_id,
+                          'quantity': quantity, 'price': price})
+
+        payment = None
+        if status == 'checked_out' and amount > 0:
+            method = rng.choice(Payment.VALID_METHODS)
+            payment_id += 1
+            payment = {
+                'id': payment_id,
+                'cart_id': cart_id,
+                'amount': round(amount, 2),
+                'payment_method': method,
+                'card_last_four': f'{rng.randint(0, 9999):04d}' if method != 'paypal' else None,
+                'status': 'completed',
+                'transaction_id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                'created_at': cart['updated_at'],
+            }
+        yield cart, items, payment
+
+
+def _insert_carts(connection: Connection, carts: Iterator[tuple[dict, list[dict], dict | None]],
+                  batch_size: int) -> dict[str, int]:
+    # One pass over the carts, buffering at most a batch per table. Buffers are
+    # flushed together, carts first, so items and payments never precede their cart.
+    tables = {'carts': Cart.__table__, 'cart_items': CartItem.__table__, 'payments': Payment.__table__}
+    buffers: dict[str, list[dict]] = {name: [] for name in tables}
+    counts = dict.fromkeys(tables, 0)
+
+    def flush() -> None:
+        for name, rows in buffers.items():
+            if rows:
+                connection.execute(insert(tables[name]), rows)
+                counts[name] += len(rows)
+                rows.clear()
+
+    for cart, items, payment in carts:
+        buffers['carts'].append(cart)
+        buffers['cart_items'].extend(items)
+        if payment is not None:
+            buffers['payments'].append(payment)
+        if max(len(rows) for rows in buffers.values()) >= batch_size:
+            flush()
+    flush()
+    return counts
+
+
+def generate_database(config: GeneratorConfig, connection_string: str | None = None,
+                      reset: bool = False) -> dict[str, int]:
+    """Migrate the database and fill it with a synthetic dataset.
+
+    Args:
+        config: Row counts, distribution parameters and random seed.
+        connection_string: Database URL, defaulting to DATABASE_URL or the SQLite file.
+        reset: Delete existing rows first instead of refusing to run on a non-empty database.
+
+    Returns:
+        Number of rows inserted per table.
+    """
+    app = create_app(connection_string)
+    with app.app_context():
+        migrate(db.engine)
+        with db.engine.begin() as connection:
+            if reset:
+                clear_data(connection)
+            elif connection.execute(select(func.count()).select_from(Game.__table__)).scalar():
+                raise RuntimeError('Database already contains games; pass reset=True to replace them')
+            counts = generate(connection, config)
+        db.engine.dispose()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Generate a deterministic synthetic dataset.')
+    parser.add_argument('--database-url', default=None, help='Target database (defaults to DATABASE_URL).')
+    parser.add_argument('--reset', action='store_true', help='Delete existing rows before generating.')
+    defaults = GeneratorConfig()
+    for field in fields(GeneratorConfig):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=field.type,
+                            default=getattr(defaults, field.name))
+    args = parser.parse_args()
+
+    config = GeneratorConfig(**{field.name: getattr(args, field.name) for field in fields(GeneratorConfig)})
+    start = time.perf_counter()
+    counts = generate_database(config, args.database_url, reset=args.reset)
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    summary = ', '.join(f'{count} {table}' for table, count in counts.items())
+    print(f'Generated {summary} in {elapsed:.2f}s ({total / elapsed:,.0f} rows/s)')
+
+
+if __name__ == '__main__':
+    main()
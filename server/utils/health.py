@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from flask import Flask, Response, current_app, jsonify
+from sqlalchemy import text
+from models import db
+from utils.env import get_float_env
+from utils.warmup import start_warmup
+
+LIVENESS_PATH: str = '/healthz'
+READINESS_PATH: str = '/readyz'
+DEFAULT_CHECK_INTERVAL: float = 5.0
+# A failed check only makes the worker unready once the last success is this old
+DEFAULT_CHECK_GRACE: float = 30.0
+
+
+class HealthChecker:
+    """Checks the database from a background thread so probes only read the cached result.
+
+    The check runs every interval seconds whatever the probe rate, so probes add no
+    load to the database. One failed check, for example while SQLite is locked by a
+    writer, does not make the worker unready: readiness fails only when no check
+    has succeeded for grace seconds.
+    """
+
+    def __init__(self, app: Flask, interval: float = DEFAULT_CHECK_INTERVAL,
+                 grace: float = DEFAULT_CHECK_GRACE) -> None:
+        self.app = app
+        self.interval = interval
+        self.grace = grace
+        self.warmed_up = threading.Event()
+        self.last_success: float | None = None
+        self.last_latency_ms: float | None = None
+        self.last_error: str | None = None
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def check_database(self) -> bool:
+        """Run one round trip to the database and record the outcome.
+
+        Returns:
+            True if the database answered.
+        """
+        start = time.monotonic()
+        try:
+            with self.app.app_context(), db.engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+        except Exception as error:
+            self.last_error = f'{type(error).__name__}: {error}'
+            return False
+        self.last_success = time.monotonic()
+        self.last_latency_ms = (self.last_success - start) * 1000
+        self.last_error = None
+        return True
+
+    def ensure_running(self) -> None:
+        """Start the background check in this process if it is not running yet.
+
+        Started on first use rather than at app creation, because threads started
+        in the gunicorn master do not survive the fork into workers.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='health-check', daemon=True)
+            self._thread.start()
+
+    def status(self) -> tuple[dict, bool]:
+        """Describe readiness from the cached check results.
+
+        Returns:
+            The status document and whether the worker is ready.
+        """
+        now = time.monotonic()
+        age = None if self.last_success is None else now - self.last_success
+        database_ok = age is not None and age <= self.grace
+        database = {
+            'status': 'ok' if database_ok else ('pending' if age is None and self.last_error is None else 'failing'),
+            'lastSuccessSecondsAgo': None if age is None else round(age, 1),
+            'latencyMs': None if self.last_latency_ms is None else round(self.last_latency_ms, 2),
+        }
+        if self.last_error is not None:
+            database['lastError'] = self.last_error
+        ready = self.warmed_up.is_set() and database_ok
+        return {
+            'status': 'ready' if ready else 'unavailable',
+            'checks': {
+                'warmup': 'done' if self.warmed_up.is_set() else 'running',
+                'database': database,
+            },
+        }, ready
+
+    def _run(self) -> None:
+        while True:
+            self.check_database()
+            time.sleep(self.interval)
+
+
+def init_health(app: Flask) -> None:
+    """Serve /healthz for liveness and /readyz for readiness.
+
+    /healthz does no I/O: if the worker can answer, it is alive. /readyz reports
+    ready once warm-up is done and the background database check has succeeded
+    within HEALTH_CHECK_GRACE seconds. Without WARMUP, there is nothing to wait
+    for. Call after init_warmup.
+
+    Args:
+        app: The Flask application instance.
+    """
+    app.config.setdefault('HEALTH_CHECK_INTERVAL', get_float_env('HEALTH_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL))
+    app.config.setdefault('HEALTH_CHECK_GRACE', get_float_env('HEALTH_CHECK_GRACE', DEFAULT_CHECK_GRACE))
+    checker = HealthChecker(app, app.config['HEALTH_CHECK_INTERVAL'], app.config['HEALTH_CHECK_GRACE'])
+    if not app.config.get('WARMUP'):
+        checker.warmed_up.set()
+    app.extensions['health'] = checker
+    app.add_url_rule(LIVENESS_PATH, 'healthz', liveness_view, methods=['GET'])
+    app.add_url_rule(READINESS_PATH, 'readyz', readiness_view, methods=['GET'])
+
+
+def get_health_checker() -> HealthChecker:
+    """Get the health checker of the current app."""
+    return current_app.extensions['health']
+
+
+def liveness_view() -> Response:
+    """Report that the worker is up, without touching the database."""
+    return jsonify({'status': 'ok'})
+
+
+def readiness_view() -> tuple[Response, int]:
+    """Report whether the worker should receive traffic, from cached checks only."""
+    checker = get_health_checker()
+    checker.ensure_running()
+    if current_app.config.get('WARMUP'):
+        # Normally started by serve.py at worker boot; this covers other servers
+        start_warmup(current_app._get_current_object())
+    body, ready = checker.status()
+    return jsonify(body), 200 if ready else 503
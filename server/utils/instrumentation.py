@@ -0,0 +1,122 @@
+import time
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable
+from flask import g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+# Key in Connection.info holding the start times of statements in progress
+_QUERY_START_KEY: str = 'tailspin_query_start'
+
+# Called after every statement as observer(connection, statement, parameters, seconds)
+QueryObserver = Callable[[Connection, str, Any, float], None]
+_observers: list[QueryObserver] = []
+_installed: bool = False
+
+
+@dataclass
+class RequestStats:
+    """SQL, model conversion and serialization work done while handling the current request."""
+
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+    to_dict_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+    # Nested to_dict calls are counted by the outermost one
+    to_dict_depth: int = 0
+
+    def add(self, other: 'RequestStats') -> None:
+        """Add the work of another request, such as a batched sub-request, to these statistics."""
+        self.sql_count += other.sql_count
+        self.sql_seconds += other.sql_seconds
+        self.to_dict_seconds += other.to_dict_seconds
+        self.serialize_seconds += other.serialize_seconds
+
+
+def get_request_stats() -> RequestStats:
+    """Get the statistics of the current request, creating them on first use.
+
+    Returns:
+        The request's statistics.
+    """
+    stats = g.get('_request_stats')
+    if stats is None:
+        stats = g._request_stats = RequestStats()
+    return stats
+
+
+def record_serialization(seconds: float) -> None:
+    """Add JSON encoding time to the current request's statistics, if there is a request.
+
+    Args:
+        seconds: Time spent encoding.
+    """
+    if has_request_context():
+        get_request_stats().serialize_seconds += seconds
+
+
+def timed_to_dict(method: Callable) -> Callable:
+    """Add the time a model's to_dict takes to the current request's statistics.
+
+    SQL run inside it, such as lazy loads, is left to the db phase.
+
+    Args:
+        method: The model's to_dict method.
+
+    Returns:
+        The wrapped method.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not has_request_context():
+            return method(self, *args, **kwargs)
+        stats = get_request_stats()
+        if stats.to_dict_depth:
+            return method(self, *args, **kwargs)
+        stats.to_dict_depth += 1
+        start, sql_before = time.perf_counter(), stats.sql_seconds
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            stats.to_dict_depth -= 1
+            stats.to_dict_seconds += time.perf_counter() - start - (stats.sql_seconds - sql_before)
+    return wrapper
+
+
+def install_sql_instrumentation() -> None:
+    """Time every statement on every engine. Safe to call more than once."""
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    _installed = True
+
+
+def add_query_observer(observer: QueryObserver) -> None:
+    """Register a callback that runs after every timed statement.
+
+    Args:
+        observer: Called with the connection, statement, parameters and duration in seconds.
+    """
+    install_sql_instrumentation()
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get(_QUERY_START_KEY)
+    if not starts:
+        return
+    seconds = time.perf_counter() - starts.pop()
+    if has_request_context():
+        stats = get_request_stats()
+        stats.sql_count += 1
+        stats.sql_seconds += seconds
+    for observer in _observers:
+        observer(conn, statement, parameters, seconds)
@@ -0,0 +1,87 @@
+import json
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Any
+from flask import Response
+from flask.json.provider import JSONProvider
+from utils.instrumentation import record_serialization
+
+# orjson is optional; the stdlib encoder is used when it is not installed
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+ORJSON_OPTIONS: int = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+def _default(value: Any) -> Any:
+    """Encode values the JSON encoders do not handle natively."""
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(JSONProvider):
+    """Compact JSON provider backed by orjson, with a stdlib fallback.
+
+    Dates and datetimes that reach the encoder are written as ISO 8601 strings
+    by both encoders; the models' to_dict() already returns them as strings.
+    """
+
+    mimetype: str = 'application/json'
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as a compact JSON string.
+
+        Args:
+            obj: The data to serialize.
+
+        Returns:
+            The JSON string.
+        """
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS).decode()
+        kwargs.setdefault('default', _default)
+        kwargs.setdefault('separators', (',', ':'))
+        kwargs.setdefault('ensure_ascii', False)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """Deserialize data from a JSON string or bytes.
+
+        Args:
+            s: The JSON text.
+
+        Returns:
+            The decoded data.
+        """
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Build a JSON response, encoding straight to bytes when orjson is available.
+
+        Args:
+            *args: A single value to serialize, or several to serialize as a list.
+            **kwargs: Keys and values to serialize as an object, instead of args.
+
+        Returns:
+            A response with the application/json mimetype.
+        """
+        if args and kwargs:
+            raise TypeError("app.json.response() takes either args or kwargs, not both")
+        obj = args[0] if len(args) == 1 else (list(args) or kwargs or None)
+        start = time.perf_counter()
+        if orjson is not None:
+            body = orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+        else:
+            body = self.dumps(obj).encode()
+        record_serialization(time.perf_counter() - start)
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,109 @@
+import gc
+import os
+import sys
+import tracemalloc
+from collections import Counter
+
+# Allocations made by tracemalloc itself or the import system are noise in diffs
+SNAPSHOT_FILTERS: tuple[tracemalloc.Filter, ...] = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def rss_bytes() -> int | None:
+    """Get the resident set size of this process.
+
+    Returns:
+        RSS in bytes, or None where /proc is not available.
+    """
+    try:
+        with open('/proc/self/statm', encoding='ascii') as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE')
+
+
+def peak_rss_bytes() -> int | None:
+    """Get the highest resident set size this process has reached.
+
+    Returns:
+        Peak RSS in bytes, or None where the resource module is not available.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def gc_stats() -> dict:
+    """Describe the garbage collector's generations.
+
+    Returns:
+        Pending allocation counts, thresholds and per-generation collection totals.
+    """
+    return {
+        'counts': list(gc.get_count()),
+        'thresholds': list(gc.get_threshold()),
+        'generations': [
+            {'collections': stats['collections'], 'collected': stats['collected'],
+             'uncollectable': stats['uncollectable']}
+            for stats in gc.get_stats()
+        ],
+        'garbage': len(gc.garbage),
+    }
+
+
+def object_counts(limit: int) -> list[dict]:
+    """Count live objects tracked by the garbage collector, by type.
+
+    Args:
+        limit: Number of types to return.
+
+    Returns:
+        The most common types, largest count first.
+    """
+    counts = Counter(type(obj).__qualname__ for obj in gc.get_objects())
+    return [{'type': name, 'count': count} for name, count in counts.most_common(limit)]
+
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    """Take a tracemalloc snapshot without tracemalloc's own and the importer's allocations.
+
+    Returns:
+        The filtered snapshot.
+    """
+    return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+
+def snapshot_diff(old: tracemalloc.Snapshot, new: tracemalloc.Snapshot, limit: int,
+                  group_by: str = 'lineno') -> list[dict]:
+    """Compare two snapshots and return the biggest changes.
+
+    Args:
+        old: The earlier snapshot.
+        new: The later snapshot.
+        limit: Number of entries to return.
+        group_by: 'lineno' to group by file and line, or 'filename' by file.
+
+    Returns:
+        Entries ordered by absolute size change, largest first.
+    """
+    entries = []
+    for stat in new.compare_to(old, group_by)[:limit]:
+        frame = stat.traceback[0]
+        entries.append({
+            'file': frame.filename,
+            'line': frame.lineno if group_by == 'lineno' else None,
+            'sizeDiff': stat.size_diff,
+            'size': stat.size,
+            'countDiff': stat.count_diff,
+            'count': stat.count,
+        })
+    return entries
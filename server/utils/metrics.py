@@ -0,0 +1,333 @@
+import fcntl
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Iterator
+from dataclasses import dataclass
+from flask import Flask, Response, current_app, g, request
+from utils.env import get_float_env
+from utils.instrumentation import get_request_stats, install_sql_instrumentation
+from utils.warmup import is_warmup_request
+
+METRICS_PATH: str = '/metrics'
+METRICS_CONTENT_TYPE: str = 'text/plain; version=0.0.4; charset=utf-8'
+# Directory where each worker publishes its metrics so any worker can serve the total
+METRICS_DIR_ENV: str = 'METRICS_DIR'
+DEFAULT_FLUSH_INTERVAL: float = 1.0
+# Counters of exited workers are folded into this file so the directory stays small
+DEAD_WORKERS_FILE: str = 'worker-dead.json'
+LOCK_FILE: str = 'metrics.lock'
+
+LATENCY_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS: tuple[float, ...] = (0, 1, 2, 5, 10, 25, 50, 100)
+SQL_TIME_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+@dataclass(frozen=True)
+class MetricSpec:
+    """Name, type and labels of one exported metric."""
+
+    name: str
+    kind: str
+    help: str
+    labels: tuple[str, ...]
+    buckets: tuple[float, ...] = ()
+
+
+REQUESTS_TOTAL = MetricSpec(
+    'tailspin_http_requests_total', 'counter', 'HTTP requests handled.', ('method', 'endpoint', 'status'))
+REQUEST_DURATION = MetricSpec(
+    'tailspin_http_request_duration_seconds', 'histogram', 'HTTP request latency.',
+    ('method', 'endpoint'), LATENCY_BUCKETS)
+REQUESTS_IN_FLIGHT = MetricSpec(
+    'tailspin_http_requests_in_flight', 'gauge', 'HTTP requests currently being handled.', ('method', 'endpoint'))
+SQL_QUERIES = MetricSpec(
+    'tailspin_db_queries_per_request', 'histogram', 'SQL statements executed per request.',
+    ('method', 'endpoint'), SQL_COUNT_BUCKETS)
+SQL_TIME = MetricSpec(
+    'tailspin_db_time_per_request_seconds', 'histogram', 'Time spent executing SQL per request.',
+    ('method', 'endpoint'), SQL_TIME_BUCKETS)
+
+METRICS: tuple[MetricSpec, ...] = (REQUESTS_TOTAL, REQUEST_DURATION, REQUESTS_IN_FLIGHT, SQL_QUERIES, SQL_TIME)
+
+
+class MetricsRegistry:
+    """In-process metric values keyed by metric name and label values.
+
+    Counters and gauges hold a number. Histograms hold per-bucket counts (the last
+    slot is +Inf) followed by the sum and the count of observations.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: dict[str, dict[tuple[str, ...], float | list[float]]] = {spec.name: {} for spec in METRICS}
+
+    def inc(self, spec: MetricSpec, labels: tuple[str, ...], amount: float = 1) -> None:
+        """Add to a counter or gauge.
+
+        Args:
+            spec: The metric.
+            labels: Label values in the order of spec.labels.
+            amount: Value to add; negative to decrement a gauge.
+        """
+        with self._lock:
+            series = self._values[spec.name]
+            series[labels] = series.get(labels, 0) + amount
+
+    def observe(self, spec: MetricSpec, labels: tuple[str, ...], value: float) -> None:
+        """Record one observation in a histogram.
+
+        Args:
+            spec: The histogram metric.
+            labels: Label values in the order of spec.labels.
+            value: The observed value.
+        """
+        index = bisect_left(spec.buckets, value)
+        with self._lock:
+            series = self._values[spec.name]
+            slots = series.get(labels)
+            if slots is None:
+                slots = series[labels] = [0] * (len(spec.buckets) + 3)
+            slots[index] += 1
+            slots[-2] += value
+            slots[-1] += 1
+
+    def snapshot(self) -> dict:
+        """Copy the current values into a JSON-serializable structure.
+
+        Returns:
+            Metric name to a list of [label values, value] pairs.
+        """
+        with self._lock:
+            return {
+                name: [[list(labels), list(value) if isinstance(value, list) else value]
+                       for labels, value in series.items()]
+                for name, series in self._values.items()
+            }
+
+
+def merge_snapshots(snapshots: list[dict]) -> dict:
+    """Add up snapshots from several workers.
+
+    Args:
+        snapshots: Snapshots as returned by MetricsRegistry.snapshot().
+
+    Returns:
+        A single snapshot with counters, gauges and histograms summed per label set.
+    """
+    merged: dict[str, dict[tuple[str, ...], float | list[float]]] = {spec.name: {} for spec in METRICS}
+    for snapshot in snapshots:
+        for name, series in snapshot.items():
+            target = merged.setdefault(name, {})
+            for labels, value in series:
+                key = tuple(labels)
+                if isinstance(value, list):
+                    current = target.get(key)
+                    target[key] = list(value) if current is None else [a + b for a, b in zip(current, value)]
+                else:
+                    target[key] = target.get(key, 0) + value
+    return {name: [[list(labels), value] for labels, value in series.items()] for name, series in merged.items()}
+
+
+def render_prometheus(snapshot: dict) -> str:
+    """Format a snapshot in the Prometheus text exposition format.
+
+    Args:
+        snapshot: Metric values as returned by snapshot() or merge_snapshots().
+
+    Returns:
+        The exposition text.
+    """
+    lines: list[str] = []
+    for spec in METRICS:
+        lines.append(f'# HELP {spec.name} {spec.help}')
+        lines.append(f'# TYPE {spec.name} {spec.kind}')
+        for labels, value in sorted(snapshot.get(spec.name, []), key=lambda item: item[0]):
+            label_text = ','.join(f'{name}="{_escape(v)}"' for name, v in zip(spec.labels, labels))
+            if spec.kind != 'histogram':
+                lines.append(f'{spec.name}{{{label_text}}} {_format(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip((*spec.buckets, float('inf')), value):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else _format(bound)
+                lines.append(f'{spec.name}_bucket{{{label_text},le="{le}"}} {_format(cumulative)}')
+            lines.append(f'{spec.name}_sum{{{label_text}}} {_format(value[-2])}')
+            lines.append(f'{spec.name}_count{{{label_text}}} {_format(value[-1])}')
+    return '\n'.join(lines) + '\n'
+
+
+def init_metrics(app: Flask) -> None:
+    """Record per-endpoint request and SQL metrics and serve them at /metrics.
+
+    With METRICS_DIR set, each worker writes its values to its own file in that
+    directory at most every METRICS_FLUSH_INTERVAL seconds, and /metrics reports
+    the sum over all files, so a scrape of any worker covers the whole server.
+
+    Args:
+        app: The Flask application instance.
+    """
+    install_sql_instrumentation()
+    app.config.setdefault('METRICS_DIR', os.getenv(METRICS_DIR_ENV, '').strip() or None)
+    app.config.setdefault('METRICS_FLUSH_INTERVAL', get_float_env('METRICS_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL))
+    app.extensions['metrics'] = MetricsRegistry()
+    app.extensions['metrics_last_flush'] = 0.0
+    app.before_request(_start_request)
+    app.after_request(_record_status)
+    app.teardown_request(_finish_request)
+    app.add_url_rule(METRICS_PATH, 'metrics', metrics_view, methods=['GET'])
+
+
+def get_registry() -> MetricsRegistry:
+    """Get the metrics registry of the current app."""
+    return current_app.extensions['metrics']
+
+
+def metrics_view() -> Response:
+    """Serve the metrics of this worker, or of all workers when METRICS_DIR is set."""
+    metrics_dir = current_app.config['METRICS_DIR']
+    if metrics_dir:
+        _flush(metrics_dir)
+        snapshot = merge_snapshots(_read_worker_snapshots(metrics_dir))
+    else:
+        snapshot = get_registry().snapshot()
+    return Response(render_prometheus(snapshot), content_type=METRICS_CONTENT_TYPE)
+
+
+def clear_metrics_dir(metrics_dir: str) -> None:
+    """Remove worker files left behind by a previous server run.
+
+    Args:
+        metrics_dir: The METRICS_DIR directory.
+    """
+    if not os.path.isdir(metrics_dir):
+        return
+    for entry in os.listdir(metrics_dir):
+        if entry.startswith('worker-') and entry.endswith('.json'):
+            os.remove(os.path.join(metrics_dir, entry))
+
+
+def _request_labels() -> tuple[str, str]:
+    return request.method, request.endpoint or 'unmatched'
+
+
+def _start_request() -> None:
+    if is_warmup_request():
+        return
+    g._metrics_start = time.perf_counter()
+    g._metrics_status = '500'
+    get_registry().inc(REQUESTS_IN_FLIGHT, _request_labels())
+
+
+def _record_status(response: Response) -> Response:
+    g._metrics_status = str(response.status_code)
+    return response
+
+
+def _finish_request(error: BaseException | None) -> None:
+    start = g.pop('_metrics_start', None)
+    if start is None:
+        return
+    registry = get_registry()
+    labels = _request_labels()
+    stats = get_request_stats()
+    registry.inc(REQUESTS_IN_FLIGHT, labels, -1)
+    registry.inc(REQUESTS_TOTAL, (*labels, g.pop('_metrics_status', '500')))
+    registry.observe(REQUEST_DURATION, labels, time.perf_counter() - start)
+    registry.observe(SQL_QUERIES, labels, stats.sql_count)
+    registry.observe(SQL_TIME, labels, stats.sql_seconds)
+
+    metrics_dir = current_app.config['METRICS_DIR']
+    if metrics_dir and time.monotonic() - current_app.extensions['metrics_last_flush'] >= current_app.config['METRICS_FLUSH_INTERVAL']:
+        _flush(metrics_dir)
+
+
+def _flush(metrics_dir: str) -> None:
+    current_app.extensions['metrics_last_flush'] = time.monotonic()
+    os.makedirs(metrics_dir, exist_ok=True)
+    path = os.path.join(metrics_dir, f'worker-{os.getpid()}.json')
+    if current_app.extensions.get('metrics_pid') != os.getpid():
+        current_app.extensions['metrics_pid'] = os.getpid()
+        # A file already under this pid was left by an exited worker whose pid was reused
+        with _directory_lock(metrics_dir):
+            _fold_dead_worker(metrics_dir, path)
+    _write_snapshot(path, get_registry().snapshot())
+
+
+def _read_worker_snapshots(metrics_dir: str) -> list[dict]:
+    # Held while reading too, so a file being folded is never counted twice or missed
+    with _directory_lock(metrics_dir):
+        for entry in _worker_files(metrics_dir):
+            if not _is_alive(_worker_pid(entry)):
+                _fold_dead_worker(metrics_dir, os.path.join(metrics_dir, entry))
+        snapshots = [_read_snapshot(os.path.join(metrics_dir, entry))
+                     for entry in [DEAD_WORKERS_FILE, *_worker_files(metrics_dir)]]
+    return [snapshot for snapshot in snapshots if snapshot is not None]
+
+
+def _worker_files(metrics_dir: str) -> list[str]:
+    return [entry for entry in os.listdir(metrics_dir)
+            if entry.startswith('worker-') and entry.endswith('.json') and entry != DEAD_WORKERS_FILE]
+
+
+def _worker_pid(entry: str) -> int:
+    return int(entry[len('worker-'):-len('.json')])
+
+
+def _fold_dead_worker(metrics_dir: str, path: str) -> None:
+    # Caller holds the directory lock, so each file is added to the total exactly once
+    snapshot = _read_snapshot(path)
+    if snapshot is None:
+        return
+    # Counters of exited workers still count; their in-flight requests do not
+    snapshot.pop(REQUESTS_IN_FLIGHT.name, None)
+    dead_path = os.path.join(metrics_dir, DEAD_WORKERS_FILE)
+    _write_snapshot(dead_path, merge_snapshots([_read_snapshot(dead_path) or {}, snapshot]))
+    os.remove(path)
+
+
+def _read_snapshot(path: str) -> dict | None:
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_snapshot(path: str, snapshot: dict) -> None:
+    temp_path = f'{path}.{threading.get_ident()}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(snapshot, file)
+    os.replace(temp_path, path)
+
+
+@contextmanager
+def _directory_lock(metrics_dir: str) -> Iterator[None]:
+    # Serializes folding across the workers sharing the directory
+    with open(os.path.join(metrics_dir, LOCK_FILE), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
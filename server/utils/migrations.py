@@ -0,0 +1,247 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import (
+    Column, Connection, DateTime, Date, Engine, Float, ForeignKey, Index, Integer, MetaData,
+    String, Table, Text, inspect, insert, select, func, text,
+)
+from sqlalchemy.schema import CreateColumn
+from models import db
+
+# Table that records which migrations have been applied
+VERSION_TABLE_NAME: str = 'schema_migrations'
+
+_version_metadata = MetaData()
+version_table = Table(
+    VERSION_TABLE_NAME,
+    _version_metadata,
+    Column('version', Integer, primary_key=True),
+    Column('description', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A single, ordered schema change."""
+
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+MIGRATIONS: list[Migration] = []
+
+
+def migration(version: int, description: str) -> Callable:
+    """Register an upgrade function as the next migration in the registry.
+
+    Args:
+        version: Strictly increasing version number.
+        description: Short human-readable summary of the change.
+
+    Returns:
+        Decorator that registers the function.
+    """
+    def decorator(upgrade: Callable[[Connection], None]) -> Callable[[Connection], None]:
+        if MIGRATIONS and version <= MIGRATIONS[-1].version:
+            raise ValueError(f"Migration {version} must be greater than {MIGRATIONS[-1].version}")
+        MIGRATIONS.append(Migration(version, description, upgrade))
+        return upgrade
+    return decorator
+
+
+def current_version(connection: Connection) -> int:
+    """Get the highest applied migration version.
+
+    Args:
+        connection: An open database connection.
+
+    Returns:
+        The applied version, or 0 for an unversioned database.
+    """
+    if not inspect(connection).has_table(VERSION_TABLE_NAME):
+        return 0
+    return connection.execute(select(func.coalesce(func.max(version_table.c.version), 0))).scalar()
+
+
+def pending_migrations(connection: Connection, target: int | None = None) -> list[Migration]:
+    """List migrations that have not been applied yet, in order.
+
+    Args:
+        connection: An open database connection.
+        target: Optional version to stop at (inclusive).
+
+    Returns:
+        The migrations still to apply.
+    """
+    applied = current_version(connection)
+    return [
+        m for m in MIGRATIONS
+        if m.version > applied and (target is None or m.version <= target)
+    ]
+
+
+def migrate(engine: Engine, target: int | None = None) -> list[Migration]:
+    """Apply pending migrations, each in its own transaction.
+
+    Args:
+        engine: The engine of the primary database.
+        target: Optional version to stop at (inclusive).
+
+    Returns:
+        The migrations that were applied.
+    """
+    with engine.begin() as connection:
+        _version_metadata.create_all(connection)
+        pending = pending_migrations(connection, target)
+
+    for m in pending:
+        with engine.begin() as connection:
+            m.upgrade(connection)
+            connection.execute(insert(version_table).values(
+                version=m.version,
+                description=m.description,
+                applied_at=datetime.now(timezone.utc),
+            ))
+    return pending
+
+
+@click.command('migrate')
+@click.option('--target', type=int, default=None, help='Stop at this version.')
+@click.option('--status', is_flag=True, help='Show the current version without migrating.')
+@with_appcontext
+def migrate_command(target: int | None, status: bool) -> None:
+    """Apply pending database migrations."""
+    engine = db.engine
+    if status:
+        with engine.connect() as connection:
+            click.echo(f"Current version: {current_version(connection)}")
+            for m in pending_migrations(connection, target):
+                click.echo(f"Pending: {m.version} {m.description}")
+        return
+
+    applied = migrate(engine, target)
+    for m in applied:
+        click.echo(f"Applied: {m.version} {m.description}")
+    if not applied:
+        click.echo("Database is up to date")
+
+
+def _add_column_if_missing(connection: Connection, table_name: str, column: Column) -> None:
+    """Add a column to an existing table unless it is already there."""
+    existing = {c['name'] for c in inspect(connection).get_columns(table_name)}
+    if column.name in existing:
+        return
+    Table(table_name, MetaData(), column)
+    column_ddl = CreateColumn(column).compile(dialect=connection.dialect)
+    connection.execute(text(f'ALTER TABLE {table_name} ADD COLUMN {column_ddl}'))
+
+
+def _create_index_if_missing(connection: Connection, table_name: str, name: str, *columns: str) -> None:
+    """Create an index on an existing table unless it is already there."""
+    table = Table(table_name, MetaData(), autoload_with=connection)
+    Index(name, *(table.c[c] for c in columns)).create(connection, checkfirst=True)
+
+
+def _base_tables() -> MetaData:
+    """The schema as of version 1, frozen; later changes belong in new migrations."""
+    metadata = MetaData()
+    Table(
+        'categories', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('name', String(100), nullable=False, unique=True),
+        Column('description', Text),
+    )
+    Table(
+        'publishers', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('name', String(100), nullable=False, unique=True),
+        Column('description', Text),
+    )
+    Table(
+        'games', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('title', String(100), nullable=False),
+        Column('description', Text, nullable=False),
+        Column('star_rating', Float),
+        Column('category_id', Integer, ForeignKey('categories.id'), nullable=False),
+        Column('publisher_id', Integer, ForeignKey('publishers.id'), nullable=False),
+    )
+    Table(
+        'reviews', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('rating', Integer, nullable=False),
+        Column('review_text', Text, nullable=False),
+        Column('reviewer_name', String(100), nullable=False),
+        Column('created_at', DateTime, nullable=False),
+        Column('game_id', Integer, ForeignKey('games.id'), nullable=False),
+    )
+    Table(
+        'carts', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('session_id', String(100), nullable=False, unique=True),
+        Column('created_at', DateTime, nullable=False),
+        Column('updated_at', DateTime, nullable=False),
+        Column('status', String(20), nullable=False),
+    )
+    Table(
+        'cart_items', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('cart_id', Integer, ForeignKey('carts.id'), nullable=False),
+        Column('game_id', Integer, ForeignKey('games.id'), nullable=False),
+        Column('quantity', Integer, nullable=False),
+        Column('price', Float, nullable=False),
+    )
+    Table(
+        'payments', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('cart_id', Integer, ForeignKey('carts.id'), nullable=False),
+        Column('amount', Float, nullable=False),
+        Column('payment_method', String(20), nullable=False),
+        Column('card_last_four', String(4)),
+        Column('status', String(20), nullable=False),
+        Column('transaction_id', String(36), nullable=False, unique=True),
+        Column('created_at', DateTime, nullable=False),
+    )
+    return metadata
+
+
+@migration(1, 'Create base tables')
+def _create_base_tables(connection: Connection) -> None:
+    # Tables already present in older databases are left untouched
+    _base_tables().create_all(connection, checkfirst=True)
+
+
+@migration(2, 'Add popularity, release date and price to games')
+def _add_game_catalog_columns(connection: Connection) -> None:
+    _add_column_if_missing(connection, 'games', Column('popularity', Integer, nullable=True, server_default='0'))
+    _add_column_if_missing(connection, 'games', Column('release_date', Date, nullable=True))
+    _add_column_if_missing(connection, 'games', Column('price', Float, nullable=False, server_default='0'))
+
+
+@migration(3, 'Add catalog, review, cart and payment lookup indexes')
+def _add_lookup_indexes(connection: Connection) -> None:
+    _create_index_if_missing(connection, 'games', 'ix_games_title', 'title')
+    _create_index_if_missing(connection, 'games', 'ix_games_popularity', 'popularity')
+    _create_index_if_missing(connection, 'games', 'ix_games_category_id', 'category_id')
+    _create_index_if_missing(connection, 'games', 'ix_games_publisher_id', 'publisher_id')
+    _create_index_if_missing(connection, 'reviews', 'ix_reviews_game_id_created_at', 'game_id', 'created_at')
+    _create_index_if_missing(connection, 'cart_items', 'ix_cart_items_cart_id_game_id', 'cart_id', 'game_id')
+    _create_index_if_missing(connection, 'payments', 'ix_payments_cart_id', 'cart_id')
+
+
+@migration(4, 'Add shared response cache generations')
+def _add_cache_generations(connection: Connection) -> None:
+    generations = Table(
+        'cache_generations',
+        MetaData(),
+        Column('name', String(50), primary_key=True),
+        Column('generation', Integer, nullable=False),
+    )
+    generations.create(connection, checkfirst=True)
+    # Seeded so concurrent first invalidations update a row instead of racing to insert it
+    if connection.execute(select(generations.c.name).where(generations.c.name == 'catalog')).first() is None:
+        connection.execute(insert(generations).values(name='catalog', generation=0))
@@ -0,0 +1,129 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from types import FrameType
+
+DEFAULT_INTERVAL: float = 0.005
+
+# Leaf frames of threads that are waiting for work rather than using CPU
+IDLE_FRAMES: frozenset[tuple[str, str]] = frozenset({
+    ('threading.py', 'wait'),
+    ('selectors.py', 'select'),
+    ('socket.py', 'accept'),
+    ('queue.py', 'get'),
+    ('socketserver.py', 'serve_forever'),
+})
+
+
+@lru_cache(maxsize=4096)
+def _frame_label(filename: str, name: str) -> str:
+    # Keep the last two path components so site-packages paths stay readable
+    parts = filename.replace('\\', '/').split('/')
+    return f"{'/'.join(parts[-2:])}:{name}"
+
+
+def collapse_stack(frame: FrameType) -> str:
+    """Format a thread's stack as one line of the collapsed flame graph format.
+
+    Args:
+        frame: The innermost frame of the thread.
+
+    Returns:
+        Frames from the outermost to the innermost, separated by semicolons.
+    """
+    labels = []
+    while frame is not None:
+        code = frame.f_code
+        labels.append(_frame_label(code.co_filename, code.co_name))
+        frame = frame.f_back
+    labels.reverse()
+    return ';'.join(labels)
+
+
+def _is_idle(frame: FrameType) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES
+
+
+class SamplingProfiler:
+    """Statistical profiler that samples the stacks of running threads from a background thread.
+
+    Each sample reads every thread's current frame through sys._current_frames(),
+    so the profiled code is not instrumented and runs at full speed.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, thread_ids: set[int] | None = None,
+                 include_idle: bool = False) -> None:
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.include_idle = include_idle
+        self.samples = 0
+        self.started_at: float | None = None
+        self.stopped_at: float | None = None
+        self._stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def duration(self) -> float:
+        """Seconds sampled so far."""
+        if self.started_at is None:
+            return 0.0
+        return (self.stopped_at or time.monotonic()) - self.started_at
+
+    def start(self, seconds: float | None = None) -> None:
+        """Start sampling in a daemon thread.
+
+        Args:
+            seconds: Optional limit after which sampling stops on its own.
+        """
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, args=(seconds,), name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread to finish."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def collapsed(self) -> str:
+        """Get the samples in collapsed stack format, one 'stack count' line per stack.
+
+        Returns:
+            Text that flamegraph.pl, speedscope or inferno can read directly.
+        """
+        # Copy first; the sampler thread may still be adding stacks
+        stacks = sorted(dict(self._stacks).items(), key=lambda item: item[1], reverse=True)
+        return '\n'.join(f'{stack} {count}' for stack, count in stacks)
+
+    def summary(self) -> dict:
+        """Describe the profile without its stacks."""
+        return {
+            'running': self.running,
+            'samples': self.samples,
+            'stacks': len(self._stacks),
+            'intervalMs': self.interval * 1000,
+            'durationSeconds': round(self.duration, 3),
+        }
+
+    def _run(self, seconds: float | None) -> None:
+        own_id = threading.get_ident()
+        deadline = None if seconds is None else time.monotonic() + seconds
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                if not self.include_idle and _is_idle(frame):
+                    continue
+                self._stacks[collapse_stack(frame)] += 1
+            self.samples += 1
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+        self.stopped_at = time.monotonic()
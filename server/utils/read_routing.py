@@ -0,0 +1,71 @@
+from functools import wraps
+from typing import Callable
+from flask import Flask, Response, current_app, g, request
+from models.session import REPLICA_BIND_KEY
+
+# Cookie set after a mutation so the client's next reads see its own writes
+READ_YOUR_WRITES_COOKIE: str = 'tailspin_read_primary'
+# Header a client can send to force a read from the primary
+READ_PRIMARY_HEADER: str = 'X-Read-Primary'
+DEFAULT_READ_YOUR_WRITES_SECONDS: int = 5
+
+MUTATING_METHODS: tuple[str, ...] = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+
+def read_replica(view: Callable) -> Callable:
+    """Mark a view as read-only so its queries may be served by the read replica.
+
+    The request falls back to the primary when the client sent the read-primary
+    header or still holds the read-your-writes cookie from a recent mutation.
+
+    Args:
+        view: The Flask view function.
+
+    Returns:
+        The wrapped view function.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.use_read_replica = not wants_primary()
+        return view(*args, **kwargs)
+    wrapper.read_only = True
+    return wrapper
+
+
+def is_read_only(view: Callable) -> bool:
+    """Check whether a view was marked read-only with the read_replica decorator."""
+    return getattr(view, 'read_only', False)
+
+
+def init_read_routing(app: Flask) -> None:
+    """Register the read-your-writes hook on the app.
+
+    Args:
+        app: The Flask application instance.
+    """
+    app.config.setdefault('READ_YOUR_WRITES_SECONDS', DEFAULT_READ_YOUR_WRITES_SECONDS)
+    app.after_request(_pin_reads_after_mutation)
+
+
+def wants_primary() -> bool:
+    """Check whether the client asked for, or recently wrote and needs, primary reads."""
+    if request.headers.get(READ_PRIMARY_HEADER, '').lower() in ('1', 'true', 'yes'):
+        return True
+    return READ_YOUR_WRITES_COOKIE in request.cookies
+
+
+def _pin_reads_after_mutation(response: Response) -> Response:
+    # A read-only view reached with POST, such as the batch endpoint, writes nothing
+    if request.method not in MUTATING_METHODS or response.status_code >= 400 or 'use_read_replica' in g:
+        return response
+    if REPLICA_BIND_KEY not in current_app.config.get('SQLALCHEMY_BINDS', {}):
+        return response
+
+    response.set_cookie(
+        READ_YOUR_WRITES_COOKIE,
+        '1',
+        max_age=current_app.config['READ_YOUR_WRITES_SECONDS'],
+        httponly=True,
+        samesite='Lax',
+    )
+    return response
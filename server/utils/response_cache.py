@@ -0,0 +1,276 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Callable
+from flask import Response, current_app, make_response, request
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from models import CacheGeneration, db
+from utils.env import get_bool_env, get_float_env
+from utils.read_routing import wants_primary
+from utils.single_flight import DEFAULT_TIMEOUT, SingleFlight
+
+DEFAULT_CACHE_TTL: float = 30.0
+DEFAULT_CACHE_MAX_ENTRIES: int = 1024
+# How long a worker reuses the shared generation before reading it again
+DEFAULT_GENERATION_INTERVAL: float = 1.0
+CACHE_STATUS_HEADER: str = 'X-Cache'
+# Games and reviews; cleared whenever a review changes a game's rating
+CATALOG_CACHE: str = 'catalog'
+
+GENERATION_STATEMENT = select(CacheGeneration.generation).where(CacheGeneration.name == bindparam('name'))
+# Dialects that bump the generation in a single INSERT ... ON CONFLICT statement
+UPSERT_INSERTS: dict[str, Callable] = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+
+@dataclass
+class CachedResponse:
+    """A cached response body with its precompressed variants."""
+
+    body: bytes
+    status: int
+    mimetype: str
+    expires_at: float
+    headers: list[tuple[str, str]] = field(default_factory=list)
+    # Content-Encoding -> compressed body, filled lazily by the compression hook
+    variants: dict[str, bytes] = field(default_factory=dict)
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of response bodies with a time-to-live.
+
+    Also remembers the last shared generation read for it, so cache hits do
+    not query the database on every request.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+                 generation_interval: float = DEFAULT_GENERATION_INTERVAL) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.generation_interval = generation_interval
+        self.generation: int | None = None
+        self.generation_read_at = 0.0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Get a fresh entry, or None if it is missing or expired.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            The cached response, if still fresh.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse) -> CachedResponse:
+        """Store an entry, evicting the least recently used entry when full.
+
+        Args:
+            key: The cache key.
+            entry: The entry to cache; its expiry is set from the TTL.
+
+        Returns:
+            The stored entry.
+        """
+        entry.expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def get_cache(name: str) -> ResponseCache:
+    """Get the named response cache of the current app, creating it on first use.
+
+    TTL comes from RESPONSE_CACHE_TTL (seconds, 0 disables caching), and how
+    long the shared generation is reused from RESPONSE_CACHE_GENERATION_INTERVAL.
+
+    Args:
+        name: The cache name, e.g. 'catalog'.
+
+    Returns:
+        The app's cache with that name.
+    """
+    caches = current_app.extensions.setdefault('response_caches', {})
+    if name not in caches:
+        caches[name] = ResponseCache(
+            ttl=current_app.config.get('RESPONSE_CACHE_TTL', get_float_env('RESPONSE_CACHE_TTL', DEFAULT_CACHE_TTL)),
+            max_entries=current_app.config.get('RESPONSE_CACHE_MAX_ENTRIES', DEFAULT_CACHE_MAX_ENTRIES),
+            generation_interval=current_app.config.get(
+                'RESPONSE_CACHE_GENERATION_INTERVAL',
+                get_float_env('RESPONSE_CACHE_GENERATION_INTERVAL', DEFAULT_GENERATION_INTERVAL)),
+        )
+    return caches[name]
+
+
+def cache_generation(name: str) -> int:
+    """Get the shared generation of a named cache, read at most once per generation interval.
+
+    Args:
+        name: The cache name.
+
+    Returns:
+        The generation, 0 until the cache is first invalidated.
+    """
+    cache = get_cache(name)
+    now = time.monotonic()
+    if cache.generation is None or now - cache.generation_read_at >= cache.generation_interval:
+        cache.generation = db.session.execute(GENERATION_STATEMENT, {'name': name}).scalar() or 0
+        cache.generation_read_at = now
+    return cache.generation
+
+
+def invalidate_cache(name: str) -> None:
+    """Make a named cache stale in every worker and drop this worker's entries.
+
+    The generation is bumped in the current transaction, so call this before
+    committing the write that changed the cached data. Other workers see the
+    new generation within the generation interval and rebuild their responses.
+    The bump is a single upsert, so concurrent writers never race to create
+    the row.
+
+    Args:
+        name: The cache name.
+    """
+    dialect = db.session.get_bind(mapper=CacheGeneration).dialect.name
+    if dialect in UPSERT_INSERTS:
+        db.session.execute(
+            UPSERT_INSERTS[dialect](CacheGeneration).values(name=name, generation=1).on_conflict_do_update(
+                index_elements=[CacheGeneration.name], set_={'generation': CacheGeneration.generation + 1})
+        )
+    else:
+        # Other dialects rely on the row that migration 4 seeds
+        db.session.execute(
+            update(CacheGeneration).where(CacheGeneration.name == name)
+            .values(generation=CacheGeneration.generation + 1)
+        )
+    cache = get_cache(name)
+    cache.clear()
+    # Read the new generation again once the write is committed
+    cache.generation = None
+
+
+def request_cache_key() -> str:
+    """Build a cache key from the request path and its sorted query arguments."""
+    args = sorted((key, value) for key in request.args for value in request.args.getlist(key))
+    return request.path + '?' + '&'.join(f'{key}={value}' for key, value in args)
+
+
+def get_single_flight() -> SingleFlight[CachedResponse]:
+    """Get the current app's request coalescing group, creating it on first use.
+
+    The wait limit comes from SINGLE_FLIGHT_TIMEOUT (seconds).
+    """
+    extensions = current_app.extensions
+    if 'single_flight' not in extensions:
+        extensions['single_flight'] = SingleFlight(
+            timeout=current_app.config.get('SINGLE_FLIGHT_TIMEOUT', get_float_env('SINGLE_FLIGHT_TIMEOUT', DEFAULT_TIMEOUT))
+        )
+    return extensions['single_flight']
+
+
+def entry_from_response(response: Response) -> CachedResponse:
+    """Copy a response into a cache entry that any thread can turn back into a response.
+
+    Args:
+        response: A fully built, non-streaming response.
+
+    Returns:
+        The entry, not yet stored in a cache.
+    """
+    return CachedResponse(
+        body=response.get_data(),
+        status=response.status_code,
+        mimetype=response.mimetype,
+        expires_at=0.0,
+        headers=[(key, value) for key, value in response.headers.items()
+                 if key not in ('Content-Type', 'Content-Length')],
+    )
+
+
+def response_from_entry(entry: CachedResponse, cache_status: str) -> Response:
+    """Build a new response from a cache entry.
+
+    Args:
+        entry: The cached entry.
+        cache_status: Value for the X-Cache header.
+
+    Returns:
+        A response that shares the entry's body and precompressed variants.
+    """
+    response = current_app.response_class(entry.body, status=entry.status, mimetype=entry.mimetype,
+                                          headers=entry.headers)
+    response.headers[CACHE_STATUS_HEADER] = cache_status
+    response.cached_entry = entry
+    return response
+
+
+def cached_response(name: str) -> Callable:
+    """Cache successful GET responses of a view in the named cache.
+
+    On a miss, identical concurrent requests (same path and sorted query
+    arguments) are coalesced: one runs the view and the others receive a copy
+    of its response, marked X-Cache: COALESCED. Coalescing also applies when
+    the cache TTL is 0 and can be turned off with SINGLE_FLIGHT. Requests that
+    must read from the primary bypass both.
+
+    Entries are keyed by the cache's shared generation as well, so a write in
+    any worker makes every worker rebuild its copy on the next request.
+
+    The cached entry is attached to the response as ``cached_entry`` so other
+    hooks, such as compression, can store derived variants alongside it.
+
+    Args:
+        name: The cache name.
+
+    Returns:
+        Decorator for a Flask view function.
+    """
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if wants_primary():
+                return view(*args, **kwargs)
+
+            cache = get_cache(name)
+            key = request_cache_key()
+            if cache.ttl > 0:
+                key = f'{cache_generation(name)}:{key}'
+                entry = cache.get(key)
+                if entry is not None:
+                    return response_from_entry(entry, 'HIT')
+
+            def render() -> CachedResponse:
+                entry = entry_from_response(make_response(view(*args, **kwargs)))
+                if cache.ttl > 0 and entry.status == 200:
+                    cache.set(key, entry)
+                return entry
+
+            if not current_app.config.get('SINGLE_FLIGHT', get_bool_env('SINGLE_FLIGHT', True)):
+                return response_from_entry(render(), 'MISS')
+            entry, shared = get_single_flight().do(f'{name}:{key}', render)
+            return response_from_entry(entry, 'COALESCED' if shared else 'MISS')
+        return wrapper
+    return decorator
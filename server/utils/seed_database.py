@@ -1,94 +1,184 @@
+import argparse
 import csv
 import os
 import random
+import time
+from dataclasses import dataclass
 from datetime import date, timedelta
+from itertools import islice
+from typing import Iterable, Iterator
 from flask import Flask
+from sqlalchemy import Connection, Table, insert, select
 from models import db, Category, Game, Publisher
 from utils.database import init_db
+from utils.migrations import migrate
 
-def create_app():
+DEFAULT_CSV_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seed_data', 'games.csv')
+DEFAULT_BATCH_SIZE: int = 5000
+
+
+@dataclass
+class SeedResult:
+    """Summary of a seeding run."""
+
+    games: int
+    categories: int
+    publishers: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.games / self.seconds if self.seconds else float(self.games)
+
+
+def create_app(connection_string: str | None = None):
     """Create and configure Flask app for database operations"""
     app = Flask(__name__)
 
     # Initialize the database with the app
-    init_db(app)
-    
+    init_db(app, connection_string)
+
     return app
 
-def create_games():
-    """Create games, categories and publishers from CSV data for crowd funding platform"""
+def iter_csv_rows(csv_path: str) -> Iterator[dict]:
+    """Stream rows from a games CSV file without loading it into memory.
+
+    Args:
+        csv_path: Path to a CSV with Title, Category, Publisher and Description columns.
+
+    Yields:
+        One dictionary per CSV row.
+    """
+    with open(csv_path, mode='r', encoding='utf-8', newline='') as csv_file:
+        yield from csv.DictReader(csv_file)
+
+def insert_in_batches(connection: Connection, table: Table, rows: Iterable[dict], batch_size: int) -> int:
+    """Insert rows with Core executemany in fixed-size batches.
+
+    Args:
+        connection: Connection with an open transaction.
+        table: The table to insert into.
+        rows: Row dictionaries, consumed lazily.
+        batch_size: Number of rows sent per executemany call.
+
+    Returns:
+        The number of rows inserted.
+
+    Raises:
+        ValueError: If batch_size is less than 1.
+    """
+    if batch_size < 1:
+        raise ValueError(f"Batch size must be at least 1, got {batch_size}")
+    rows = iter(rows)
+    total = 0
+    statement = insert(table)
+    while batch := list(islice(rows, batch_size)):
+        connection.execute(statement, batch)
+        total += len(batch)
+    return total
+
+def resolve_names(connection: Connection, table: Table, names: Iterable[str], description: str) -> dict[str, int]:
+    """Map names to ids, inserting any names that do not exist yet.
+
+    Args:
+        connection: Connection with an open transaction.
+        table: A table with id, name and description columns.
+        names: The names that need ids.
+        description: Format string for new rows' description, with a {name} field.
+
+    Returns:
+        Dictionary of name to id.
+    """
+    wanted = set(names)
+    ids = {row.name: row.id for row in connection.execute(select(table.c.id, table.c.name))}
+    missing = sorted(wanted - ids.keys())
+    if missing:
+        connection.execute(insert(table), [
+            {'name': name, 'description': description.format(name=name)} for name in missing
+        ])
+        ids = {row.name: row.id for row in connection.execute(select(table.c.id, table.c.name))}
+    return {name: ids[name] for name in wanted}
+
+def iter_game_values(rows: Iterable[dict], categories: dict[str, int], publishers: dict[str, int]) -> Iterator[dict]:
+    """Turn CSV rows into insert values for the games table.
+
+    Args:
+        rows: CSV rows.
+        categories: Category name to id.
+        publishers: Publisher name to id.
+
+    Yields:
+        Column values for one game.
+    """
+    today = date.today()
+    for row in rows:
+        yield {
+            'title': row['Title'],
+            'description': row['Description'] + " Support this game through our crowdfunding platform!",
+            'category_id': categories[row['Category']],
+            'publisher_id': publishers[row['Publisher']],
+            # Random star rating between 3.0 and 5.0 (one decimal place)
+            'star_rating': round(random.uniform(3.0, 5.0), 1),
+            # Random popularity score
+            'popularity': random.randint(100, 10000),
+            # Random release date within the last 3 years
+            'release_date': today - timedelta(days=random.randint(0, 3 * 365)),
+            'price': 0.0,
+        }
+
+def create_games(csv_path: str = DEFAULT_CSV_PATH, batch_size: int = DEFAULT_BATCH_SIZE) -> SeedResult:
+    """Create games, categories and publishers from CSV data for crowd funding platform
+
+    The CSV is streamed twice: once to collect category and publisher names, which
+    are resolved to ids up front, and once to insert games in batches. Everything
+    runs in a single transaction.
+
+    Args:
+        csv_path: Path to the games CSV.
+        batch_size: Number of games per insert batch.
+
+    Returns:
+        Counts and timing for the run.
+    """
     app = create_app()
-    
+
     with app.app_context():
-        # Track which categories and publishers have been created
-        categories = {}  # name -> category object
-        publishers = {}  # name -> publisher object
-        
-        # Read the CSV file
-        csv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 
-                              'seed_data', 'games.csv')
-        
-        game_count = 0
-        with open(csv_path, mode='r', encoding='utf-8') as csv_file:
-            csv_reader = csv.DictReader(csv_file)
-            
-            for row in csv_reader:
-                game_count += 1
-                # Process category
-                category_name = row['Category']
-                if category_name not in categories:
-                    # Create new category if it doesn't exist
-                    category_description = f"Collection of {category_name} games available for crowdfunding"
-                    category = Category(
-                        name=category_name,
-                        description=category_description
-                    )
-                    db.session.add(category)
-                    db.session.flush()  # Get ID without committing
-                    categories[category_name] = category
-                
-                # Process publisher
-                publisher_name = row['Publisher']
-                if publisher_name not in publishers:
-                    # Create new publisher if it doesn't exist
-                    publisher_description = f"{publisher_name} is a game publisher seeking funding for exciting new titles"
-                    publisher = Publisher(
-                        name=publisher_name,
-                        description=publisher_description
-                    )
-                    db.session.add(publisher)
-                    db.session.flush()  # Get ID without committing
-                    publishers[publisher_name] = publisher
-                
-                # Generate random star rating between 3.0 and 5.0 (one decimal place)
-                star_rating = round(random.uniform(3.0, 5.0), 1)
-
-                # Generate random popularity score (0-10000)
-                popularity = random.randint(100, 10000)
-
-                # Generate random release date within the last 3 years
-                days_ago = random.randint(0, 3 * 365)
-                release_date = date.today() - timedelta(days=days_ago)
-                
-                # Create the game with enhanced description for crowdfunding context
-                game = Game(
-                    title=row['Title'],
-                    description=row['Description'] + " Support this game through our crowdfunding platform!",
-                    category_id=categories[category_name].id,
-                    publisher_id=publishers[publisher_name].id,
-                    star_rating=star_rating,
-                    popularity=popularity,
-                    release_date=release_date,
-                )
-                db.session.add(game)
-            
-            # Commit all changes at once
-            db.session.commit()
-            
-        print(f"Added {game_count} games with {len(categories)} categories and {len(publishers)} publishers")
-
-def seed_database():
-    create_games()
+        # Bring the schema up to date before inserting
+        migrate(db.engine)
+
+        start = time.perf_counter()
+        category_names: set[str] = set()
+        publisher_names: set[str] = set()
+        for row in iter_csv_rows(csv_path):
+            category_names.add(row['Category'])
+            publisher_names.add(row['Publisher'])
+
+        with db.engine.begin() as connection:
+            categories = resolve_names(connection, Category.__table__, category_names,
+                                       "Collection of {name} games available for crowdfunding")
+            publishers = resolve_names(connection, Publisher.__table__, publisher_names,
+                                       "{name} is a game publisher seeking funding for exciting new titles")
+            game_count = insert_in_batches(
+                connection,
+                Game.__table__,
+                iter_game_values(iter_csv_rows(csv_path), categories, publishers),
+                batch_size,
+            )
+
+        result = SeedResult(game_count, len(categories), len(publishers), time.perf_counter() - start)
+
+    print(f"Added {result.games} games with {result.categories} categories and {result.publishers} publishers "
+          f"in {result.seconds:.2f}s ({result.rows_per_second:,.0f} rows/s)")
+    return result
+
+def seed_database(csv_path: str = DEFAULT_CSV_PATH, batch_size: int = DEFAULT_BATCH_SIZE) -> SeedResult:
+    return create_games(csv_path, batch_size)
 
 if __name__ == '__main__':
-    seed_database()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Seed the database with games from a CSV file.')
+    parser.add_argument('--csv', default=DEFAULT_CSV_PATH, help='Path to the games CSV.')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Games per insert batch.')
+    args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error('--batch-size must be at least 1')
+    seed_database(args.csv, args.batch_size)
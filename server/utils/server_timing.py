@@ -0,0 +1,65 @@
+import time
+from flask import Flask, Response, g
+from utils.env import get_bool_env
+from utils.instrumentation import get_request_stats, install_sql_instrumentation
+
+SERVER_TIMING_HEADER: str = 'Server-Timing'
+
+
+def init_server_timing(app: Flask) -> None:
+    """Add a Server-Timing header that splits each response's time into phases.
+
+    Enabled by SERVER_TIMING (default on). Register it before other after-request
+    hooks, such as compression, so the total includes their work.
+
+    Args:
+        app: The Flask application instance.
+    """
+    app.config.setdefault('SERVER_TIMING', get_bool_env('SERVER_TIMING', True))
+    if not app.config['SERVER_TIMING']:
+        return
+    install_sql_instrumentation()
+    app.before_request(_start_timer)
+    app.after_request(_add_server_timing)
+
+
+def format_server_timing(total: float, sql_seconds: float, orm_seconds: float, serialize_seconds: float,
+                         sql_count: int) -> str:
+    """Build a Server-Timing value from phase durations.
+
+    The db, orm and serialize phases are the measured ones. app and total are
+    extras: app is whatever the request spent outside the measured phases, such
+    as view logic, compression and the other request hooks.
+
+    Args:
+        total: Seconds from the start of the request until now.
+        sql_seconds: Seconds spent executing SQL.
+        orm_seconds: Seconds spent turning models into dictionaries in to_dict, without their SQL.
+        serialize_seconds: Seconds spent encoding JSON.
+        sql_count: Number of SQL statements executed.
+
+    Returns:
+        The header value, with durations in milliseconds.
+    """
+    app = max(total - sql_seconds - orm_seconds - serialize_seconds, 0.0)
+    return (
+        f'db;dur={sql_seconds * 1000:.2f}, orm;dur={orm_seconds * 1000:.2f}, '
+        f'serialize;dur={serialize_seconds * 1000:.2f}, app;dur={app * 1000:.2f}, '
+        f'total;dur={total * 1000:.2f}, queries;desc="{sql_count}"'
+    )
+
+
+def _start_timer() -> None:
+    g._server_timing_start = time.perf_counter()
+
+
+def _add_server_timing(response: Response) -> Response:
+    start = g.pop('_server_timing_start', None)
+    if start is None:
+        return response
+    stats = get_request_stats()
+    response.headers[SERVER_TIMING_HEADER] = format_server_timing(
+        time.perf_counter() - start, stats.sql_seconds, stats.to_dict_seconds, stats.serialize_seconds,
+        stats.sql_count,
+    )
+    return response
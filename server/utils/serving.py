@@ -0,0 +1,131 @@
+import math
+import os
+from utils.env import get_int_env
+
+# cgroup files that describe the CPU quota of the container
+CGROUP_V2_CPU_MAX: str = 'sys/fs/cgroup/cpu.max'
+CGROUP_V1_QUOTA: str = 'sys/fs/cgroup/cpu/cpu.cfs_quota_us'
+CGROUP_V1_PERIOD: str = 'sys/fs/cgroup/cpu/cpu.cfs_period_us'
+
+DEFAULT_PORT: int = 5100
+# Threads per worker per CPU, and the range the derived thread count is kept in
+THREADS_PER_CPU: int = 4
+MIN_THREADS: int = 2
+MAX_THREADS: int = 8
+DEFAULT_KEEPALIVE: int = 10
+DEFAULT_TIMEOUT: int = 30
+DEFAULT_GRACEFUL_TIMEOUT: int = 20
+DEFAULT_MAX_REQUESTS: int = 10000
+
+
+def cgroup_cpu_limit(root: str = '/') -> float | None:
+    """Read the CPU quota from cgroup v2 or v1.
+
+    Args:
+        root: Filesystem root, overridable for tests.
+
+    Returns:
+        The number of CPUs the quota allows, or None when unlimited or unknown.
+    """
+    try:
+        with open(os.path.join(root, CGROUP_V2_CPU_MAX)) as f:
+            quota, period = f.read().split()[:2]
+        if quota == 'max':
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open(os.path.join(root, CGROUP_V1_QUOTA)) as f:
+            quota = int(f.read())
+        with open(os.path.join(root, CGROUP_V1_PERIOD)) as f:
+            period = int(f.read())
+    except (OSError, ValueError):
+        return None
+    if quota <= 0 or period <= 0:
+        return None
+    return quota / period
+
+
+def available_cpus(root: str = '/') -> float:
+    """Get the number of CPUs this process can actually use.
+
+    Args:
+        root: Filesystem root, overridable for tests.
+
+    Returns:
+        The smaller of the scheduler affinity and the cgroup quota.
+    """
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except AttributeError:
+        cpus = float(os.cpu_count() or 1)
+    limit = cgroup_cpu_limit(root)
+    return min(cpus, limit) if limit else cpus
+
+
+def default_worker_count(cpus: float) -> int:
+    """Derive the worker process count from the available CPUs.
+
+    Args:
+        cpus: Usable CPUs, possibly fractional.
+
+    Returns:
+        Two workers per whole CPU plus one, so one worker can run while another waits on I/O.
+    """
+    return 2 * max(1, math.ceil(cpus)) + 1
+
+
+def default_thread_count(cpus: float) -> int:
+    """Derive the threads per worker from the available CPUs.
+
+    Args:
+        cpus: Usable CPUs, possibly fractional.
+
+    Returns:
+        Four threads per CPU, between 2 and 8. Threads cover the time requests
+        wait on the database, so a fractional quota gets fewer of them. More
+        CPUs already add workers, which is why the count is capped.
+    """
+    return min(max(math.ceil(cpus * THREADS_PER_CPU), MIN_THREADS), MAX_THREADS)
+
+
+def server_threads(root: str = '/') -> int:
+    """Get the threads per worker: SERVER_THREADS, or the count derived from the CPUs.
+
+    Args:
+        root: Filesystem root, overridable for tests.
+
+    Returns:
+        The number of threads each gunicorn worker runs.
+    """
+    return get_int_env('SERVER_THREADS', default_thread_count(available_cpus(root)))
+
+
+def build_server_options(root: str = '/') -> dict:
+    """Build the gunicorn settings from the environment and CPU limits.
+
+    Args:
+        root: Filesystem root, overridable for tests.
+
+    Returns:
+        Dictionary of gunicorn setting names to values.
+    """
+    cpus = available_cpus(root)
+    return {
+        'bind': f"0.0.0.0:{get_int_env('PORT', DEFAULT_PORT)}",
+        'workers': get_int_env('WEB_CONCURRENCY', default_worker_count(cpus)),
+        # gthread keeps idle keep-alive connections off the worker threads
+        'worker_class': 'gthread',
+        'threads': get_int_env('SERVER_THREADS', default_thread_count(cpus)),
+        'keepalive': get_int_env('SERVER_KEEPALIVE', DEFAULT_KEEPALIVE),
+        'timeout': get_int_env('SERVER_TIMEOUT', DEFAULT_TIMEOUT),
+        'graceful_timeout': get_int_env('SERVER_GRACEFUL_TIMEOUT', DEFAULT_GRACEFUL_TIMEOUT),
+        # Recycle workers periodically, staggered so they never restart together
+        'max_requests': get_int_env('SERVER_MAX_REQUESTS', DEFAULT_MAX_REQUESTS),
+        'max_requests_jitter': get_int_env('SERVER_MAX_REQUESTS', DEFAULT_MAX_REQUESTS) // 10,
+        'preload_app': True,
+        'accesslog': '-',
+        'errorlog': '-',
+    }
@@ -0,0 +1,72 @@
+import threading
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar('T')
+
+DEFAULT_TIMEOUT: float = 10.0
+
+
+class _Call(Generic[T]):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+        self.followers = 0
+
+
+class SingleFlight(Generic[T]):
+    """Runs at most one computation per key at a time and shares its result.
+
+    Callers that arrive while a computation for their key is running wait for it
+    instead of starting their own. Nothing is kept once the computation finishes;
+    caching the result is up to the caller.
+    """
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT) -> None:
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call[T]] = {}
+
+    def do(self, key: str, compute: Callable[[], T]) -> tuple[T, bool]:
+        """Run compute for the key, or wait for the run already in progress.
+
+        A follower whose leader takes longer than the timeout computes the result
+        itself, so one stuck request cannot hold up every other one.
+
+        Args:
+            key: Identifies identical work.
+            compute: Produces the result; only called by the leader.
+
+        Returns:
+            The result, and whether it was shared from another caller's run.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.followers += 1
+
+        if not leader:
+            if call.done.wait(self.timeout):
+                if call.error is not None:
+                    raise call.error
+                return call.result, True
+            return compute(), False
+
+        try:
+            call.result = compute()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from typing import Any
+from flask import Flask, current_app, has_app_context, has_request_context, request
+from sqlalchemy.engine import Connection
+from utils.env import get_bool_env, get_float_env, get_int_env
+from utils.instrumentation import add_query_observer
+
+logger = logging.getLogger('tailspin.slow_query')
+
+DEFAULT_THRESHOLD_MS: float = 100.0
+DEFAULT_DEDUPE_SECONDS: float = 60.0
+DEFAULT_MAX_PER_MINUTE: int = 20
+
+# Prefix that asks each backend for a plan without running the statement
+EXPLAIN_PREFIXES: dict[str, str] = {
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'postgresql': 'EXPLAIN ',
+}
+EXPLAINABLE_STATEMENTS: tuple[str, ...] = ('SELECT', 'WITH')
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%\(\w+\)s|%s|:\w+|\?')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(statement: str) -> str:
+    """Identify statements that differ only in literals, placeholders or IN-list length.
+
+    Args:
+        statement: The SQL text.
+
+    Returns:
+        A short hash of the normalized statement.
+    """
+    normalized = _STRING_LITERAL.sub('?', statement)
+    normalized = _PLACEHOLDER.sub('?', normalized)
+    normalized = _NUMBER_LITERAL.sub('?', normalized)
+    normalized = _PLACEHOLDER_LIST.sub('(?)', normalized)
+    normalized = _WHITESPACE.sub(' ', normalized).strip().lower()
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Describe bound parameters by type without logging their values.
+
+    Args:
+        parameters: DBAPI parameters: a mapping, a sequence, or a list of either for executemany.
+
+    Returns:
+        Type names in the same structure, e.g. {'game_id': 'int'} or ['str', 'int'].
+    """
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, list) and parameters and isinstance(parameters[0], (dict, list, tuple)):
+        return {'executemany': len(parameters), 'row': parameter_shape(parameters[0])}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+def explain(connection: Connection, statement: str, parameters: Any) -> list[str] | None:
+    """Capture the query plan of a read statement on the connection that ran it.
+
+    The plan is fetched through a raw DBAPI cursor so it is not itself timed or logged.
+
+    Args:
+        connection: The SQLAlchemy connection that executed the statement.
+        statement: The SQL text.
+        parameters: The statement's DBAPI parameters.
+
+    Returns:
+        Plan lines, or None if the statement or backend cannot be explained.
+    """
+    prefix = EXPLAIN_PREFIXES.get(connection.dialect.name)
+    if prefix is None or not statement.lstrip().upper().startswith(EXPLAINABLE_STATEMENTS):
+        return None
+    # A failed statement aborts a Postgres transaction, so guard it with a savepoint
+    guarded = connection.dialect.name == 'postgresql' and connection.in_transaction()
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        if guarded:
+            cursor.execute('SAVEPOINT slow_query_explain')
+        cursor.execute(prefix + statement, parameters or ())
+        rows = cursor.fetchall()
+        if guarded:
+            cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+    except Exception as error:
+        if guarded:
+            cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+        return [f'EXPLAIN failed: {error}']
+    finally:
+        cursor.close()
+    # SQLite returns (id, parent, notused, detail); Postgres returns one text column
+    return [str(row[-1]) for row in rows]
+
+
+class SlowQueryLog:
+    """Logs statements slower than a threshold, deduplicated and rate-limited."""
+
+    def __init__(self, threshold_ms: float = DEFAULT_THRESHOLD_MS, dedupe_seconds: float = DEFAULT_DEDUPE_SECONDS,
+                 max_per_minute: int = DEFAULT_MAX_PER_MINUTE, capture_plan: bool = True) -> None:
+        self.threshold_ms = threshold_ms
+        self.dedupe_seconds = dedupe_seconds
+        self.max_per_minute = max_per_minute
+        self.capture_plan = capture_plan
+        self._lock = threading.Lock()
+        # fingerprint -> (last logged at, occurrences suppressed since)
+        self._seen: dict[str, tuple[float, int]] = {}
+        self._recent: deque[float] = deque()
+
+    def observe(self, connection: Connection, statement: str, parameters: Any, seconds: float) -> dict | None:
+        """Log a statement if it is slow and not suppressed.
+
+        Args:
+            connection: The connection that executed the statement.
+            statement: The SQL text.
+            parameters: The statement's DBAPI parameters.
+            seconds: How long the statement took.
+
+        Returns:
+            The logged record, or None if nothing was logged.
+        """
+        duration_ms = seconds * 1000
+        if self.threshold_ms <= 0 or duration_ms < self.threshold_ms:
+            return None
+        key = fingerprint(statement)
+        suppressed = self._admit(key, time.monotonic())
+        if suppressed is None:
+            return None
+
+        record = {
+            'event': 'slow_query',
+            'fingerprint': key,
+            'durationMs': round(duration_ms, 2),
+            'thresholdMs': self.threshold_ms,
+            'endpoint': request.endpoint if has_request_context() else None,
+            'path': request.path if has_request_context() else None,
+            'sql': statement,
+            'parameters': parameter_shape(parameters),
+            'suppressed': suppressed,
+        }
+        if self.capture_plan:
+            record['plan'] = explain(connection, statement, parameters)
+        logger.warning(json.dumps(record, default=str))
+        return record
+
+    def _admit(self, key: str, now: float) -> int | None:
+        """Decide whether to log, returning the suppressed count or None to skip."""
+        with self._lock:
+            last_logged, suppressed = self._seen.get(key, (None, 0))
+            if last_logged is not None and now - last_logged < self.dedupe_seconds:
+                self._seen[key] = (last_logged, suppressed + 1)
+                return None
+            while self._recent and now - self._recent[0] >= 60:
+                self._recent.popleft()
+            if len(self._recent) >= self.max_per_minute:
+                self._seen[key] = (last_logged, suppressed + 1)
+                return None
+            self._recent.append(now)
+            self._seen[key] = (now, 0)
+            return suppressed
+
+
+def init_slow_query_log(app: Flask) -> None:
+    """Log slow statements run by the app, with their plan.
+
+    Configured by SLOW_QUERY_THRESHOLD_MS (0 disables), SLOW_QUERY_DEDUPE_SECONDS,
+    SLOW_QUERY_MAX_PER_MINUTE and SLOW_QUERY_EXPLAIN.
+
+    Args:
+        app: The Flask application instance.
+    """
+    app.config.setdefault('SLOW_QUERY_THRESHOLD_MS', get_float_env('SLOW_QUERY_THRESHOLD_MS', DEFAULT_THRESHOLD_MS))
+    app.config.setdefault('SLOW_QUERY_DEDUPE_SECONDS', get_float_env('SLOW_QUERY_DEDUPE_SECONDS', DEFAULT_DEDUPE_SECONDS))
+    app.config.setdefault('SLOW_QUERY_MAX_PER_MINUTE', get_int_env('SLOW_QUERY_MAX_PER_MINUTE', DEFAULT_MAX_PER_MINUTE))
+    app.config.setdefault('SLOW_QUERY_EXPLAIN', get_bool_env('SLOW_QUERY_EXPLAIN', True))
+    if app.config['SLOW_QUERY_THRESHOLD_MS'] <= 0:
+        return
+    app.extensions['slow_query_log'] = SlowQueryLog(
+        threshold_ms=app.config['SLOW_QUERY_THRESHOLD_MS'],
+        dedupe_seconds=app.config['SLOW_QUERY_DEDUPE_SECONDS'],
+        max_per_minute=app.config['SLOW_QUERY_MAX_PER_MINUTE'],
+        capture_plan=app.config['SLOW_QUERY_EXPLAIN'],
+    )
+    add_query_observer(_observe)
+
+
+def _observe(connection: Connection, statement: str, parameters: Any, seconds: float) -> None:
+    if not has_app_context():
+        return
+    slow_query_log = current_app.extensions.get('slow_query_log')
+    if slow_query_log is not None:
+        slow_query_log.observe(connection, statement, parameters, seconds)
@@ -0,0 +1,122 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable
+from flask import Flask, request
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+from models import db
+from utils.env import get_bool_env, get_int_env
+from utils.serving import server_threads
+
+logger = logging.getLogger('tailspin.warmup')
+
+# Requests carry the encodings browsers send, so the cached compressed variants get built too
+WARMUP_HEADERS: dict[str, str] = {'Accept-Encoding': 'gzip, deflate, br, zstd', 'User-Agent': 'tailspin-warmup'}
+CATALOG_PATHS: tuple[str, ...] = ('/api/games', '/api/games?sort=popularity')
+WARMUP_SESSION_ID: str = 'warmup'
+# WSGI environ key marking warm-up requests; HTTP clients can only set HTTP_* keys, so it cannot be forged
+WARMUP_ENVIRON_KEY: str = 'tailspin.warmup'
+
+_start_lock = threading.Lock()
+
+
+def init_warmup(app: Flask) -> None:
+    """Read the warm-up settings. Call before init_health, which waits for warm-up when it is on.
+
+    Args:
+        app: The Flask application instance.
+    """
+    app.config.setdefault('WARMUP', get_bool_env('WARMUP', False))
+    app.config.setdefault('WARMUP_CONNECTIONS',
+                          get_int_env('WARMUP_CONNECTIONS', server_threads()))
+
+
+def start_warmup(app: Flask) -> None:
+    """Warm this worker up in a background thread, once per process.
+
+    Args:
+        app: The Flask application instance.
+    """
+    with _start_lock:
+        if app.extensions.get('warmup_pid') == os.getpid():
+            return
+        app.extensions['warmup_pid'] = os.getpid()
+    threading.Thread(target=run_warmup, args=(app,), name='warmup', daemon=True).start()
+
+
+def run_warmup(app: Flask) -> dict[str, float]:
+    """Prime the worker so its first real requests run as fast as later ones.
+
+    Configures the ORM mappers, opens pooled connections, then sends the hot
+    catalog, cart and payment requests through the app. That compiles their
+    statements, loads the database pages and fills the catalog cache. Readiness
+    is reported afterwards even if a step fails, since the database check
+    still guards it.
+
+    Args:
+        app: The Flask application instance.
+
+    Returns:
+        Milliseconds spent in each step.
+    """
+    timings: dict[str, float] = {}
+    try:
+        _timed(timings, 'mappers', configure_mappers)
+        _timed(timings, 'connections', lambda: _open_connections(app, app.config['WARMUP_CONNECTIONS']))
+        _timed(timings, 'requests', lambda: _send_hot_requests(app))
+    except Exception:
+        logger.exception('Warm-up failed')
+    finally:
+        health = app.extensions.get('health')
+        if health is not None:
+            health.warmed_up.set()
+    logger.info(json.dumps({'event': 'warmup', 'pid': os.getpid(), 'stepsMs': timings}))
+    return timings
+
+
+def is_warmup_request() -> bool:
+    """Tell whether the current request was sent by warm-up rather than a client.
+
+    Metrics and admission control skip these, so warm-up never shows up as traffic.
+    """
+    return bool(request.environ.get(WARMUP_ENVIRON_KEY))
+
+
+def _timed(timings: dict[str, float], step: str, action: Callable[[], object]) -> None:
+    start = time.perf_counter()
+    action()
+    timings[step] = round((time.perf_counter() - start) * 1000, 2)
+
+
+def _open_connections(app: Flask, count: int) -> None:
+    # Held at the same time so the pool has to open that many, then returned to it
+    with app.app_context():
+        for engine in db.engines.values():
+            connections = []
+            try:
+                for _ in range(max(count, 1)):
+                    connection = engine.connect()
+                    connections.append(connection)
+                    connection.execute(text('SELECT 1'))
+            finally:
+                for connection in connections:
+                    connection.close()
+
+
+def _send_hot_requests(app: Flask) -> None:
+    client = app.test_client()
+    client.environ_base[WARMUP_ENVIRON_KEY] = True
+    for path in CATALOG_PATHS:
+        client.get(path, headers=WARMUP_HEADERS)
+    # Served from the cache just filled, uncompressed so it can be read here
+    response = client.get(CATALOG_PATHS[-1])
+    games = response.get_json() if response.status_code == 200 else []
+    for game in games[:1]:
+        client.get(f"/api/games/{game['id']}", headers=WARMUP_HEADERS)
+        client.get(f"/api/games/{game['id']}/reviews", headers=WARMUP_HEADERS)
+    # Read-only lookups, so warm-up never creates a cart
+    client.get(f'/api/cart/count?session_id={WARMUP_SESSION_ID}', headers=WARMUP_HEADERS)
+    client.get(f'/api/payments/{WARMUP_SESSION_ID}', headers=WARMUP_HEADERS)